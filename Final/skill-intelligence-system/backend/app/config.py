@@ -3,10 +3,36 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str
+    # Defaults to DATABASE_URL with its async driver (aiosqlite / asyncpg)
+    ASYNC_DATABASE_URL: Optional[str] = None
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     GEMINI_API_KEY: Optional[str] = None
+    # How often a cached catalog snapshot re-reads the persisted catalog version
+    CATALOG_VERSION_CHECK_SECONDS: float = 2.0
+    # Cache-Control max-age of catalog responses (skills, resources, roles); 0 = always revalidate
+    CATALOG_MAX_AGE_SECONDS: int = 0
+    # Full reload interval of the in-memory user x skill matrix (talent search)
+    USER_MATRIX_REFRESH_SECONDS: float = 60.0
+    # How often skill autocomplete re-counts user_skills for its popularity ranking
+    SKILL_POPULARITY_REFRESH_SECONDS: float = 300.0
+    # Assistant conversation contexts kept in memory (LRU), and how long each one lives
+    CONVERSATION_CACHE_SIZE: int = 10000
+    CONVERSATION_TTL_SECONDS: float = 900.0
+
+    # SQLite engine profile, applied to every new connection (see database.py)
+    SQLITE_PROFILE: bool = True
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # safe with WAL; FULL fsyncs every commit
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_CACHE_SIZE: int = -65536  # negative = KiB, i.e. 64 MiB page cache per connection
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MiB
+    SQLITE_TEMP_STORE: str = "MEMORY"
+    # Connection pool; pool_size + max_overflow covers uvicorn's 40 threadpool slots
+    DB_POOL_SIZE: int = 20
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: float = 30.0
 
     class Config:
         env_file = ".env"
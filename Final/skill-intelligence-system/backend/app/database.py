@@ -1,14 +1,70 @@
-from sqlalchemy import create_engine
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from .config import settings
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+
+# --- Engine profile ---
+# File-backed SQLite gets WAL (readers no longer block on the writer), a busy
+# timeout instead of an immediate "database is locked", and cache/mmap sizing.
+# The pool is sized to cover uvicorn's threadpool so sync handlers never wait
+# on a connection while holding a thread.
+
+def _is_sqlite(url: str) -> bool:
+    return url.startswith("sqlite")
+
+def _is_sqlite_memory(url: str) -> bool:
+    return _is_sqlite(url) and (":memory:" in url or url.split("://", 1)[-1] in ("", "/"))
+
+def sqlite_pragmas() -> list:
+    return [
+        f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}",
+        f"PRAGMA cache_size={int(settings.SQLITE_CACHE_SIZE)}",
+        f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}",
+        f"PRAGMA temp_store={settings.SQLITE_TEMP_STORE}",
+    ]
+
+def apply_sqlite_profile(sync_engine) -> None:
+    pragmas = sqlite_pragmas()
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+def engine_options(url: str) -> dict:
+    if _is_sqlite_memory(url):
+        return {}
+    options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_pre_ping": not _is_sqlite(url),
+    }
+    if url.startswith("sqlite+aiosqlite"):
+        # aiosqlite defaults to NullPool (a new connection and thread per checkout)
+        options["poolclass"] = AsyncAdaptedQueuePool
+    return options
+
+def make_engine(url: str, profile: bool = True):
+    connect_args = {"check_same_thread": False} if _is_sqlite(url) else {}
+    sync_engine = create_engine(url, connect_args=connect_args, **engine_options(url))
+    if profile and _is_sqlite(url) and not _is_sqlite_memory(url):
+        apply_sqlite_profile(sync_engine)
+    return sync_engine
+
+
+engine = make_engine(SQLALCHEMY_DATABASE_URL, profile=settings.SQLITE_PROFILE)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -19,3 +75,40 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# --- Async path (I/O-bound read routers) ---
+# Same database through an async driver, so requests waiting on I/O don't hold
+# a threadpool slot. AsyncSession.run_sync() runs on the event loop thread, so
+# it is not for CPU-bound service code (snapshot/engine builds, NumPy scoring,
+# serialization): routers doing that are plain `def` on get_db, and async
+# handlers that need a little of it use in_threadpool().
+
+def _async_url(url: str) -> str:
+    if url.startswith("sqlite:"):
+        return url.replace("sqlite:", "sqlite+aiosqlite:", 1)
+    if url.startswith("postgresql:") or url.startswith("postgresql+psycopg2:"):
+        return "postgresql+asyncpg:" + url.split(":", 1)[1]
+    return url
+
+SQLALCHEMY_ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or _async_url(SQLALCHEMY_DATABASE_URL)
+
+async_engine = create_async_engine(SQLALCHEMY_ASYNC_DATABASE_URL, **engine_options(SQLALCHEMY_ASYNC_DATABASE_URL))
+if settings.SQLITE_PROFILE and _is_sqlite(SQLALCHEMY_ASYNC_DATABASE_URL) \
+        and not _is_sqlite_memory(SQLALCHEMY_ASYNC_DATABASE_URL):
+    apply_sqlite_profile(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def in_threadpool(fn):
+    """Run fn(sync Session) in the threadpool on a session of its own, off the event loop."""
+    def call():
+        with SessionLocal() as db:
+            return fn(db)
+    return await run_in_threadpool(call)
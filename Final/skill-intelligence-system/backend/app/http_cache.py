@@ -0,0 +1,40 @@
+"""
+HTTP conditional caching for read endpoints.
+
+Handlers compute an ETag from something cheaper than the response itself
+(catalog content hash, user row version) and return 304 before loading or
+serializing anything when the client's If-None-Match already has it.
+"""
+from fastapi import Request, Response
+
+from app.config import settings
+
+
+def catalog_cache_control() -> str:
+    # Shared reference data: any cache may store it, but must revalidate after max-age
+    return f"public, max-age={settings.CATALOG_MAX_AGE_SECONDS}, must-revalidate"
+
+
+# Per-user data: browser cache only, revalidated on every use
+USER_CACHE_CONTROL = "private, no-cache"
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """True if If-None-Match lists this ETag (weak comparison, per RFC 9110) or is '*'."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def not_modified_response(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def json_response(request: Request, body: bytes, etag: str, cache_control: str) -> Response:
+    """200 with the pre-serialized body, or an empty 304 if the client is current."""
+    if not_modified(request, etag):
+        return not_modified_response(etag, cache_control)
+    return Response(body, media_type="application/json", headers={"ETag": etag, "Cache-Control": cache_control})
@@ -1,11 +1,11 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app import models
-from app.database import engine, Base
+from app import migrations, models
+from app.database import engine
 from app.routers import users, roles
 
-# Create DB tables
-Base.metadata.create_all(bind=engine)
+# Create DB tables and bring existing ones up to date (see app/migrations.py)
+migrations.upgrade(engine)
 
 app = FastAPI(title="Skill Intelligence System")
 
@@ -16,6 +16,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Pagination cursor (see services/listing.py) and cache validator for the React app
+    expose_headers=["X-Next-Cursor", "Link", "ETag"],
 )
 
 app.include_router(users.router)
@@ -30,6 +32,16 @@ app.include_router(projects.router)
 from app.routers import assistant
 app.include_router(assistant.router)
 
+from app.routers import search
+app.include_router(search.router)
+
 @app.get("/")
 def read_root():
     return {"status": "ok", "message": "Intelligence Engine Running"}
+
+from app.services import catalog
+
+@app.get("/catalog/stats")
+def catalog_stats():
+    # Snapshot version, hit/miss counters and approximate memory footprint
+    return catalog.stats()
@@ -0,0 +1,132 @@
+"""
+Versioned schema migrations.
+
+Base.metadata.create_all() creates missing tables but never alters existing
+ones, so schema changes to tables that already exist in deployed databases
+(e.g. older sql_app.db files) are listed in MIGRATIONS. upgrade() creates any
+missing tables, then applies each pending migration in its own transaction
+and records it in schema_migrations.
+
+A fresh database already has the current schema from create_all, so every
+migration must be a no-op there (CREATE ... IF NOT EXISTS and the like).
+
+    python -m app.migrations                    # upgrade DATABASE_URL
+    python -m app.migrations --status
+    python -m app.migrations --url sqlite:///../sql_app.db
+"""
+import argparse
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+from sqlalchemy import inspect, insert, select, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+from app import models
+from app.database import Base
+from app.services import catalog
+
+# (owner column, is catalog data) for each association table
+_ASSOCIATIONS = {
+    "user_skills": ("user_id", False),
+    "job_skills": ("job_role_id", True),
+    "project_skills": ("project_id", True),
+}
+
+
+def _association_indexes(conn: Connection) -> None:
+    """
+    Drop duplicate (owner, skill) rows, then add the composite and skill_id indexes.
+    The lowest id is kept: the old add_skill_to_user updated .first() of a pair,
+    so that row holds the level the user last wrote and the app served.
+    """
+    tables = set(inspect(conn).get_table_names())
+    catalog_changed = False
+    for table, (owner, is_catalog) in _ASSOCIATIONS.items():
+        if table not in tables:
+            continue
+        deleted = conn.execute(text(
+            f"DELETE FROM {table} WHERE {owner} IS NOT NULL AND skill_id IS NOT NULL "
+            f"AND id NOT IN (SELECT MIN(id) FROM {table} GROUP BY {owner}, skill_id)"
+        )).rowcount
+        catalog_changed |= is_catalog and deleted > 0
+        conn.execute(text(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS ix_{table}_{owner}_skill_id ON {table} ({owner}, skill_id)"
+        ))
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS ix_{table}_skill_id ON {table} (skill_id)"))
+    if catalog_changed:
+        catalog.bump_version(conn)
+
+
+def _user_version(conn: Connection) -> None:
+    columns = {c["name"] for c in inspect(conn).get_columns("users")}
+    if "version" not in columns:
+        conn.execute(text("ALTER TABLE users ADD COLUMN version INTEGER NOT NULL DEFAULT 0"))
+
+
+def _readiness_version(conn: Connection) -> None:
+    # The user_role_readiness table itself comes from create_all; existing users start unmaterialized
+    columns = {c["name"] for c in inspect(conn).get_columns("users")}
+    if "readiness_version" not in columns:
+        conn.execute(text("ALTER TABLE users ADD COLUMN readiness_version INTEGER"))
+
+
+# Append only; never renumber or edit a migration that has shipped
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "association table indexes and uniqueness", _association_indexes),
+    (2, "users.version for conditional requests", _user_version),
+    (3, "users.readiness_version for the materialized readiness table", _readiness_version),
+]
+
+
+def applied_versions(engine: Engine) -> set:
+    sm = models.SchemaMigration.__table__
+    with engine.connect() as conn:
+        if not inspect(conn).has_table(sm.name):
+            return set()
+        return set(conn.execute(select(sm.c.version)).scalars())
+
+
+def upgrade(engine: Engine) -> List[int]:
+    """Create missing tables and apply pending migrations; returns the versions applied."""
+    Base.metadata.create_all(bind=engine)
+    done = applied_versions(engine)
+    sm = models.SchemaMigration.__table__
+    applied = []
+    for version, name, migrate in MIGRATIONS:
+        if version in done:
+            continue
+        try:
+            with engine.begin() as conn:
+                migrate(conn)
+                conn.execute(insert(sm).values(version=version, name=name, applied_at=datetime.utcnow()))
+        except IntegrityError:
+            # Another process (e.g. a second uvicorn worker) recorded it first
+            if version not in applied_versions(engine):
+                raise
+            continue
+        applied.append(version)
+    return applied
+
+
+def status(engine: Engine) -> List[Tuple[int, str, bool]]:
+    done = applied_versions(engine)
+    return [(version, name, version in done) for version, name, _ in MIGRATIONS]
+
+
+if __name__ == "__main__":
+    from app.config import settings
+    from app.database import make_engine
+
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations")
+    parser.add_argument("--url", default=settings.DATABASE_URL)
+    parser.add_argument("--status", action="store_true", help="list migrations without applying them")
+    args = parser.parse_args()
+
+    target = make_engine(args.url)
+    if args.status:
+        for version, name, is_applied in status(target):
+            print(f"{version:>4}  {'applied' if is_applied else 'pending':<8} {name}")
+    else:
+        applied = upgrade(target)
+        print(f"Applied {len(applied)} migration(s): {applied}" if applied else "Schema is up to date")
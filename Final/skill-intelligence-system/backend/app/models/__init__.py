@@ -1 +1 @@
-from .models import User, Skill, JobRole, JobSkill, UserSkill, LearningResource, Project, ProjectSkill
+from .models import User, Skill, JobRole, JobSkill, UserSkill, LearningResource, Project, ProjectSkill, UserRoleReadiness, CatalogVersion, SchemaMigration
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, Float, Text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, Float, Text
 from sqlalchemy.orm import relationship
 from ..database import Base
 
@@ -12,11 +12,16 @@ class User(Base):
     current_role_title = Column(String, nullable=True) # e.g. "Student"
     
     # Relationships
-    skills = relationship("UserSkill", back_populates="user")
+    # Ordered by id so the composite indexes don't change the (insertion) order rows come back in
+    skills = relationship("UserSkill", back_populates="user", order_by="UserSkill.id")
     # For simplicity, we can store target_role_id in frontend or separate table, 
     # but let's persist it here for "statefullness"
     target_role_id = Column(Integer, ForeignKey("job_roles.id"), nullable=True)
     target_role = relationship("JobRole", back_populates="interested_users")
+    # Bumped on every committed change to the user or their skills (ETags); see services/user_versions.py
+    version = Column(Integer, default=0, server_default="0", nullable=False)
+    # Catalog version the user's user_role_readiness rows were built for; NULL = not materialized
+    readiness_version = Column(Integer, nullable=True)
 
 
 class Skill(Base):
@@ -39,16 +44,21 @@ class JobRole(Base):
     domain = Column(String, index=True) # "Healthcare", "AgriTech", "SmartCity"
     description = Column(Text, nullable=True)
     
-    required_skills = relationship("JobSkill", back_populates="job_role")
+    required_skills = relationship("JobSkill", back_populates="job_role", order_by="JobSkill.id")
     interested_users = relationship("User", back_populates="target_role")
 
 
 class JobSkill(Base):
     __tablename__ = "job_skills"
+    # One requirement per (role, skill); the composite index also serves job_role_id lookups.
+    # Keep in sync with app/migrations.py, which adds these to existing databases.
+    __table_args__ = (
+        Index("ix_job_skills_job_role_id_skill_id", "job_role_id", "skill_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     job_role_id = Column(Integer, ForeignKey("job_roles.id"))
-    skill_id = Column(Integer, ForeignKey("skills.id"))
+    skill_id = Column(Integer, ForeignKey("skills.id"), index=True)
     
     # 1-5 scale
     required_level = Column(Integer, default=1) 
@@ -61,10 +71,13 @@ class JobSkill(Base):
 
 class UserSkill(Base):
     __tablename__ = "user_skills"
+    __table_args__ = (
+        Index("ix_user_skills_user_id_skill_id", "user_id", "skill_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
-    skill_id = Column(Integer, ForeignKey("skills.id"))
+    skill_id = Column(Integer, ForeignKey("skills.id"), index=True)
     
     proficiency_level = Column(Integer, default=1) # 1-5
 
@@ -99,16 +112,53 @@ class Project(Base):
     difficulty_level = Column(Integer, default=1) # 1=Beginner, 2=Inter, 3=Adv
     github_repo_url = Column(String)
     
-    required_skills = relationship("ProjectSkill", back_populates="project")
+    required_skills = relationship("ProjectSkill", back_populates="project", order_by="ProjectSkill.id")
 
 
 class ProjectSkill(Base):
     __tablename__ = "project_skills"
+    __table_args__ = (
+        Index("ix_project_skills_project_id_skill_id", "project_id", "skill_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id"))
-    skill_id = Column(Integer, ForeignKey("skills.id"))
+    skill_id = Column(Integer, ForeignKey("skills.id"), index=True)
 
     project = relationship("Project", back_populates="required_skills")
     skill = relationship("Skill")
 
+
+class UserRoleReadiness(Base):
+    """Materialized readiness of one user for one role; see services/readiness_store.py."""
+    __tablename__ = "user_role_readiness"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    role_id = Column(Integer, ForeignKey("job_roles.id"), primary_key=True)
+    readiness_score = Column(Float, nullable=False)
+    missing_skill_count = Column(Integer, nullable=False)
+    weighted_gap = Column(Float, nullable=False)
+    # sum(min(required, current) * importance): what the delta updates adjust
+    covered_weight = Column(Float, nullable=False)
+
+
+# Serves "best roles for a user" as an index range scan: ORDER BY readiness_score DESC, role_id LIMIT n
+Index("ix_user_role_readiness_rank", UserRoleReadiness.user_id,
+      UserRoleReadiness.readiness_score.desc(), UserRoleReadiness.role_id)
+
+
+class CatalogVersion(Base):
+    """Single row (id=1) bumped on every committed catalog write; see services/catalog.py."""
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
+
+
+class SchemaMigration(Base):
+    """One row per applied migration; see app/migrations.py."""
+    __tablename__ = "schema_migrations"
+
+    version = Column(Integer, primary_key=True, autoincrement=False)
+    name = Column(String, nullable=False)
+    applied_at = Column(DateTime, nullable=False)
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from app import schemas
 from app.database import get_db
@@ -12,3 +13,13 @@ def chat_with_assistant(request: schemas.ChatRequest, db: Session = Depends(get_
         return assistant.generate_response(request, db)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/chat/stream")
+async def stream_chat_with_assistant(request: schemas.ChatRequest):
+    """Same answer as /chat as server-sent events: intent, each section, actions, then done (or error)."""
+    return StreamingResponse(
+        assistant.stream(request),
+        media_type="text/event-stream",
+        # No proxy buffering or caching, or the events arrive all at once
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app import models, schemas
 from app.database import get_db
 from app.services import intelligence
@@ -8,6 +8,12 @@ from app.services import intelligence
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 @router.get("/recommend/{user_id}", response_model=List[schemas.Project])
-def recommend_projects(user_id: int, db: Session = Depends(get_db)):
-    results = intelligence.get_project_recommendations(user_id, db)
-    return results
+def recommend_projects(
+    user_id: int,
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+    relevance: str = Query("overlap", pattern="^(overlap|proficiency|difficulty)$"),
+    db: Session = Depends(get_db),
+):
+    # Scored in memory (project index): a plain def, so it runs in the threadpool
+    return intelligence.get_project_recommendations(user_id, db, limit=limit, offset=offset, relevance=relevance)
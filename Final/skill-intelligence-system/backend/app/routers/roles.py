@@ -1,26 +1,91 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from app import models, schemas
-from app.database import get_db
-from app.services import intelligence
+from typing import List, Optional
+from app import http_cache, schemas
+from app.database import get_async_db, get_db, in_threadpool
+from app.services import catalog, intelligence, listing, talent
 
 router = APIRouter(prefix="/roles", tags=["roles"])
 
+# The role catalog is served as JSON bytes cached per catalog version, with
+# ETags for conditional requests; response_model only documents the shape.
+# Paged, filtered and streamed requests go through services/listing.py.
+# Only that listing I/O is async; everything that scores or builds from the
+# snapshot is a plain `def`, which FastAPI runs in its threadpool.
 @router.get("/", response_model=List[schemas.JobRole])
-def list_roles(db: Session = Depends(get_db)):
-    return db.query(models.JobRole).all()
+async def list_roles(
+    request: Request,
+    domain: Optional[str] = None,
+    cursor: Optional[int] = Query(None, description="X-Next-Cursor of the previous page, or the id of the last streamed line"),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    stream: bool = Query(False, description="Stream matches as NDJSON in id order, after `cursor`, up to `limit`"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if stream:
+        return listing.stream_response(listing.roles(domain), cursor, limit)
+    if domain or cursor is not None or limit:
+        body, next_cursor = await listing.fetch_page(db, listing.roles(domain), cursor, limit or listing.PAGE_SIZE)
+        return listing.page_response(request, body, next_cursor)
+    roles = (await in_threadpool(catalog.role_responses)).all_roles
+    return http_cache.json_response(request, roles.body, roles.etag, http_cache.catalog_cache_control())
 
 @router.get("/recommend/{user_id}", response_model=List[schemas.RoleReadiness])
-def get_recommendations(user_id: int, db: Session = Depends(get_db)):
-    return intelligence.get_role_recommendations(user_id, db)
+def get_recommendations(
+    user_id: int,
+    limit: Optional[int] = Query(None, ge=1, description="Return only the best N roles"),
+    min_readiness: float = Query(0.0, ge=0.0, le=1.0),
+    domain: Optional[str] = None,
+    include_gaps: bool = Query(True, description="False returns scores only (summary mode)"),
+    db: Session = Depends(get_db),
+):
+    return intelligence.get_role_recommendations(
+        user_id, db, limit=limit, min_readiness=min_readiness, domain=domain, include_gaps=include_gaps
+    )
+
+@router.get("/plan/{user_id}/{role_id}", response_model=schemas.LearningPlan)
+def get_learning_plan(
+    user_id: int,
+    role_id: int,
+    budget: Optional[int] = Query(None, ge=1, description="Maximum number of level-ups"),
+    db: Session = Depends(get_db),
+):
+    plan = intelligence.get_learning_plan(user_id, role_id, db, budget=budget)
+    if not plan:
+        raise HTTPException(status_code=404, detail="Entity not found")
+    return plan
 
 @router.get("/{role_id}", response_model=schemas.JobRole)
-def get_role(role_id: int, db: Session = Depends(get_db)):
-    role = db.query(models.JobRole).filter(models.JobRole.id == role_id).first()
+def get_role(role_id: int, request: Request, db: Session = Depends(get_db)):
+    role = catalog.role_responses(db).by_id.get(role_id)
+    if role is None:
+        raise HTTPException(status_code=404, detail="Role not found")
+    return http_cache.json_response(request, role.body, role.etag, http_cache.catalog_cache_control())
+
+@router.get("/{role_id}/candidates", response_model=List[schemas.CandidateReadiness])
+def find_candidates(
+    role_id: int,
+    limit: int = Query(20, ge=1, le=1000),
+    offset: int = Query(0, ge=0),
+    min_readiness: float = Query(0.0, ge=0.0, le=1.0),
+    stream: bool = Query(False, description="Stream every match as NDJSON, unsorted, as it is scored"),
+    db: Session = Depends(get_db),
+):
+    """Talent search: users ranked by readiness for this role."""
+    snapshot = catalog.get_catalog(db)
+    role = snapshot.roles_by_id.get(role_id)
     if not role:
         raise HTTPException(status_code=404, detail="Role not found")
-    return role
+    requirements = [(req.skill_id, req.required_level, req.importance_weight) for req in role.required_skills]
+    if stream:
+        # A sync iterator: StreamingResponse scores each batch in the threadpool
+        lines = talent.stream_candidates(requirements, db, min_readiness=min_readiness)
+        return StreamingResponse(
+            lines,
+            media_type="application/x-ndjson",
+        )
+    return talent.rank_candidates(requirements, db, limit=limit, offset=offset, min_readiness=min_readiness)
 
 @router.post("/simulate", response_model=schemas.SimulationResponse)
 def simulate_impact(request: schemas.SimulationRequest, db: Session = Depends(get_db)):
@@ -29,3 +94,9 @@ def simulate_impact(request: schemas.SimulationRequest, db: Session = Depends(ge
         raise HTTPException(status_code=404, detail="Entity not found")
     return result
 
+@router.post("/simulate/batch", response_model=schemas.BatchSimulationResponse)
+def simulate_impact_batch(request: schemas.BatchSimulationRequest, db: Session = Depends(get_db)):
+    result = intelligence.simulate_batch(request, db)
+    if not result:
+        raise HTTPException(status_code=404, detail="Entity not found")
+    return result
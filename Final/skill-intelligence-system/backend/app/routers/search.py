@@ -0,0 +1,19 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from app import schemas
+from app.database import get_db
+from app.services import search
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+# Answered from an in-memory TF-IDF index over the catalog (services/search.py);
+# scoring is NumPy work, so this is a plain def and runs in the threadpool
+@router.get("/", response_model=List[schemas.SearchHit])
+def search_catalog(
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: Optional[str] = Query(None, pattern="^(skill|resource|project|role)$"),
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    return search.search(db, q, limit=limit, kind=kind)
@@ -1,22 +1,58 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-from app import models, schemas
-from app.database import get_db
+from typing import List, Optional
+from app import http_cache, schemas
+from app.database import get_async_db, get_db, in_threadpool
+from app.services import catalog, listing, skill_suggest
 
 router = APIRouter(prefix="/skills", tags=["skills"])
 
+# Without paging, filter or stream parameters the full list is served pre-serialized
+# per catalog version, with ETags; response_model only documents the shape.
+# Otherwise see services/listing.py.
 @router.get("/", response_model=List[schemas.Skill])
-def list_skills(db: Session = Depends(get_db)):
-    return db.query(models.Skill).all()
+async def list_skills(
+    request: Request,
+    category: Optional[str] = None,
+    cursor: Optional[int] = Query(None, description="X-Next-Cursor of the previous page, or the id of the last streamed line"),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    stream: bool = Query(False, description="Stream matches as NDJSON in id order, after `cursor`, up to `limit`"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    if stream:
+        return listing.stream_response(listing.skills(category), cursor, limit)
+    if category or cursor is not None or limit:
+        body, next_cursor = await listing.fetch_page(db, listing.skills(category), cursor, limit or listing.PAGE_SIZE)
+        return listing.page_response(request, body, next_cursor)
+    skills = await in_threadpool(catalog.skills_response)
+    return http_cache.json_response(request, skills.body, skills.etag, http_cache.catalog_cache_control())
 
 @router.get("/resources", response_model=List[schemas.ResourceRecommendation])
-def list_resources(db: Session = Depends(get_db)):
+async def list_resources(
+    request: Request,
+    skill_id: Optional[int] = None,
+    provider: Optional[str] = None,
+    cursor: Optional[int] = Query(None, description="X-Next-Cursor of the previous page, or the id of the last streamed line"),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    stream: bool = Query(False, description="Stream matches as NDJSON in id order, after `cursor`, up to `limit`"),
+    db: AsyncSession = Depends(get_async_db),
+):
     # Return all resources for the catalogue
-    res = db.query(models.LearningResource).all()
-    return [
-        schemas.ResourceRecommendation(
-            title=r.title, type=r.type, provider=r.provider, 
-            link=r.link, difficulty_level=r.difficulty_level
-        ) for r in res
-    ]
+    selected = listing.resources(skill_id, provider)
+    if stream:
+        return listing.stream_response(selected, cursor, limit)
+    if skill_id is not None or provider or cursor is not None or limit:
+        body, next_cursor = await listing.fetch_page(db, selected, cursor, limit or listing.PAGE_SIZE)
+        return listing.page_response(request, body, next_cursor)
+    resources = await in_threadpool(catalog.resources_response)
+    return http_cache.json_response(request, resources.body, resources.etag, http_cache.catalog_cache_control())
+
+@router.get("/suggest", response_model=List[schemas.SkillSuggestion])
+def suggest_skills(
+    q: str = Query(..., max_length=100, description="What the user has typed so far"),
+    limit: int = Query(10, ge=1, le=skill_suggest.MAX_SUGGESTIONS),
+    db: Session = Depends(get_db),
+):
+    """Skills whose name, or a word or alias of it, starts with `q`, most popular first."""
+    return skill_suggest.suggest(db, q, limit)
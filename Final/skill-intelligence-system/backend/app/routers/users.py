@@ -1,7 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app import models, schemas
-from app.database import get_db
+from fastapi import APIRouter, Depends, HTTPException, Request
+from typing import List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from app import http_cache, models, schemas
+from app.database import get_async_db, get_db, in_threadpool
+from app.services import catalog, user_skills, user_versions
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -17,16 +21,36 @@ def create_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
     db.refresh(db_user)
     return db_user
 
+# Reads go through the async session; the response serializes skills -> skill,
+# so both are loaded up front (no lazy loads are possible on an AsyncSession)
+_USER_WITH_SKILLS = selectinload(models.User.skills).selectinload(models.UserSkill.skill)
+
 @router.get("/{user_id}", response_model=schemas.User)
-def read_user(user_id: int, db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter(models.User.id == user_id).first()
+async def read_user(user_id: int, request: Request, db: AsyncSession = Depends(get_async_db)):
+    # The ETag only needs the user's version (one PK lookup); the user and
+    # their skills are loaded and serialized only when the client is stale
+    version = await db.scalar(select(models.User.version).where(models.User.id == user_id))
+    if version is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    # The snapshot may have to be (re)built: that is CPU work, kept off the event loop
+    snapshot = await in_threadpool(catalog.get_catalog)
+    etag = user_versions.etag(user_id, version, snapshot.version)
+    if http_cache.not_modified(request, etag):
+        return http_cache.not_modified_response(etag, http_cache.USER_CACHE_CONTROL)
+
+    db_user = await db.scalar(
+        select(models.User).options(_USER_WITH_SKILLS).where(models.User.id == user_id)
+    )
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return db_user
+    body = schemas.User.model_validate(db_user).model_dump_json().encode()
+    return http_cache.json_response(request, body, etag, http_cache.USER_CACHE_CONTROL)
 
 @router.get("/by-email/{email}", response_model=schemas.User)
-def read_user_by_email(email: str, db: Session = Depends(get_db)):
-    db_user = db.query(models.User).filter(models.User.email == email).first()
+async def read_user_by_email(email: str, db: AsyncSession = Depends(get_async_db)):
+    db_user = await db.scalar(
+        select(models.User).options(_USER_WITH_SKILLS).where(models.User.email == email)
+    )
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return db_user
@@ -72,6 +96,18 @@ def add_skill_to_user(user_id: int, skill: schemas.UserSkillBase, db: Session =
     db.refresh(user_skill)
     return user_skill
 
+@router.put("/{user_id}/skills", response_model=List[schemas.UserSkill])
+def set_user_skills(user_id: int, update: schemas.UserSkillsUpdate, db: Session = Depends(get_db)):
+    # Whole profile (or a diff) in one transaction; see services/user_skills.py
+    skills_by_id = catalog.get_catalog(db).skills_by_id
+    unknown = sorted({s.skill_id for s in update.skills} - skills_by_id.keys())
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown skill ids: {unknown}")
+    result = user_skills.set_user_skills(db, user_id, update)
+    if result is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return result
+
 @router.delete("/{user_id}/skills/{skill_id}")
 def delete_user_skill(user_id: int, skill_id: int, db: Session = Depends(get_db)):
     user_skill = db.query(models.UserSkill).filter(
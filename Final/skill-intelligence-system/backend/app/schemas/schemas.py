@@ -1,5 +1,5 @@
 from typing import List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 # --- Shared ---
 class SkillBase(BaseModel):
@@ -11,6 +11,9 @@ class Skill(SkillBase):
     class Config:
         from_attributes = True
 
+class SkillSuggestion(Skill):
+    popularity: int  # job_skills + user_skills rows referencing the skill
+
 # --- Job Role ---
 class JobSkillBase(BaseModel):
     skill_id: int
@@ -58,6 +61,13 @@ class UserUpdate(BaseModel):
     current_role_title: Optional[str] = None
     target_role_id: Optional[int] = None
 
+class UserSkillsUpdate(BaseModel):
+    skills: List[UserSkillBase] = []
+    # True: `skills` is the whole profile, anything not listed is removed.
+    # False: a diff; `skills` are upserted and the `remove` skill ids deleted.
+    replace: bool = True
+    remove: List[int] = []
+
 class User(UserBase):
     id: int
     skills: List[UserSkill] = []
@@ -90,6 +100,12 @@ class RoleReadiness(BaseModel):
     missing_skill_count: int
     gaps: List[GapDetail] = []
 
+class CandidateReadiness(BaseModel):
+    user_id: int
+    full_name: Optional[str] = None
+    readiness_score: float
+    missing_skill_count: int
+
 # --- Simulation ---
 class SimulationRequest(BaseModel):
     user_id: int
@@ -105,6 +121,49 @@ class SimulationResponse(BaseModel):
 
     skill_simulated: str
 
+class SkillChange(BaseModel):
+    skill_id: int
+    target_level: int = Field(ge=0, le=5)  # proficiency scale; 0 = skill dropped
+
+class BatchSimulationRequest(BaseModel):
+    user_id: int
+    role_id: int
+    # Each change is evaluated on its own against the current profile
+    changes: List[SkillChange] = []
+    # All plan changes are applied together (a multi-skill learning plan)
+    plan: List[SkillChange] = []
+
+class SimulationResult(BaseModel):
+    skill_id: int
+    skill_simulated: str
+    target_level: int
+    new_readiness: float
+    improvement: float
+
+class BatchSimulationResponse(BaseModel):
+    current_readiness: float
+    results: List[SimulationResult] = []
+    plan_readiness: Optional[float] = None
+    plan_improvement: Optional[float] = None
+
+
+# --- Learning Plan ---
+class PlanStep(BaseModel):
+    step: int
+    skill_id: int
+    skill_name: str
+    from_level: int
+    to_level: int
+    gain: float  # readiness gained by this single level-up
+    readiness_after: float
+
+class LearningPlan(BaseModel):
+    user_id: int
+    role_id: int
+    role_title: str
+    current_readiness: float
+    final_readiness: float
+    steps: List[PlanStep] = []
 
 # --- Projects ---
 class ProjectSkillBase(BaseModel):
@@ -132,7 +191,17 @@ class ChatRequest(BaseModel):
     user_id: int
     role_id: Optional[int] = None 
     message: str
+    # Turns with the same session_id share a cached context (skills, role, readiness)
+    session_id: Optional[str] = None
 
 class ChatResponse(BaseModel):
     response: str
     suggested_actions: List[str] = []
+
+# --- Search ---
+class SearchHit(BaseModel):
+    kind: str  # skill | resource | project | role
+    id: int
+    title: str
+    subtitle: str
+    score: float  # cosine similarity, 0-1
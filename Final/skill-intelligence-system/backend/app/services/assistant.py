@@ -1,131 +1,244 @@
-from sqlalchemy.orm import Session
+"""
+The SkillMatch chat assistant.
+
+Each turn runs intent-first: the message is scanned (intent and skill
+mentions, no database work), then only the handler for that intent runs,
+and it pulls just the data it needs from the Turn. Greetings and the
+projects intent need nothing; the score needs the readiness score and
+missing count; the gaps and learning intents need the gap list, without
+the learning-resource lookups the full calculate_readiness would do.
+Everything on a Turn is computed on first use and memoized, and the
+per-role results are kept in the conversation context for later turns.
+
+Handlers yield the answer section by section, so the JSON endpoint and the
+text/event-stream one (stream()) share them.
+"""
+import heapq
+import json
+from functools import cached_property
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, selectinload
 from app import models, schemas
-from app.services import intelligence
-import random
+from app.database import SessionLocal
+from app.services import catalog, conversations, intent_matcher, readiness_engine, role_matcher
 
-def generate_response(request: schemas.ChatRequest, db: Session) -> schemas.ChatResponse:
-    user = db.query(models.User).filter(models.User.id == request.user_id).first()
-    if not user:
-        return schemas.ChatResponse(response="User not found.")
-
-    response_text = ""
-    suggested_actions = []
-
-    # 1. Parse User Intent & Context
-    msg = request.message.lower()
-    
-    readiness = None
-    role = None
-    
-    # Priority 1: Explicit ID
-    if request.role_id:
-        role = db.query(models.JobRole).filter(models.JobRole.id == request.role_id).first()
-    
-    # Priority 2: Intelligent Role Search
-    if not role:
-        all_roles = db.query(models.JobRole).all()
-        best_match = None
-        max_score = 0
-        
-        msg_tokens = set(msg.split())
-        
-        for r in all_roles:
-            role_tokens = set(r.title.lower().split())
-            # Calculate overlap
-            overlap = len(msg_tokens.intersection(role_tokens))
-            
-            # Bonus for exact substring match (e.g "Data Analyst" in "Clinical Data Analyst")
-            if msg in r.title.lower() and len(msg) > 4:
-                overlap += 0.5
-            
-            # Score can be overlap count. Need at least 2 tokens match or 1 unique token match?
-            # Let's say score must be >= 1. But single words like "data" are dangerous.
-            # So let's penalize very common words or require score >= 1.5 for partials.
-            
-            # Simple heuristic:
-            score = overlap
-            
-            if score > max_score and score >= 1: # Threshold
-                max_score = score
-                best_match = r
-        
-        # If we found a good match
-        if best_match:
-            role = best_match
-            # We switched context based on the message. Treat this as an implicit request for status.
-            # We can force the intent processing to skip to a summary if no other specific intent is found.
-            pass
-
-    # Calculate Readiness if we have a role
-    if role:
-        user_skills_map = {us.skill_id: us.proficiency_level for us in user.skills}
-        readiness = intelligence.calculate_readiness(user_skills_map, role, db)
-    
-    # Intent: Explain Score
-    if any(k in msg for k in ["score", "rating", "why", "analysis"]):
-        if readiness:
-            score = int(readiness.readiness_score * 100)
-            if score > 80:
-                response_text = f"You have a strong readiness score of {score}%! You are well-aligned with the {role.title} role."
-            elif score > 50:
-                response_text = f"Your score is {score}%. You have a good foundation, but there are {readiness.missing_skill_count} specific gaps we need to address."
-            else:
-                response_text = f"Your current score is {score}%. This is a specialized role, so don't worry—focusing on a few key skills will boost this quickly."
-            
-            suggested_actions.append("What are my gaps?")
-        else:
-            response_text = "I can currently explain your readiness for specific roles. Please select a Job Role context first!"
-
-    # Intent: Gaps / Missing Skills
-    elif any(k in msg for k in ["gap", "missing", "lack", "need", "skills", "required"]):
-        if readiness and readiness.gaps:
-            top_gaps = readiness.gaps[:3]
-            gap_names = [g.skill_name for g in top_gaps]
-            response_text = f"The most critical skills you are missing are: {', '.join(gap_names)}. Closing these gaps has the highest 'Importance Weight' for this role."
-            suggested_actions.append(f"How to learn {gap_names[0]}?")
-        elif readiness:
-             response_text = "You don't have any major skill gaps for this role! You might be ready to apply."
-        else:
-            response_text = "Select a job role, and I'll tell you exactly what skills you are missing."
-
-    # Intent: How to Improve / Learning
-    elif any(k in msg for k in ["improve", "learn", "study", "resource", "help"]):
-        if readiness and readiness.gaps:
-            target_gap = readiness.gaps[0]
-            # Check if user mentioned a specific skill
-            for gap in readiness.gaps:
-                if gap.skill_name.lower() in msg:
-                    target_gap = gap
-                    break
-            
-            response_text = f"To improve {target_gap.skill_name}, you should aim for Level {target_gap.required_level}. I recommend checking the Learning Hub for courses on this."
-            suggested_actions.append("Go to Learning Hub")
-        else:
-            response_text = "The best way to improve is to tackle your biggest skill gaps one by one. Check the 'Gap Analysis' on your dashboard."
-
-    # Intent: Projects
-    elif any(k in msg for k in ["project", "build", "portfolio", "hands-on"]):
-        response_text = "Building real-world projects is the best way to prove your skills! Check out the 'Projects' tab for GitHub repositories tailored to your profile."
-        suggested_actions.append("Go to Projects Hub")
-        
-    # Intent: Greeting / General
-    elif any(k in msg for k in ["hello", "hi", "hey"]):
-        response_text = "Hello! I am your SkillMatch Assistant. I'm here to translate your data into a clear career path. Ask me about your match score or skill gaps."
-        
-    # Fallback
-    else:
-        # If we have a role, assume they want a summary
+
+class Gap(NamedTuple):
+    skill_id: int
+    skill_name: str
+    current_level: int
+    required_level: int
+    importance: float
+
+    @property
+    def weighted(self) -> float:
+        return (self.required_level - self.current_level) * self.importance
+
+
+class _UserNotFound(Exception):
+    pass
+
+
+def _load_context(request: schemas.ChatRequest, db: Session,
+                  snapshot: catalog.CatalogSnapshot) -> Optional[conversations.Context]:
+    """The conversation's cached context, or a fresh one from the database (None if no such user)."""
+    key = conversations.key(request.user_id, request.session_id)
+    context = conversations.cache.get(key, snapshot.version)
+    if context is None:
+        user = db.query(models.User).options(selectinload(models.User.skills)).filter(
+            models.User.id == request.user_id).first()
+        if not user:
+            return None
+        context = conversations.Context(
+            user_id=user.id,
+            catalog_version=snapshot.version,
+            user_skills_map={us.skill_id: us.proficiency_level for us in user.skills},
+        )
+        conversations.cache.put(key, context)
+    return context
+
+
+class Turn:
+    """One chat turn. Only the message scan is eager; everything else is computed on first use."""
+
+    def __init__(self, request: schemas.ChatRequest, db: Session):
+        self.request = request
+        self.db = db
+        self.msg = request.message.lower()
+        self.snapshot = catalog.get_catalog(db)
+        self.scan = intent_matcher.get_recognizer(db).scan(self.msg)
+
+    @cached_property
+    def context(self) -> conversations.Context:
+        context = _load_context(self.request, self.db, self.snapshot)
+        if context is None:
+            raise _UserNotFound()
+        return context
+
+    @cached_property
+    def role(self) -> Optional[catalog.RoleEntry]:
+        roles = self.snapshot.roles_by_id
+        # Priority 1: Explicit ID
+        role = roles.get(self.request.role_id) if self.request.role_id else None
+        # Priority 2: Role named in the message (token index with IDF weights, typo tolerant)
+        if not role:
+            role_id = role_matcher.get_matcher(self.db).match(self.msg)
+            role = roles.get(role_id) if role_id is not None else None
+        # Priority 3: The role this conversation was last about
+        if not role and self.context.role_id is not None:
+            role = roles.get(self.context.role_id)
         if role:
-             score = int(readiness.readiness_score * 100)
-             response_text = f"I've switched context to **{role.title}**. Your readiness is {score}%. You are missing {readiness.missing_skill_count} skills."
-             if readiness.gaps:
-                 response_text += " Ask 'What are my gaps?' for details."
-                 suggested_actions.append("What are my gaps?")
+            self.context.role_id = role.id
+        return role
+
+    @cached_property
+    def gaps(self) -> List[Gap]:
+        """Unmet requirements of the role, in requirement order (no resource lookups)."""
+        cached = self.context.gaps.get(self.role.id)
+        if cached is None:
+            levels = self.context.user_skills_map
+            cached = [
+                Gap(req.skill_id, self.snapshot.skill_name(req.skill_id), levels.get(req.skill_id, 0),
+                    req.required_level, req.importance_weight)
+                for req in self.role.required_skills if req.required_level > levels.get(req.skill_id, 0)
+            ]
+            self.context.gaps[self.role.id] = cached
+        return cached
+
+    @cached_property
+    def score(self) -> Tuple[float, int]:
+        """(readiness_score, missing_skill_count) for the role, same arithmetic as calculate_readiness."""
+        cached = self.context.scores.get(self.role.id)
+        if cached is None:
+            levels = self.context.user_skills_map
+            requirements = [(r.skill_id, r.required_level, r.importance_weight) for r in self.role.required_skills]
+            missing = sum(1 for skill_id, level, _ in requirements if level > levels.get(skill_id, 0))
+            cached = (readiness_engine.readiness_for(requirements, levels), missing)
+            self.context.scores[self.role.id] = cached
+        return cached
+
+
+# A handler yields its answer in sections, then the suggested actions:
+# ("section", text) ... ("actions", [label, ...]). The JSON endpoint joins
+# the sections with spaces; the event stream sends each one as it is ready.
+Event = Tuple[str, Any]
+
+
+def _explain_score(turn: Turn) -> Iterator[Event]:
+    if not turn.role:
+        yield "section", "I can currently explain your readiness for specific roles. Please select a Job Role context first!"
+        return
+    readiness, missing = turn.score
+    score = int(readiness * 100)
+    if score > 80:
+        yield "section", f"You have a strong readiness score of {score}%! You are well-aligned with the {turn.role.title} role."
+    elif score > 50:
+        yield "section", f"Your score is {score}%. You have a good foundation, but there are {missing} specific gaps we need to address."
+    else:
+        yield "section", f"Your current score is {score}%. This is a specialized role, so don't worry—focusing on a few key skills will boost this quickly."
+    yield "actions", ["What are my gaps?"]
+
+
+def _missing_skills(turn: Turn) -> Iterator[Event]:
+    if not turn.role:
+        yield "section", "Select a job role, and I'll tell you exactly what skills you are missing."
+        return
+    if not turn.gaps:
+        yield "section", "You don't have any major skill gaps for this role! You might be ready to apply."
+        return
+    # Rank by weighted gap (levels missing x importance), i.e. readiness at stake
+    gap_names = [g.skill_name for g in heapq.nlargest(3, turn.gaps, key=lambda g: g.weighted)]
+    yield "section", f"The most critical skills you are missing are: {', '.join(gap_names)}."
+    yield "section", "Closing these gaps has the highest 'Importance Weight' for this role."
+    yield "actions", [f"How to learn {gap_names[0]}?"]
+
+
+def _improve(turn: Turn) -> Iterator[Event]:
+    if not turn.role or not turn.gaps:
+        yield "section", "The best way to improve is to tackle your biggest skill gaps one by one. Check the 'Gap Analysis' on your dashboard."
+        return
+    # The first gap the user mentioned, else the first gap
+    mentioned = set(turn.scan.skill_ids)
+    target = next((g for g in turn.gaps if g.skill_id in mentioned), turn.gaps[0])
+    yield "section", f"To improve {target.skill_name}, you should aim for Level {target.required_level}."
+    yield "section", "I recommend checking the Learning Hub for courses on this."
+    yield "actions", ["Go to Learning Hub"]
+
+
+def _projects(turn: Turn) -> Iterator[Event]:
+    yield "section", "Building real-world projects is the best way to prove your skills! Check out the 'Projects' tab for GitHub repositories tailored to your profile."
+    yield "actions", ["Go to Projects Hub"]
+
+
+def _greeting(turn: Turn) -> Iterator[Event]:
+    yield "section", "Hello! I am your SkillMatch Assistant. I'm here to translate your data into a clear career path. Ask me about your match score or skill gaps."
+
+
+def _summary(turn: Turn) -> Iterator[Event]:
+    # No recognized intent: if we have a role, assume they want a summary
+    if not turn.role:
+        yield "section", "I'm tuned to analyze your career data. Try asking: 'Why is my score low?', 'What are my missing skills?', or 'How can I improve?'"
+        yield "actions", ["What are my missing skills?"]
+        return
+    readiness, missing = turn.score
+    yield "section", f"I've switched context to **{turn.role.title}**. Your readiness is {int(readiness * 100)}%. You are missing {missing} skills."
+    if missing:
+        yield "section", "Ask 'What are my gaps?' for details."
+        yield "actions", ["What are my gaps?"]
+
+
+HANDLERS: Dict[Optional[str], Callable[[Turn], Iterator[Event]]] = {
+    "score": _explain_score,
+    "gaps": _missing_skills,
+    "improve": _improve,
+    "projects": _projects,
+    "greeting": _greeting,
+    None: _summary,
+}
+
+
+def events(turn: Turn) -> Iterator[Event]:
+    try:
+        yield from HANDLERS[turn.scan.intent](turn)
+    except _UserNotFound:
+        # Raised before a handler has yielded anything: every handler reads user data up front
+        yield "section", "User not found."
+
+
+def generate_response(request: schemas.ChatRequest, db: Session) -> schemas.ChatResponse:
+    sections, suggested_actions = [], []
+    for kind, value in events(Turn(request, db)):
+        if kind == "section":
+            sections.append(value)
         else:
-            response_text = "I'm tuned to analyze your career data. Try asking: 'Why is my score low?', 'What are my missing skills?', or 'How can I improve?'"
-            suggested_actions.append("What are my missing skills?")
+            suggested_actions.extend(value)
+    return schemas.ChatResponse(response=" ".join(sections), suggested_actions=suggested_actions)
+
+
+# --- Server-sent events ---
+# event: intent   {"intent": "gaps"}          as soon as the message is classified
+# event: section  {"text": "..."}             one per answer section, in order
+# event: actions  {"suggested_actions": [...]}
+# event: done     {}                          (or event: error {"detail": "..."})
+
+def sse(event: str, data: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
 
-    return schemas.ChatResponse(
-        response=response_text,
-        suggested_actions=suggested_actions
-    )
+async def stream(request: schemas.ChatRequest) -> AsyncIterator[bytes]:
+    """The chat answer as text/event-stream. Owns its session: it outlives the request handler."""
+    with SessionLocal() as db:
+        try:
+            # Every step may build catalog structures or query (user load, role match): threadpool, not the event loop
+            turn = await run_in_threadpool(Turn, request, db)
+            yield sse("intent", {"intent": turn.scan.intent})
+            pending = events(turn)
+            while (event := await run_in_threadpool(next, pending, None)) is not None:
+                kind, value = event
+                yield sse(kind, {"text": value} if kind == "section" else {"suggested_actions": value})
+        except Exception as e:
+            yield sse("error", {"detail": str(e)})
+            return
+        yield sse("done", {})
@@ -0,0 +1,347 @@
+"""
+Versioned in-process snapshot of the reference catalog.
+
+Skills, roles (with their job_skills), learning resources and projects are
+read on nearly every request but only change when the catalog is seeded.
+They are loaded once into an immutable, slots-based CatalogSnapshot tagged
+with the catalog version, and every read path works from that snapshot.
+
+The version lives in the catalog_version table and is bumped inside the same
+transaction as any catalog write, so other processes (seed.py, other uvicorn
+workers) notice it on their next version check. Within this process the
+snapshot is dropped as soon as such a transaction commits.
+"""
+import hashlib
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, insert, update
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.config import settings
+
+CATALOG_MODELS = (
+    models.Skill, models.LearningResource, models.JobRole, models.JobSkill,
+    models.Project, models.ProjectSkill,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SkillEntry:
+    id: int
+    name: str
+    category: str
+
+
+@dataclass(frozen=True, slots=True)
+class RequirementEntry:
+    id: int
+    skill_id: int
+    required_level: int
+    importance_weight: float
+    skill: SkillEntry
+
+
+@dataclass(frozen=True, slots=True)
+class RoleEntry:
+    id: int
+    title: str
+    domain: str
+    description: Optional[str]
+    required_skills: Tuple[RequirementEntry, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class ResourceEntry:
+    id: int
+    title: str
+    type: str
+    provider: str
+    link: Optional[str]
+    skill_id: int
+    difficulty_level: int
+
+
+@dataclass(frozen=True, slots=True)
+class ProjectEntry:
+    id: int
+    title: str
+    description: str
+    domain: str
+    difficulty_level: int
+    github_repo_url: str
+    skill_ids: Tuple[int, ...]
+
+
+class CatalogSnapshot:
+    """Read-only view of the catalog at one version. Never mutate the containers."""
+
+    __slots__ = (
+        "version", "skills", "skills_by_id", "roles", "roles_by_id", "resources",
+        "resources_by_skill", "projects", "projects_by_id", "approx_bytes",
+        "_recommendations", "_derived", "_derive_lock",
+    )
+
+    def __init__(self, version: int, skills: Tuple[SkillEntry, ...], roles: Tuple[RoleEntry, ...],
+                 resources: Tuple[ResourceEntry, ...], projects: Tuple[ProjectEntry, ...]):
+        self.version = version
+        self.skills = skills
+        self.skills_by_id = {s.id: s for s in skills}
+        self.roles = roles
+        self.roles_by_id = {r.id: r for r in roles}
+        self.resources = resources
+        self.projects = projects
+        self.projects_by_id = {p.id: p for p in projects}
+
+        grouped: Dict[int, List[ResourceEntry]] = {}
+        for r in resources:
+            grouped.setdefault(r.skill_id, []).append(r)
+        self.resources_by_skill = {k: tuple(v) for k, v in grouped.items()}
+
+        self._recommendations = {
+            r.id: schemas.ResourceRecommendation(
+                title=r.title, type=r.type, provider=r.provider,
+                link=r.link, difficulty_level=r.difficulty_level
+            ) for r in resources
+        }
+        self._derived: Dict[str, Any] = {}
+        self._derive_lock = threading.Lock()
+        self.approx_bytes = _approx_size(skills, roles, resources, projects)
+
+    def skill_name(self, skill_id: int) -> str:
+        skill = self.skills_by_id.get(skill_id)
+        return skill.name if skill else ""
+
+    def recommendations_for(self, skill_id: int) -> List[schemas.ResourceRecommendation]:
+        return [self._recommendations[r.id] for r in self.resources_by_skill.get(skill_id, ())]
+
+    def all_recommendations(self) -> List[schemas.ResourceRecommendation]:
+        return [self._recommendations[r.id] for r in self.resources]
+
+    def derive(self, key: str, builder: Callable[["CatalogSnapshot"], Any]) -> Any:
+        """
+        Memoize a structure computed from this snapshot (matrices, indexes).
+        It lives exactly as long as the snapshot, so it can never be stale.
+        """
+        value = self._derived.get(key)
+        if value is None:
+            with self._derive_lock:
+                value = self._derived.get(key)
+                if value is None:
+                    value = builder(self)
+                    self._derived[key] = value
+        return value
+
+
+def _approx_size(*groups) -> int:
+    total = 0
+    for group in groups:
+        total += sys.getsizeof(group)
+        for entry in group:
+            total += sys.getsizeof(entry)
+            for field in entry.__slots__:
+                value = getattr(entry, field)
+                if isinstance(value, tuple):
+                    total += sys.getsizeof(value)
+                elif not isinstance(value, (SkillEntry, int, float, type(None))):
+                    total += sys.getsizeof(value)
+            if isinstance(entry, RoleEntry):
+                total += sum(sys.getsizeof(req) for req in entry.required_skills)
+    return total
+
+
+def build_snapshot(db: Session, version: int) -> CatalogSnapshot:
+    # Plain column queries: no identity map, no lazy loads
+    skills = tuple(
+        SkillEntry(row.id, row.name, row.category)
+        for row in db.query(models.Skill.id, models.Skill.name, models.Skill.category)
+        .order_by(models.Skill.id)
+    )
+    skills_by_id = {s.id: s for s in skills}
+
+    reqs_by_role: Dict[int, List[RequirementEntry]] = {}
+    js = models.JobSkill
+    for row in db.query(js.id, js.job_role_id, js.skill_id, js.required_level, js.importance_weight).order_by(js.id):
+        reqs_by_role.setdefault(row.job_role_id, []).append(RequirementEntry(
+            row.id, row.skill_id, row.required_level, row.importance_weight, skills_by_id.get(row.skill_id)
+        ))
+
+    jr = models.JobRole
+    roles = tuple(
+        RoleEntry(row.id, row.title, row.domain, row.description, tuple(reqs_by_role.get(row.id, ())))
+        for row in db.query(jr.id, jr.title, jr.domain, jr.description).order_by(jr.id)
+    )
+
+    lr = models.LearningResource
+    resources = tuple(
+        ResourceEntry(row.id, row.title, row.type, row.provider, row.link, row.skill_id, row.difficulty_level)
+        for row in db.query(lr.id, lr.title, lr.type, lr.provider, lr.link, lr.skill_id, lr.difficulty_level)
+        .order_by(lr.id)
+    )
+
+    skills_by_project: Dict[int, List[int]] = {}
+    ps = models.ProjectSkill
+    for row in db.query(ps.project_id, ps.skill_id).order_by(ps.id):
+        skills_by_project.setdefault(row.project_id, []).append(row.skill_id)
+
+    p = models.Project
+    projects = tuple(
+        ProjectEntry(row.id, row.title, row.description, row.domain, row.difficulty_level,
+                     row.github_repo_url, tuple(skills_by_project.get(row.id, ())))
+        for row in db.query(p.id, p.title, p.description, p.domain, p.difficulty_level, p.github_repo_url)
+        .order_by(p.id)
+    )
+
+    return CatalogSnapshot(version, skills, roles, resources, projects)
+
+
+# --- Snapshot cache ---
+
+_snapshot: Optional[CatalogSnapshot] = None
+_last_checked = 0.0
+_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0, "version_checks": 0, "last_build_ms": 0.0}
+
+
+def read_version(db: Session) -> int:
+    version = db.query(models.CatalogVersion.version).filter(models.CatalogVersion.id == 1).scalar()
+    return version or 0
+
+
+def get_catalog(db: Session) -> CatalogSnapshot:
+    """
+    Current snapshot. The persisted version is re-checked at most every
+    CATALOG_VERSION_CHECK_SECONDS; in between, hits cost no database work.
+    """
+    global _snapshot, _last_checked
+    snapshot = _snapshot
+    now = time.monotonic()
+    if snapshot is not None and now - _last_checked < settings.CATALOG_VERSION_CHECK_SECONDS:
+        _stats["hits"] += 1
+        return snapshot
+
+    _stats["version_checks"] += 1
+    version = read_version(db)
+    if snapshot is not None and snapshot.version == version:
+        _last_checked = now
+        _stats["hits"] += 1
+        return snapshot
+
+    with _lock:
+        if _snapshot is not None and _snapshot.version == version:
+            _stats["hits"] += 1
+            return _snapshot
+        start = time.perf_counter()
+        snapshot = build_snapshot(db, version)
+        _stats["last_build_ms"] = (time.perf_counter() - start) * 1000
+        _stats["misses"] += 1
+        _snapshot = snapshot
+        _last_checked = now
+    return snapshot
+
+
+def invalidate():
+    """Drop the snapshot (and everything derived from it) in this process."""
+    global _snapshot
+    with _lock:
+        _snapshot = None
+
+
+def stats() -> dict:
+    snapshot = _snapshot
+    return {
+        **_stats,
+        "version": snapshot.version if snapshot else None,
+        "skills": len(snapshot.skills) if snapshot else 0,
+        "roles": len(snapshot.roles) if snapshot else 0,
+        "resources": len(snapshot.resources) if snapshot else 0,
+        "projects": len(snapshot.projects) if snapshot else 0,
+        "approx_bytes": snapshot.approx_bytes if snapshot else 0,
+        "derived": sorted(snapshot._derived) if snapshot else [],
+    }
+
+
+def bump_version(connection) -> None:
+    """Increment the persisted catalog version on the given connection/transaction."""
+    cv = models.CatalogVersion.__table__
+    result = connection.execute(update(cv).where(cv.c.id == 1).values(version=cv.c.version + 1))
+    if result.rowcount == 0:
+        connection.execute(insert(cv).values(id=1, version=1))
+
+
+# --- Pre-serialized responses ---
+# The catalog endpoints return the same bytes until the catalog changes, so
+# they are validated and encoded once per snapshot, along with a strong ETag
+# (content hash) for conditional requests.
+
+@dataclass(frozen=True, slots=True)
+class Serialized:
+    body: bytes
+    etag: str
+
+
+def _serialized(body: bytes) -> Serialized:
+    return Serialized(body, '"%s"' % hashlib.blake2b(body, digest_size=16).hexdigest())
+
+
+def _json_list(items: List[bytes]) -> bytes:
+    return b"[" + b",".join(items) + b"]"
+
+
+@dataclass(frozen=True, slots=True)
+class RoleResponses:
+    all_roles: Serialized
+    by_id: Dict[int, Serialized]
+
+
+def _serialize_roles(snapshot: CatalogSnapshot) -> RoleResponses:
+    bodies = {role.id: schemas.JobRole.model_validate(role).model_dump_json().encode() for role in snapshot.roles}
+    return RoleResponses(
+        _serialized(_json_list(list(bodies.values()))),
+        {role_id: _serialized(body) for role_id, body in bodies.items()},
+    )
+
+
+def role_responses(db: Session) -> RoleResponses:
+    return get_catalog(db).derive("role_responses", _serialize_roles)
+
+
+def skills_response(db: Session) -> Serialized:
+    return get_catalog(db).derive("skills_response", lambda snapshot: _serialized(_json_list(
+        [schemas.Skill.model_validate(s).model_dump_json().encode() for s in snapshot.skills]
+    )))
+
+
+def resources_response(db: Session) -> Serialized:
+    return get_catalog(db).derive("resources_response", lambda snapshot: _serialized(_json_list(
+        [r.model_dump_json().encode() for r in snapshot.all_recommendations()]
+    )))
+
+
+# --- Invalidation on commit ---
+# The version is bumped on the first flush that writes catalog rows, inside that
+# transaction; the local snapshot is dropped once the transaction commits.
+
+@event.listens_for(Session, "after_flush")
+def _track_catalog_writes(session, flush_context):
+    if session.info.get("catalog_dirty"):
+        return
+    if any(isinstance(obj, CATALOG_MODELS) for obj in chain(session.new, session.dirty, session.deleted)):
+        bump_version(session.connection())
+        session.info["catalog_dirty"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    if session.info.pop("catalog_dirty", False):
+        invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session):
+    session.info.pop("catalog_dirty", None)
@@ -0,0 +1,134 @@
+"""
+Per-conversation context for the assistant.
+
+The first turn of a chat loads the user's skills; later turns in the same
+(user_id, session_id) conversation reuse them, along with the role the
+conversation is about and the readiness score and gap list already computed
+for each role, so follow-ups like "What are my gaps?" need no database work
+at all.
+
+Contexts live in a process-local LRU (CONVERSATION_CACHE_SIZE entries, each
+expiring CONVERSATION_TTL_SECONDS after it was created). A context is only
+valid for the catalog version it was built under, and every committed
+user_skills write drops the contexts of the users it touched: ORM writes
+are collected by the hooks below, Core (bulk) writes must call
+record_changes(). Writes from other processes are bounded by the TTL.
+"""
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+
+Key = Tuple[int, Hashable]
+
+
+@dataclass
+class Context:
+    user_id: int
+    catalog_version: int
+    user_skills_map: Dict[int, int]
+    role_id: Optional[int] = None
+    # role_id -> (readiness_score, missing_skill_count) and role_id -> [assistant.Gap], filled lazily
+    scores: Dict[int, Tuple[float, int]] = field(default_factory=dict)
+    gaps: Dict[int, List[Any]] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.monotonic)
+
+
+class ConversationCache:
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Key, Context]" = OrderedDict()
+        self._by_user: Dict[int, Set[Key]] = {}
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Key, catalog_version: int) -> Optional[Context]:
+        with self._lock:
+            context = self._entries.get(key)
+            if context is not None and (context.catalog_version != catalog_version
+                                        or time.monotonic() - context.created_at > self.ttl_seconds):
+                self._discard(key)
+                context = None
+            if context is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return context
+
+    def put(self, key: Key, context: Context):
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = context
+            self._by_user.setdefault(context.user_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate_users(self, user_ids: Iterable[int]):
+        with self._lock:
+            for user_id in user_ids:
+                for key in list(self._by_user.get(user_id, ())):
+                    self._discard(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def _discard(self, key: Key):
+        context = self._entries.pop(key, None)
+        if context is not None:
+            keys = self._by_user.get(context.user_id)
+            keys.discard(key)
+            if not keys:
+                del self._by_user[context.user_id]
+
+
+cache = ConversationCache(settings.CONVERSATION_CACHE_SIZE, settings.CONVERSATION_TTL_SECONDS)
+
+
+def key(user_id: int, session_id: Optional[str]) -> Key:
+    return user_id, session_id or ""
+
+
+def stats() -> dict:
+    return {"entries": len(cache), "hits": cache.hits, "misses": cache.misses}
+
+
+# --- Invalidation ---
+# Users whose skills were written are collected per session and dropped once
+# the transaction commits.
+
+def record_changes(session: Session, user_ids: Iterable[int]):
+    """Queue users whose skills were written outside the ORM (Core/bulk) for invalidation on commit."""
+    session.info.setdefault("conversation_users", set()).update(user_ids)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_user_skill_writes(session, flush_context):
+    record_changes(session, (
+        obj.user_id for obj in chain(session.new, session.dirty, session.deleted)
+        if isinstance(obj, models.UserSkill)
+    ))
+
+
+@event.listens_for(Session, "after_commit")
+def _drop_conversations(session):
+    cache.invalidate_users(session.info.pop("conversation_users", ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_skill_writes(session):
+    session.info.pop("conversation_users", None)
@@ -1,9 +1,29 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from app import models, schemas
-from typing import List
+from app.services import catalog, project_index, readiness_engine, readiness_store
+from typing import List, Optional
 
-def calculate_readiness(user_skills_map: dict, job_role: models.JobRole, db: Session) -> schemas.RoleReadiness:
+def _load_user(user_id: int, db: Session) -> Optional[models.User]:
+    # Skills are loaded eagerly with the user: one extra SELECT, never a lazy load
+    return db.query(models.User).options(selectinload(models.User.skills)).filter(models.User.id == user_id).first()
+
+def _gap_detail(skill_id: int, user_level: int, required_level: int,
+                importance: float, snapshot: catalog.CatalogSnapshot) -> schemas.GapDetail:
+    # Resources and names come from the catalog snapshot, no per-gap query
+    return schemas.GapDetail(
+        skill_id=skill_id,
+        skill_name=snapshot.skill_name(skill_id),
+        current_level=user_level,
+        required_level=required_level,
+        gap=required_level - user_level,
+        importance=importance,
+        recommended_resources=snapshot.recommendations_for(skill_id)
+    )
+
+def calculate_readiness(user_skills_map: dict, job_role: catalog.RoleEntry, db: Session) -> schemas.RoleReadiness:
     """
+    `job_role` is a catalog RoleEntry (a models.JobRole works too).
+
     Core Algorithm:
     Gap = max(0, required - user)
     Weighted Gap = Gap * Importance
@@ -13,6 +33,7 @@ def calculate_readiness(user_skills_map: dict, job_role: models.JobRole, db: Ses
     total_possible_weight = 0.0
     gaps = []
     missing_count = 0
+    snapshot = catalog.get_catalog(db)
 
     for req in job_role.required_skills:
         # Scale: 1-5. Importance: 1.0-5.0 usually.
@@ -32,26 +53,8 @@ def calculate_readiness(user_skills_map: dict, job_role: models.JobRole, db: Ses
         
         if gap > 0:
             missing_count += 1
-            # Find resources
-            resources = db.query(models.LearningResource).filter(
-                models.LearningResource.skill_id == req.skill_id
-            ).all() # Simple fetch, could rank by difficulty
-            
-            res_schemas = [
-                schemas.ResourceRecommendation(
-                    title=r.title, type=r.type, provider=r.provider, 
-                    link=r.link, difficulty_level=r.difficulty_level
-                ) for r in resources
-            ]
-            
-            gaps.append(schemas.GapDetail(
-                skill_id=req.skill_id,
-                skill_name=req.skill.name,
-                current_level=user_level,
-                required_level=req.required_level,
-                gap=gap,
-                importance=req.importance_weight,
-                recommended_resources=res_schemas
+            gaps.append(_gap_detail(
+                req.skill_id, user_level, req.required_level, req.importance_weight, snapshot
             ))
             
     # Avoid division by zero
@@ -69,102 +72,189 @@ def calculate_readiness(user_skills_map: dict, job_role: models.JobRole, db: Ses
         gaps=gaps
     )
 
-def get_role_recommendations(user_id: int, db: Session) -> List[schemas.RoleReadiness]:
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+def get_role_recommendations(user_id: int, db: Session, limit: Optional[int] = None,
+                             min_readiness: float = 0.0, domain: Optional[str] = None,
+                             include_gaps: bool = True) -> List[schemas.RoleReadiness]:
+    """
+    Roles by readiness, best first. Scores come from the user's materialized
+    user_role_readiness rows (built on first use per catalog version, then kept
+    current by delta updates on skill writes), read with an indexed
+    ORDER BY ... LIMIT that also applies the filters. Gap details are only built
+    for the roles actually returned, and skipped entirely when include_gaps is
+    False (summary mode).
+    """
+    user = _load_user(user_id, db)
     if not user:
         return []
     
     # Map user skills for O(1) lookup
     user_skills_map = {us.skill_id: us.proficiency_level for us in user.skills}
     
-    all_roles = db.query(models.JobRole).all()
+    snapshot = catalog.get_catalog(db)
+    engine = readiness_engine.get_engine(db)
+    if readiness_store.ensure(db, user, user_skills_map, snapshot):
+        ranked = [
+            (engine.role_index[role_id], score, missing)
+            for role_id, score, missing in readiness_store.top(db, user_id, limit, min_readiness, domain)
+            if role_id in engine.role_index
+        ]
+    else:
+        # The user changed while their rows were being built: score this request in memory
+        order, scores, missing = engine.top(user_skills_map, limit, min_readiness, domain)
+        ranked = [(i, float(scores[i]), int(missing[i])) for i in order.tolist()]
     results = []
     
-    for role in all_roles:
-        results.append(calculate_readiness(user_skills_map, role, db))
-        
-    # Sort by Readiness Descending
-    results.sort(key=lambda x: x.readiness_score, reverse=True)
+    for i, score, missing_count in ranked:
+        gaps = []
+        if include_gaps:
+            for skill_id, _, required_level, importance in engine.requirements[i]:
+                user_level = user_skills_map.get(skill_id, 0)
+                if required_level > user_level:
+                    gaps.append(_gap_detail(skill_id, user_level, required_level, importance, snapshot))
+        results.append(schemas.RoleReadiness(
+            role_id=int(engine.role_ids[i]),
+            role_title=engine.role_titles[i],
+            domain=engine.role_domains[i],
+            readiness_score=score,
+            missing_skill_count=missing_count,
+            gaps=gaps
+        ))
     
     return results
 
 def simulate_readiness(request: schemas.SimulationRequest, db: Session) -> schemas.SimulationResponse:
-    user = db.query(models.User).filter(models.User.id == request.user_id).first()
-    role = db.query(models.JobRole).filter(models.JobRole.id == request.role_id).first()
-    skill = db.query(models.Skill).filter(models.Skill.id == request.skill_id).first()
+    snapshot = catalog.get_catalog(db)
+    user = _load_user(request.user_id, db)
+    role = snapshot.roles_by_id.get(request.role_id)
+    skill = snapshot.skills_by_id.get(request.skill_id)
 
     if not user or not role or not skill:
         return None
 
     # Base State
     user_skills_map = {us.skill_id: us.proficiency_level for us in user.skills}
-    base_result = calculate_readiness(user_skills_map, role, db)
+    requirements = _requirement_vector(role)
+    current = readiness_engine.readiness_for(requirements, user_skills_map)
 
     # Simulated State
-    simulated_map = user_skills_map.copy()
-    simulated_map[request.skill_id] = request.target_level
-    
-    sim_result = calculate_readiness(simulated_map, role, db)
+    new = readiness_engine.readiness_for(
+        requirements, user_skills_map, {request.skill_id: request.target_level}
+    )
 
     return schemas.SimulationResponse(
-        current_readiness=base_result.readiness_score,
-        new_readiness=sim_result.readiness_score,
-        improvement=sim_result.readiness_score - base_result.readiness_score,
+        current_readiness=current,
+        new_readiness=new,
+        improvement=new - current,
         skill_simulated=skill.name
     )
 
-def get_project_recommendations(user_id: int, db: Session) -> List[schemas.Project]:
-    user = db.query(models.User).filter(models.User.id == user_id).first()
+def _requirement_vector(role: catalog.RoleEntry) -> list:
+    return [(req.skill_id, req.required_level, req.importance_weight) for req in role.required_skills]
+
+def simulate_batch(request: schemas.BatchSimulationRequest, db: Session) -> schemas.BatchSimulationResponse:
+    """
+    Evaluate many what-if changes (and/or one combined plan) for a single user and role.
+    After the user row is loaded everything is arithmetic on the role's requirement vector.
+    """
+    snapshot = catalog.get_catalog(db)
+    user = _load_user(request.user_id, db)
+    role = snapshot.roles_by_id.get(request.role_id)
+    if not user or not role:
+        return None
+    if any(c.skill_id not in snapshot.skills_by_id for c in request.changes + request.plan):
+        return None
+
+    user_skills_map = {us.skill_id: us.proficiency_level for us in user.skills}
+    requirements = _requirement_vector(role)
+    current = readiness_engine.readiness_for(requirements, user_skills_map)
+
+    results = []
+    for change in request.changes:
+        new = readiness_engine.readiness_for(
+            requirements, user_skills_map, {change.skill_id: change.target_level}
+        )
+        results.append(schemas.SimulationResult(
+            skill_id=change.skill_id,
+            skill_simulated=snapshot.skill_name(change.skill_id),
+            target_level=change.target_level,
+            new_readiness=new,
+            improvement=new - current
+        ))
+
+    response = schemas.BatchSimulationResponse(current_readiness=current, results=results)
+    if request.plan:
+        plan_readiness = readiness_engine.readiness_for(
+            requirements, user_skills_map, {c.skill_id: c.target_level for c in request.plan}
+        )
+        response.plan_readiness = plan_readiness
+        response.plan_improvement = plan_readiness - current
+    return response
+
+def get_learning_plan(user_id: int, role_id: int, db: Session,
+                      budget: Optional[int] = None) -> Optional[schemas.LearningPlan]:
+    """Ordered +1 level-ups with the highest readiness gain first, optionally capped at `budget` steps."""
+    snapshot = catalog.get_catalog(db)
+    user = _load_user(user_id, db)
+    role = snapshot.roles_by_id.get(role_id)
+    if not user or not role:
+        return None
+
+    user_skills_map = {us.skill_id: us.proficiency_level for us in user.skills}
+    current, steps = readiness_engine.plan_steps(_requirement_vector(role), user_skills_map, budget)
+
+    return schemas.LearningPlan(
+        user_id=user_id,
+        role_id=role.id,
+        role_title=role.title,
+        current_readiness=current,
+        final_readiness=steps[-1][4] if steps else current,
+        steps=[
+            schemas.PlanStep(
+                step=i + 1,
+                skill_id=skill_id,
+                skill_name=snapshot.skill_name(skill_id),
+                from_level=from_level,
+                to_level=to_level,
+                gain=gain,
+                readiness_after=after
+            ) for i, (skill_id, from_level, to_level, gain, after) in enumerate(steps)
+        ]
+    )
+
+def get_project_recommendations(user_id: int, db: Session, limit: Optional[int] = None, offset: int = 0,
+                                relevance: str = "overlap") -> List[schemas.Project]:
+    """
+    Projects sharing at least one skill with the user (Eligibility Rule), best first.
+    relevance: "overlap" = matching skills / total project skills,
+    "proficiency" = overlap weighted by the user's level on each matching skill,
+    "difficulty" = overlap discounted when difficulty_level is far from the user's level.
+    """
+    user = _load_user(user_id, db)
     if not user:
         return []
 
-    user_skill_ids = {us.skill_id for us in user.skills}
+    user_skills_map = {us.skill_id: us.proficiency_level for us in user.skills}
     
-    all_projects = db.query(models.Project).all()
+    snapshot = catalog.get_catalog(db)
+    index = project_index.get_index(db)
     results = []
     
-    for proj in all_projects:
-        # Calculate overlap
-        req_skills = proj.required_skills
-        if not req_skills:
-            continue
-            
-        match_count = 0
-        current_project_skill_ids = []
-        
-        for ps in req_skills:
-            if ps.skill_id in user_skill_ids:
-                match_count += 1
-            # Build schema structure
-            current_project_skill_ids.append(
-                schemas.ProjectSkillBase(skill_id=ps.skill_id, skill_name=ps.skill.name)
-            )
-            
-        # Relevance Score: Simple overlap percentage or count?
-        # User requested: "relevance = number of matching skills / total project skills"
-        total_req = len(req_skills)
-        relevance = match_count / total_req if total_req > 0 else 0
-        
-        # Only include if at least 1 skill matches (Eligibility Rule)
-        if match_count > 0:
-            # We need to map model -> schema manually or rely on from_attributes
-            # Pydantic from_attributes works, but we need to inject calculated fields.
-            
-            p_schema = schemas.Project(
-                id=proj.id,
-                title=proj.title,
-                description=proj.description,
-                domain=proj.domain,
-                difficulty_level=proj.difficulty_level,
-                github_repo_url=proj.github_repo_url,
-                required_skills=current_project_skill_ids,
-                relevance_score=relevance,
-                match_count=match_count
-            )
-            results.append(p_schema)
-            
-    # Sort by Relevance Descending
-    results.sort(key=lambda x: x.relevance_score, reverse=True)
+    # Only the returned page is expanded into schemas
+    for pos, score, match_count in index.top(user_skills_map, limit, offset, relevance):
+        proj = index.projects[pos]
+        results.append(schemas.Project(
+            id=proj.id,
+            title=proj.title,
+            description=proj.description,
+            domain=proj.domain,
+            difficulty_level=proj.difficulty_level,
+            github_repo_url=proj.github_repo_url,
+            required_skills=[
+                schemas.ProjectSkillBase(skill_id=skill_id, skill_name=snapshot.skill_name(skill_id))
+                for skill_id in proj.skill_ids
+            ],
+            relevance_score=score,
+            match_count=match_count
+        ))
     
     return results
-
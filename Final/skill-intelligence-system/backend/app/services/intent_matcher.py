@@ -0,0 +1,189 @@
+"""
+Intent and skill-mention recognition for the assistant.
+
+Intent keywords and every skill name (plus derived aliases such as "aws"
+for "Cloud Computing (AWS)" or "python" for "Python Programming") are
+compiled into one Aho-Corasick automaton per catalog version. A message is
+then scanned once, left to right, whatever the number of patterns: no
+per-keyword substring scans, no loop over the skills.
+
+Matches must sit on word boundaries ("hi" does not fire inside "this",
+"learn" not inside "learning"), and overlapping matches resolve to the
+leftmost, then longest, so "machine learning" is a skill mention rather
+than the "learning" intent keyword.
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.services import catalog
+
+# In priority order: the first intent present in a message wins
+INTENT_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "score": ("score", "scores", "rating", "why", "analysis"),
+    "gaps": ("gap", "gaps", "missing", "lack", "lacking", "need", "needs", "skill", "skills", "required"),
+    "improve": ("improve", "improving", "learn", "learning", "study", "studying", "resource", "resources", "help"),
+    "projects": ("project", "projects", "build", "building", "portfolio", "hands-on"),
+    "greeting": ("hello", "hi", "hey"),
+}
+INTENTS = tuple(INTENT_KEYWORDS)
+
+# Trailing words dropped to form a short alias: "Python Programming" -> "python"
+GENERIC_SUFFIXES = ("programming", "basics", "fundamentals", "systems", "skills")
+# Short aliases shorter than this are only kept when they came from a parenthetical ("AWS")
+MIN_ALIAS_LENGTH = 3
+
+_WORD = re.compile(r"[a-z0-9]")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize(text: str) -> str:
+    return _SPACES.sub(" ", text.lower()).strip()
+
+
+def _is_word(ch: str) -> bool:
+    return bool(_WORD.match(ch))
+
+
+class AhoCorasick:
+    """Multi-pattern matcher: add() patterns with a payload, build(), then find() in O(len(text) + matches)."""
+
+    def __init__(self):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        # Patterns ending at the node itself: (length, payload)
+        self.out: List[List[Tuple[int, Hashable]]] = [[]]
+        # Nearest node on the fail chain that has outputs
+        self.out_link: List[int] = [0]
+
+    def add(self, pattern: str, payload: Hashable):
+        node = 0
+        for ch in pattern:
+            nxt = self.goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[node][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+                self.out_link.append(0)
+            node = nxt
+        self.out[node].append((len(pattern), payload))
+
+    def build(self) -> "AhoCorasick":
+        queue = list(self.goto[0].values())
+        for node in queue:  # breadth-first: a node's fail target is always finished first
+            for ch, child in self.goto[node].items():
+                f = self.fail[node]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                target = self.goto[f].get(ch, 0)
+                self.fail[child] = target if target != child else 0
+                self.out_link[child] = target if self.out[target] else self.out_link[target]
+                queue.append(child)
+        return self
+
+    def find(self, text: str) -> List[Tuple[int, int, Hashable]]:
+        """Every (start, end, payload) occurrence, overlapping ones included."""
+        goto, fail, out, out_link = self.goto, self.fail, self.out, self.out_link
+        found = []
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = node if out[node] else out_link[node]
+            while hit:
+                for length, payload in out[hit]:
+                    found.append((i + 1 - length, i + 1, payload))
+                hit = out_link[hit]
+        return found
+
+
+@dataclass
+class Scan:
+    intent: Optional[str]
+    skill_ids: List[int]  # in order of first mention
+
+
+def skill_aliases(name: str) -> List[Tuple[str, bool]]:
+    """(alias, is_explicit) for one skill name; explicit aliases are the name itself and parentheticals."""
+    full = normalize(name)
+    aliases = [(full, True)]
+    base = normalize(re.sub(r"\(.*?\)", " ", full))
+    aliases += [(normalize(p), True) for p in re.findall(r"\((.*?)\)", full)]
+    if base != full:
+        aliases.append((base, False))
+    for part in re.split(r"\s*[&/]\s*", base):
+        aliases.append((part, False))
+    words = base.split()
+    if len(words) > 1 and words[-1] in GENERIC_SUFFIXES:
+        aliases.append((" ".join(words[:-1]), False))
+    seen = {}
+    for alias, explicit in aliases:
+        if alias and (explicit or len(alias) >= MIN_ALIAS_LENGTH):
+            seen[alias] = seen.get(alias, False) or explicit
+    return list(seen.items())
+
+
+class Recognizer:
+    def __init__(self, skills: List[Tuple[int, str]]):
+        self.automaton = AhoCorasick()
+        keywords = {}
+        for intent, words in INTENT_KEYWORDS.items():
+            for word in words:
+                keywords.setdefault(word, ("intent", intent))
+
+        # An alias shared by several skills is ambiguous and dropped, unless it is a skill's full name
+        claims: Dict[str, List[Tuple[int, bool]]] = {}
+        for skill_id, name in skills:
+            for alias, explicit in skill_aliases(name):
+                claims.setdefault(alias, []).append((skill_id, explicit))
+        patterns: Dict[str, Tuple[str, Hashable]] = {}
+        for alias, owners in claims.items():
+            full_names = [skill_id for skill_id, explicit in owners if explicit]
+            if len(owners) == 1 or len(full_names) == 1:
+                patterns[alias] = ("skill", owners[0][0] if len(owners) == 1 else full_names[0])
+        # Skill names win over intent keywords ("Communication" vs nothing, "Data Analysis" vs "analysis")
+        for word, payload in keywords.items():
+            patterns.setdefault(word, payload)
+
+        for pattern, payload in patterns.items():
+            self.automaton.add(pattern, payload)
+        self.automaton.build()
+        self.pattern_count = len(patterns)
+
+    def matches(self, text: str) -> List[Tuple[int, int, Tuple[str, Hashable]]]:
+        """Word-bounded, non-overlapping (leftmost, then longest) matches in normalized text."""
+        candidates = [
+            (start, end, payload) for start, end, payload in self.automaton.find(text)
+            if (start == 0 or not _is_word(text[start - 1])) and (end == len(text) or not _is_word(text[end]))
+        ]
+        candidates.sort(key=lambda m: (m[0], -m[1]))
+        chosen, position = [], 0
+        for start, end, payload in candidates:
+            if start >= position:
+                chosen.append((start, end, payload))
+                position = end
+        return chosen
+
+    def scan(self, message: str) -> Scan:
+        intents, skill_ids = set(), []
+        for _, _, (kind, value) in self.matches(normalize(message)):
+            if kind == "intent":
+                intents.add(value)
+            elif value not in skill_ids:
+                skill_ids.append(value)
+        intent = next((name for name in INTENTS if name in intents), None)
+        return Scan(intent=intent, skill_ids=skill_ids)
+
+
+def build_recognizer(snapshot: catalog.CatalogSnapshot) -> Recognizer:
+    return Recognizer([(skill.id, skill.name) for skill in snapshot.skills])
+
+
+def get_recognizer(db: Session) -> Recognizer:
+    """Recognizer for the current catalog version, built once per snapshot."""
+    return catalog.get_catalog(db).derive("intent_recognizer", build_recognizer)
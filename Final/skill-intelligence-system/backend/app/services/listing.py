@@ -0,0 +1,111 @@
+"""
+Keyset pagination and NDJSON streaming for the catalog list endpoints.
+
+The unfiltered full lists are served from the catalog snapshot. Filtered or
+paged requests, and streams, go to the database instead: pages are fetched
+with `id > cursor ORDER BY id LIMIT n` (a primary-key range scan, no OFFSET),
+and streams iterate a server-side result with yield_per, serializing each
+batch as it arrives. Either way memory is bounded by the page or batch size,
+not by the size of the table.
+
+Streams use the same keyset as pages: they start after `cursor` and stop
+after `limit` items if given. Lines come in id order, so a client whose
+stream was cut off resumes with cursor=<id of the last complete line>.
+"""
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app import models, schemas
+from app.database import AsyncSessionLocal
+
+PAGE_SIZE = 100
+STREAM_BATCH = 500
+
+
+@dataclass(frozen=True)
+class Listing:
+    statement: Select  # filtered, not yet ordered or limited
+    id_column: Any
+    serialize: Callable[[Any], bytes]
+    orm: bool = False  # rows are ORM entities (scalars) rather than column tuples
+
+
+def _ci_equals(column, value: str):
+    return func.lower(column) == value.lower()
+
+
+def skills(category: Optional[str] = None) -> Listing:
+    s = models.Skill
+    stmt = select(s.id, s.name, s.category)
+    if category:
+        stmt = stmt.where(_ci_equals(s.category, category))
+    return Listing(stmt, s.id, lambda row: schemas.Skill.model_validate(row._mapping).model_dump_json().encode())
+
+
+def resources(skill_id: Optional[int] = None, provider: Optional[str] = None) -> Listing:
+    lr = models.LearningResource
+    stmt = select(lr.id, lr.title, lr.type, lr.provider, lr.link, lr.difficulty_level)
+    if skill_id is not None:
+        stmt = stmt.where(lr.skill_id == skill_id)
+    if provider:
+        stmt = stmt.where(_ci_equals(lr.provider, provider))
+    return Listing(stmt, lr.id, lambda row: schemas.ResourceRecommendation.model_validate(row._mapping).model_dump_json().encode())
+
+
+def roles(domain: Optional[str] = None) -> Listing:
+    jr = models.JobRole
+    # selectinload batches requirements per page / per yield_per batch
+    stmt = select(jr).options(selectinload(jr.required_skills).selectinload(models.JobSkill.skill))
+    if domain:
+        stmt = stmt.where(_ci_equals(jr.domain, domain))
+    return Listing(stmt, jr.id, lambda role: schemas.JobRole.model_validate(role).model_dump_json().encode(), orm=True)
+
+
+def _after(listing: Listing, cursor: Optional[int]) -> Select:
+    stmt = listing.statement
+    if cursor is not None:
+        stmt = stmt.where(listing.id_column > cursor)
+    return stmt.order_by(listing.id_column)
+
+
+async def fetch_page(db: AsyncSession, listing: Listing, cursor: Optional[int],
+                     limit: int) -> Tuple[bytes, Optional[int]]:
+    """(JSON array of up to `limit` items after `cursor`, cursor of the next page or None)."""
+    result = await db.execute(_after(listing, cursor).limit(limit + 1))
+    rows = result.scalars().all() if listing.orm else result.all()
+    next_cursor = rows[limit - 1].id if len(rows) > limit else None
+    return b"[" + b",".join(listing.serialize(row) for row in rows[:limit]) + b"]", next_cursor
+
+
+async def stream(listing: Listing, cursor: Optional[int] = None,
+                 limit: Optional[int] = None) -> AsyncIterator[bytes]:
+    """NDJSON, one item per line, in id order. Owns its session: it outlives the request handler."""
+    stmt = _after(listing, cursor)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt.execution_options(yield_per=STREAM_BATCH))
+        if listing.orm:
+            result = result.scalars()
+        async for batch in result.partitions():
+            yield b"".join(listing.serialize(row) + b"\n" for row in batch)
+
+
+def page_response(request: Request, body: bytes, next_cursor: Optional[int]) -> Response:
+    """A page keeps the plain JSON array body; the next cursor goes in X-Next-Cursor and Link."""
+    headers = {}
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = str(next_cursor)
+        headers["Link"] = f'<{request.url.include_query_params(cursor=next_cursor)}>; rel="next"'
+    return Response(body, media_type="application/json", headers=headers)
+
+
+def stream_response(listing: Listing, cursor: Optional[int] = None,
+                    limit: Optional[int] = None) -> StreamingResponse:
+    return StreamingResponse(stream(listing, cursor, limit), media_type="application/x-ndjson")
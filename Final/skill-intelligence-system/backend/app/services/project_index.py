@@ -0,0 +1,66 @@
+"""
+Inverted index for project recommendations.
+
+Postings map skill_id -> positions of the projects that require it, built
+once per catalog snapshot. Match counts are accumulated only over the
+postings of the user's skills, so a recommendation costs work proportional
+to the user's skills (and their postings), not to the number of projects.
+"""
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.services import catalog
+
+
+class ProjectIndex:
+    def __init__(self, projects: Tuple[catalog.ProjectEntry, ...]):
+        self.projects = projects
+        self.skill_counts = [len(set(p.skill_ids)) for p in projects]
+        postings: Dict[int, List[int]] = {}
+        for pos, proj in enumerate(projects):
+            for skill_id in set(proj.skill_ids):
+                postings.setdefault(skill_id, []).append(pos)
+        self.postings = {k: tuple(v) for k, v in postings.items()}
+
+    def match(self, user_skills_map: Dict[int, int]) -> Dict[int, List[int]]:
+        """Project position -> proficiency levels of the user's matching skills."""
+        matches: Dict[int, List[int]] = {}
+        for skill_id, level in user_skills_map.items():
+            for pos in self.postings.get(skill_id, ()):
+                matches.setdefault(pos, []).append(level)
+        return matches
+
+    def score(self, pos: int, levels: List[int], relevance: str) -> float:
+        total_req = self.skill_counts[pos]
+        if relevance == "proficiency":
+            # Matching skills count in proportion to how well the user knows them (1-5)
+            return sum(min(max(l, 0), 5) for l in levels) / (5 * total_req)
+        overlap = len(levels) / total_req
+        if relevance == "difficulty":
+            # Prefer projects pitched at the user's level on the matched skills:
+            # average proficiency 1-5 mapped onto difficulty 1-3
+            avg = sum(levels) / len(levels)
+            band = 1 if avg <= 2 else (2 if avg <= 3.5 else 3)
+            fit = 1.0 - abs(self.projects[pos].difficulty_level - band) / 3
+            return overlap * fit
+        return overlap
+
+    def top(self, user_skills_map: Dict[int, int], limit: Optional[int] = None, offset: int = 0,
+            relevance: str = "overlap") -> List[Tuple[int, float, int]]:
+        """[(position, relevance, match_count)] best first; ties keep catalog order."""
+        scored = (
+            (self.score(pos, levels, relevance), -pos, len(levels))
+            for pos, levels in self.match(user_skills_map).items()
+        )
+        key = lambda item: (item[0], item[1])
+        if limit is None:
+            ranked = sorted(scored, key=key, reverse=True)
+        else:
+            ranked = heapq.nlargest(offset + limit, scored, key=key)
+        return [(-neg_pos, score, count) for score, neg_pos, count in ranked[offset:]]
+
+
+def get_index(db: Session) -> ProjectIndex:
+    return catalog.get_catalog(db).derive("project_index", lambda snapshot: ProjectIndex(snapshot.projects))
@@ -0,0 +1,251 @@
+"""
+Vectorized readiness scoring.
+
+The role catalog is packed once per catalog version into per-skill column
+postings: for every skill, the roles that require it with their
+required_level and importance_weight (a CSC layout, so memory follows the
+number of requirements, not roles x skills). Scoring a user against every
+role is then a single NumPy pass over the postings of the skills they
+actually have, instead of a Python loop per role and per requirement.
+"""
+import heapq
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.services import catalog
+
+# (skill_id, skill_name, required_level, importance_weight)
+Requirement = Tuple[int, str, int, float]
+# (role_id, title, domain, requirements)
+RoleSpec = Tuple[int, str, str, Sequence[Requirement]]
+
+
+class ReadinessEngine:
+    def __init__(self, roles: Sequence[RoleSpec]):
+        self.role_ids = np.array([r[0] for r in roles], dtype=np.int64)
+        self.role_titles = [r[1] for r in roles]
+        self.role_domains = [r[2] for r in roles]
+        domain_codes: Dict[str, int] = {}
+        self.role_domain_codes = np.array(
+            [domain_codes.setdefault((d or "").lower(), len(domain_codes)) for d in self.role_domains],
+            dtype=np.int32,
+        )
+        self.domain_codes = domain_codes
+        self.requirements = [tuple(r[3]) for r in roles]
+        self.role_index = {role_id: i for i, role_id in enumerate(self.role_ids.tolist())}
+
+        skill_ids = sorted({req[0] for reqs in self.requirements for req in reqs})
+        self.skill_col = {skill_id: j for j, skill_id in enumerate(skill_ids)}
+
+        # One entry per requirement with a positive level. A skill listed twice for
+        # a role is two entries, so both count, as in readiness_for()
+        entries = [
+            (self.skill_col[skill_id], i, level, importance)
+            for i, reqs in enumerate(self.requirements)
+            for skill_id, _, level, importance in reqs
+            if level > 0
+        ]
+        n_roles, n_skills = len(roles), len(skill_ids)
+        cols = np.array([e[0] for e in entries], dtype=np.int64)
+        # Column-major (by skill, then role): a user's skills are contiguous slices
+        order = np.argsort(cols, kind="stable")
+        self.col_roles = np.array([e[1] for e in entries], dtype=np.int64)[order]
+        self.col_required = np.array([e[2] for e in entries], dtype=np.float64)[order]
+        self.col_weight = np.array([e[3] for e in entries], dtype=np.float64)[order]
+        self.col_ptr = np.zeros(n_skills + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cols, minlength=n_skills), out=self.col_ptr[1:])
+
+        # Max possible "volume" of each role: sum(required_level * importance_weight)
+        self.total_possible_weight = np.bincount(
+            self.col_roles, weights=self.col_required * self.col_weight, minlength=n_roles)
+        self.requirement_count = np.bincount(self.col_roles, minlength=n_roles)
+
+    def column(self, skill_id: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(role positions, required levels, importance weights) of the roles requiring the skill."""
+        j = self.skill_col.get(skill_id)
+        if j is None:
+            empty = np.zeros(0)
+            return np.zeros(0, dtype=np.int64), empty, empty
+        sl = slice(self.col_ptr[j], self.col_ptr[j + 1])
+        return self.col_roles[sl], self.col_required[sl], self.col_weight[sl]
+
+    def __len__(self) -> int:
+        return len(self.role_ids)
+
+    def score(self, user_skills_map: Dict[int, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Readiness of one user against every role.
+        Returns (readiness_scores, missing_skill_counts), both indexed like role_ids.
+        """
+        _, missing, _, readiness = self.components(user_skills_map)
+        return readiness, missing
+
+    def components(self, user_skills_map: Dict[int, int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        (covered_weight, missing_count, weighted_gap, readiness) of one user against every role.
+
+        Skills the user lacks contribute their full weight to the gap, so only the
+        columns of skills the user has need to be touched:
+        Weighted Gap = Total Possible - sum(min(required, user) * importance)
+        """
+        cols, levels = [], []
+        for skill_id, level in user_skills_map.items():
+            j = self.skill_col.get(skill_id)
+            if j is not None:
+                cols.append(j)
+                levels.append(level)
+
+        total = self.total_possible_weight
+        if cols:
+            # Gather the postings of the user's columns, each entry paired with the user's level
+            starts, ends = self.col_ptr[cols], self.col_ptr[np.asarray(cols) + 1]
+            lengths = ends - starts
+            offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+            entries = offsets + np.arange(lengths.sum())
+            user = np.repeat(np.asarray(levels, dtype=np.float64), lengths)
+            roles, required = self.col_roles[entries], self.col_required[entries]
+            n_roles = len(total)
+            covered = np.bincount(roles, weights=np.minimum(required, user) * self.col_weight[entries],
+                                  minlength=n_roles)
+            met = np.bincount(roles[user >= required], minlength=n_roles)
+            missing = self.requirement_count - met
+            weighted_gap = np.where(missing == 0, 0.0, total - covered)
+        else:
+            covered = np.zeros(len(total))
+            missing = self.requirement_count.copy()
+            weighted_gap = total
+
+        safe_total = np.where(total == 0, 1.0, total)
+        readiness = np.where(total == 0, 1.0, 1.0 - weighted_gap / safe_total)
+        return covered, missing, weighted_gap, np.maximum(readiness, 0.0)
+
+    def rank(self, user_skills_map: Dict[int, int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Role positions ordered by readiness descending (ties keep catalog order)."""
+        scores, missing = self.score(user_skills_map)
+        order = np.argsort(-scores, kind="stable")
+        return order, scores, missing
+
+    def top(self, user_skills_map: Dict[int, int], limit: Optional[int] = None,
+            min_readiness: float = 0.0, domain: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Like rank(), but filtered by domain / min_readiness and cut to the best `limit`.
+        Selection is a partition around the limit-th best score (O(n)); only the
+        survivors are sorted, so the cost of ordering depends on K, not on the catalog.
+        """
+        scores, missing = self.score(user_skills_map)
+
+        mask = scores >= min_readiness
+        if domain is not None:
+            code = self.domain_codes.get(domain.lower())
+            if code is None:
+                return np.empty(0, dtype=np.intp), scores, missing
+            mask &= self.role_domain_codes == code
+        candidates = np.flatnonzero(mask)
+
+        if limit is not None and limit < len(candidates):
+            if limit <= 0:
+                return np.empty(0, dtype=np.intp), scores, missing
+            cand_scores = scores[candidates]
+            kth = np.partition(cand_scores, len(cand_scores) - limit)[len(cand_scores) - limit]
+            above = candidates[cand_scores > kth]
+            # Ties at the boundary keep catalog order, same as a full stable sort
+            ties = candidates[cand_scores == kth][: limit - len(above)]
+            candidates = np.sort(np.concatenate([above, ties]))
+
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return order, scores, missing
+
+
+def readiness_for(requirements: Sequence[Tuple[int, int, float]], user_skills_map: Dict[int, int],
+                  overrides: Optional[Dict[int, int]] = None) -> float:
+    """
+    Readiness of one role from its requirement vector [(skill_id, required_level, importance_weight)],
+    with optional what-if `overrides` (skill_id -> level) layered over the user's levels.
+    Same arithmetic and summation order as intelligence.calculate_readiness, without gap details.
+    """
+    total_weighted_gap = 0.0
+    total_possible_weight = 0.0
+    for skill_id, required_level, importance in requirements:
+        total_possible_weight += required_level * importance
+        if overrides and skill_id in overrides:
+            user_level = overrides[skill_id]
+        else:
+            user_level = user_skills_map.get(skill_id, 0)
+        total_weighted_gap += max(0, required_level - user_level) * importance
+    if total_possible_weight == 0:
+        return 1.0
+    return max(0.0, 1.0 - (total_weighted_gap / total_possible_weight))
+
+
+def plan_steps(requirements: Sequence[Tuple[int, int, float]], user_skills_map: Dict[int, int],
+               budget: Optional[int] = None) -> Tuple[float, List[Tuple[int, int, int, float, float]]]:
+    """
+    Greedy learning plan: repeatedly take the +1 proficiency step with the largest
+    readiness gain. Returns (current_readiness, [(skill_id, from, to, gain, readiness_after)]).
+
+    A step on a skill gains sum(importance of requirements still above the level) / total,
+    so each skill's next gain is known without re-scoring the role. The queue holds one
+    entry per skill; popping a step and pushing that skill's next step is O(log n), and
+    a 50-step plan costs about one readiness evaluation plus 50 heap operations.
+    Ties prefer the skill closest to being fully met (it also lowers the missing count).
+    """
+    terms: Dict[int, List[Tuple[int, float]]] = {}
+    total_possible_weight = 0.0
+    total_weighted_gap = 0.0
+    for skill_id, required_level, importance in requirements:
+        terms.setdefault(skill_id, []).append((required_level, importance))
+        total_possible_weight += required_level * importance
+        total_weighted_gap += max(0, required_level - user_skills_map.get(skill_id, 0)) * importance
+    if total_possible_weight == 0:
+        return 1.0, []
+
+    def step_gain(skill_id, level):
+        return sum(w for req, w in terms[skill_id] if level < req) / total_possible_weight
+
+    def steps_left(skill_id, level):
+        return max(req for req, _ in terms[skill_id]) - level
+
+    heap = []
+    remaining_steps = 0
+    for order, skill_id in enumerate(terms):
+        level = user_skills_map.get(skill_id, 0)
+        left = steps_left(skill_id, level)
+        if left > 0:
+            remaining_steps += left
+            heapq.heappush(heap, (-step_gain(skill_id, level), left, order, skill_id, level))
+
+    current = max(0.0, 1.0 - total_weighted_gap / total_possible_weight)
+    readiness = current
+    steps = []
+    while heap and (budget is None or len(steps) < budget):
+        neg_gain, left, order, skill_id, level = heapq.heappop(heap)
+        remaining_steps -= 1
+        # Snap to exactly 1.0 once every gap is closed instead of accumulating float error
+        readiness = 1.0 if remaining_steps == 0 else min(1.0, readiness - neg_gain)
+        steps.append((skill_id, level, level + 1, -neg_gain, readiness))
+        if left > 1:
+            heapq.heappush(heap, (-step_gain(skill_id, level + 1), left - 1, order, skill_id, level + 1))
+    return current, steps
+
+
+def build_engine(snapshot: catalog.CatalogSnapshot) -> ReadinessEngine:
+    specs: List[RoleSpec] = [
+        (
+            role.id,
+            role.title,
+            role.domain,
+            [
+                (req.skill_id, snapshot.skill_name(req.skill_id), req.required_level, req.importance_weight)
+                for req in role.required_skills
+            ],
+        )
+        for role in snapshot.roles
+    ]
+    return ReadinessEngine(specs)
+
+
+def get_engine(db: Session) -> ReadinessEngine:
+    """Engine for the current catalog version, built once per snapshot."""
+    return catalog.get_catalog(db).derive("readiness_engine", build_engine)
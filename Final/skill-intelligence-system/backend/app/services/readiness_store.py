@@ -0,0 +1,206 @@
+"""
+Materialized readiness: one user_role_readiness row per (user, role).
+
+A user's rows are built in one pass of the ReadinessEngine the first time
+their recommendations are read for a catalog version (users.readiness_version
+records which one). After that a single user_skills write only touches the
+roles that require that skill: the skill -> roles index gives their
+required level, importance and total weight, and the change is applied as a
+delta to covered_weight / missing_skill_count, from which weighted_gap and
+readiness_score are recomputed in the same UPDATE. /roles/recommend is then
+an ORDER BY readiness_score DESC ... LIMIT range scan on
+ix_user_role_readiness_rank instead of scoring the whole catalog.
+
+ORM writes to UserSkill are picked up by the after_flush hook below. Core
+(bulk) writes must call invalidate() for the users they touch; a catalog
+change makes every user's rows stale, and they are rebuilt lazily on read.
+"""
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import Float, bindparam, case, delete, event, func, insert, select, update
+from sqlalchemy.orm import Session, attributes
+
+from app import models
+from app.services import catalog, readiness_engine
+
+# skill_id -> (role_ids, required_levels, importance_weights, role_total_weights), aligned arrays
+SkillRoles = Dict[int, Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]
+# (user_id, skill_id, old_level, new_level); a missing skill is level 0
+LevelChange = Tuple[int, int, int, int]
+
+
+def _engine(snapshot: catalog.CatalogSnapshot) -> readiness_engine.ReadinessEngine:
+    return snapshot.derive("readiness_engine", readiness_engine.build_engine)
+
+
+def build_skill_roles(engine: readiness_engine.ReadinessEngine) -> SkillRoles:
+    index = {}
+    for skill_id in engine.skill_col:
+        rows, required, weight = engine.column(skill_id)
+        index[skill_id] = (engine.role_ids[rows], required, weight, engine.total_possible_weight[rows])
+    return index
+
+
+def skill_roles(snapshot: catalog.CatalogSnapshot) -> SkillRoles:
+    # derive() holds the snapshot's lock while building, so the engine is fetched first
+    engine = _engine(snapshot)
+    return snapshot.derive("skill_roles", lambda _: build_skill_roles(engine))
+
+
+def _delta_statement():
+    t = models.UserRoleReadiness.__table__
+    u = models.User.__table__
+    covered = t.c.covered_weight + bindparam("dc", type_=Float)
+    missing = t.c.missing_skill_count - bindparam("dm")
+    total = bindparam("total", type_=Float)
+    gap = case((missing == 0, 0.0), else_=total - covered)
+    return (
+        update(t)
+        .where(t.c.user_id == bindparam("u"), t.c.role_id == bindparam("r"))
+        # Only rows built for this catalog version; stale rows are rebuilt on read anyway
+        .where(t.c.user_id.in_(select(u.c.id).where(u.c.id == bindparam("u"),
+                                                     u.c.readiness_version == bindparam("v"))))
+        .values(
+            covered_weight=covered,
+            missing_skill_count=missing,
+            weighted_gap=gap,
+            # covered_weight <= total, so the score needs no clamping at 0
+            readiness_score=case((total == 0, 1.0), else_=1.0 - gap / total),
+        )
+    )
+
+
+_DELTA = _delta_statement()
+
+
+def apply_changes(connection, snapshot: catalog.CatalogSnapshot, changes: Iterable[LevelChange]) -> int:
+    """
+    Apply level changes as deltas to the affected (user, role) rows; returns the
+    number of rows targeted. Rows stamped with another catalog version than the
+    snapshot's get no delta and are invalidated instead, so a process whose
+    snapshot lags one already used to build them can't leave them wrong.
+    """
+    index = skill_roles(snapshot)
+    params: Dict[Tuple[int, int], dict] = {}
+    users = set()
+    for user_id, skill_id, old, new in changes:
+        users.add(user_id)
+        entry = index.get(skill_id)
+        if entry is None or old == new:
+            continue
+        role_ids, required, weight, totals = entry
+        dc = (np.minimum(required, new) - np.minimum(required, old)) * weight
+        dm = (new >= required).astype(np.int64) - (old >= required)
+        for k in np.flatnonzero((dc != 0) | (dm != 0)).tolist():
+            role_id = int(role_ids[k])
+            p = params.setdefault((user_id, role_id), {
+                "u": user_id, "r": role_id, "v": snapshot.version,
+                "total": float(totals[k]), "dc": 0.0, "dm": 0,
+            })
+            p["dc"] += float(dc[k])
+            p["dm"] += int(dm[k])
+    if params:
+        connection.execute(_DELTA, list(params.values()))
+    if users:
+        u = models.User.__table__
+        connection.execute(update(u).where(u.c.id.in_(sorted(users)), u.c.readiness_version != snapshot.version)
+                           .values(readiness_version=None))
+    return len(params)
+
+
+def invalidate(connection, user_ids: Iterable[int]) -> None:
+    """Mark users' rows stale after writes the hook can't see; they are rebuilt on the next read."""
+    ids = sorted(set(user_ids))
+    if ids:
+        u = models.User.__table__
+        connection.execute(update(u).where(u.c.id.in_(ids)).values(readiness_version=None))
+
+
+def materialize(db: Session, user: models.User, user_skills_map: Dict[int, int],
+                snapshot: catalog.CatalogSnapshot) -> bool:
+    """
+    Rebuild and commit all of the user's rows for this catalog version. Returns
+    False (and writes nothing) if the user was modified since `user` was loaded.
+
+    The rebuild runs in a session of its own: the caller is usually serving a
+    read, and its session is neither committed nor rolled back here.
+    """
+    t = models.UserRoleReadiness.__table__
+    u = models.User.__table__
+    engine = _engine(snapshot)
+    covered, missing, gap, readiness = engine.components(user_skills_map)
+    rows = [
+        {"user_id": user.id, "role_id": role_id, "readiness_score": score,
+         "missing_skill_count": count, "weighted_gap": g, "covered_weight": c}
+        for role_id, score, count, g, c in zip(
+            engine.role_ids.tolist(), readiness.tolist(), missing.tolist(), gap.tolist(), covered.tolist())
+    ]
+
+    with Session(bind=db.get_bind()) as session:
+        session.execute(delete(t).where(t.c.user_id == user.id))
+        if rows:
+            session.execute(insert(t), rows)
+        # users.version moves with every skill write: a concurrent one means user_skills_map is stale
+        stamped = session.execute(
+            update(u).where(u.c.id == user.id, u.c.version == user.version).values(readiness_version=snapshot.version)
+        ).rowcount
+        if not stamped:
+            session.rollback()
+            return False
+        session.commit()
+    attributes.set_committed_value(user, "readiness_version", snapshot.version)
+    return True
+
+
+def ensure(db: Session, user: models.User, user_skills_map: Dict[int, int],
+           snapshot: catalog.CatalogSnapshot) -> bool:
+    """True if the user's rows are current for this snapshot (building them if needed)."""
+    if user.readiness_version == snapshot.version:
+        return True
+    return materialize(db, user, user_skills_map, snapshot)
+
+
+def top(db: Session, user_id: int, limit: Optional[int] = None, min_readiness: float = 0.0,
+        domain: Optional[str] = None) -> List[Tuple[int, float, int]]:
+    """(role_id, readiness_score, missing_skill_count), best first, ties by role id."""
+    t = models.UserRoleReadiness.__table__
+    stmt = select(t.c.role_id, t.c.readiness_score, t.c.missing_skill_count).where(t.c.user_id == user_id)
+    if min_readiness > 0:
+        stmt = stmt.where(t.c.readiness_score >= min_readiness)
+    if domain is not None:
+        jr = models.JobRole.__table__
+        stmt = stmt.join(jr, jr.c.id == t.c.role_id).where(func.lower(jr.c.domain) == domain.lower())
+    stmt = stmt.order_by(t.c.readiness_score.desc(), t.c.role_id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return [tuple(row) for row in db.execute(stmt)]
+
+
+def _level(value: Optional[int]) -> int:
+    return value or 0
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_user_skill_deltas(session, flush_context):
+    changes: List[LevelChange] = []
+    unknown = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, models.UserSkill):
+            continue
+        if obj in session.new:
+            changes.append((obj.user_id, obj.skill_id, 0, _level(obj.proficiency_level)))
+        elif obj in session.deleted:
+            changes.append((obj.user_id, obj.skill_id, _level(obj.proficiency_level), 0))
+        else:
+            history = attributes.get_history(obj, "proficiency_level")
+            if history.deleted:
+                changes.append((obj.user_id, obj.skill_id, _level(history.deleted[0]),
+                                _level(obj.proficiency_level)))
+            elif history.added:
+                # Set on an expired instance: the old level was never loaded, so no delta exists
+                unknown.add(obj.user_id)
+    if changes:
+        apply_changes(session.connection(), catalog.get_catalog(session), changes)
+    invalidate(session.connection(), unknown)
@@ -0,0 +1,138 @@
+"""
+Role lookup from free text for the assistant ("what about Data Scientist?").
+
+Role titles are tokenized once per catalog version into an inverted index
+(token -> role positions) with IDF weights, so a message is matched by
+looking up its own tokens instead of re-tokenizing every title. A role's
+score is the summed IDF of the title tokens the message mentions; ties go
+to the role whose title is covered best, then to catalog order.
+
+A match needs a score of at least min_score, the IDF of a token held by
+COMMON_SHARE of all titles (or of a token held by one title, in catalogs too
+small for that share). So a common word ("data", "senior") never selects a
+role on its own, but two of them together, or any rarer word, can. Scores are summed in a dict over the posting lists of the message's
+own tokens, so a match costs the length of those lists, not the number of
+roles; messages without title words cost a few dict lookups.
+
+Message tokens that are not in the vocabulary are corrected through a
+trigram index: candidates sharing enough trigrams are verified with a
+bounded edit distance (1, or 2 for long tokens). Numbers are never corrected.
+"""
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.services import catalog
+
+COMMON_SHARE = 0.2
+MIN_FUZZY_LENGTH = 5
+
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN.findall(text.lower())
+
+
+def trigrams(token: str) -> Set[str]:
+    padded = f"${token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def within_distance(a: str, b: str, k: int) -> bool:
+    """Levenshtein(a, b) <= k, computed on a band of width 2k + 1."""
+    if abs(len(a) - len(b)) > k:
+        return False
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        lo, hi = max(1, i - k), min(len(b), i + k)
+        current = [i] + [k + 1] * len(b)
+        for j in range(lo, hi + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != b[j - 1]))
+        if min(current[max(0, lo - 1):hi + 1]) > k:
+            return False
+        previous = current
+    return previous[len(b)] <= k
+
+
+class RoleMatcher:
+    def __init__(self, roles: Sequence[Tuple[int, str]]):
+        self.role_ids = [role_id for role_id, _ in roles]
+        title_tokens = [set(tokenize(title)) for _, title in roles]
+
+        positions: Dict[str, List[int]] = {}
+        for position, tokens in enumerate(title_tokens):
+            for token in tokens:
+                positions.setdefault(token, []).append(position)
+        self.postings = {token: tuple(p) for token, p in positions.items()}
+
+        n = len(roles)
+        self.idf = {token: math.log(1.0 + n / len(p)) for token, p in positions.items()}
+        # What a token held by exactly COMMON_SHARE of the titles scores, capped at what a token
+        # of a single title scores: with 4 roles or fewer no token could reach the share bound
+        self.min_score = min(math.log(1.0 + 1.0 / COMMON_SHARE), math.log(1.0 + n))
+        self.title_weight = [sum(self.idf[t] for t in tokens) for tokens in title_tokens]
+
+        self.trigram_postings: Dict[str, List[str]] = {}
+        for token in positions:
+            if len(token) >= MIN_FUZZY_LENGTH - 1 and not token.isdigit():
+                for gram in trigrams(token):
+                    self.trigram_postings.setdefault(gram, []).append(token)
+
+    def __len__(self) -> int:
+        return len(self.role_ids)
+
+    def correct(self, token: str) -> Optional[str]:
+        """Closest vocabulary token within the edit budget, or None."""
+        if len(token) < MIN_FUZZY_LENGTH or token.isdigit():
+            return None
+        k = 1 if len(token) < 8 else 2
+        grams = trigrams(token)
+        shared = Counter(t for gram in grams for t in self.trigram_postings.get(gram, ()))
+        # One edit changes at most 3 trigrams, so a true match shares at least this many
+        needed = max(1, len(grams) - 3 * k)
+        candidates = sorted((t for t, count in shared.items() if count >= needed),
+                            key=lambda t: (-shared[t], -self.idf[t], t))
+        for candidate in candidates:
+            if within_distance(token, candidate, k):
+                return candidate
+        return None
+
+    def resolve(self, text: str) -> List[str]:
+        """The message's tokens mapped onto the title vocabulary (typos corrected), in a stable order."""
+        resolved = set()
+        for token in set(tokenize(text)):
+            if token in self.postings:
+                resolved.add(token)
+            else:
+                corrected = self.correct(token)
+                if corrected is not None:
+                    resolved.add(corrected)
+        return sorted(resolved)
+
+    def match(self, text: str) -> Optional[int]:
+        """Id of the best-matching role, or None if nothing reaches min_score."""
+        score: Dict[int, float] = {}
+        for token in self.resolve(text):
+            weight = self.idf[token]
+            for position in self.postings[token]:
+                score[position] = score.get(position, 0.0) + weight
+        if not score:
+            return None
+        # Ties: the best-covered title (least weight left unmentioned), then catalog order
+        best = min(score, key=lambda position: (-score[position], self.title_weight[position], position))
+        if score[best] < self.min_score - 1e-9:
+            return None
+        return self.role_ids[best]
+
+
+def build_matcher(snapshot: catalog.CatalogSnapshot) -> RoleMatcher:
+    return RoleMatcher([(role.id, role.title) for role in snapshot.roles])
+
+
+def get_matcher(db: Session) -> RoleMatcher:
+    """Matcher for the current catalog version, built once per snapshot."""
+    return catalog.get_catalog(db).derive("role_matcher", build_matcher)
@@ -0,0 +1,277 @@
+"""
+Offline search over the catalog: skills, learning resources, projects and roles.
+
+Every catalog entry is a document. Its text is analyzed into word features
+and character trigram features (role_matcher.trigrams), so prefixes and
+typos ("kubernets") still land near the right entries. Weighting is SMART
+lnc.ltc: a document vector is its sublinear tf (trigrams down-weighted,
+title words counted TITLE_BOOST times), L2-normalized, with no idf; the
+query carries the idf (smoothed) and is L2-normalized too, so a score is
+still a cosine. Vectors are stored feature-major (feature -> document
+slots and weights, sorted by feature), and a query's score is accumulated
+over the postings of its own features only, then the top K are taken with
+argpartition. No network calls, no model files.
+
+Because a document's vector depends on nothing but its own text, the index
+is patched rather than rebuilt after a catalog change: feature ids are
+stable, unchanged documents keep their slot, and only new or edited
+documents are analyzed, into a new segment of postings. The slots they
+replace are tombstoned; once tombstones reach MERGE_SHARE of the slots,
+the segments are merged into one. Document frequencies are patched by
+difference.
+
+get_index() never builds on the request path once an index exists: after
+a catalog change the previous index is served while a background thread
+builds the next one, which is then swapped in.
+"""
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app import schemas
+from app.services import catalog
+from app.services.role_matcher import tokenize, trigrams
+
+KINDS = ("skill", "resource", "project", "role")
+TITLE_BOOST = 2
+TRIGRAM_WEIGHT = 0.25
+# Cosine below this is noise (a couple of shared trigrams)
+MIN_SCORE = 0.05
+# Merge the segments once this share of the slots are tombstones
+MERGE_SHARE = 0.25
+
+
+@dataclass(frozen=True)
+class Document:
+    kind: str
+    id: int
+    title: str
+    subtitle: str
+    body: str  # searchable text besides the title
+
+    @property
+    def key(self) -> Tuple:
+        return self.kind, self.id, self.title, self.body
+
+
+def documents(snapshot: catalog.CatalogSnapshot) -> List[Document]:
+    docs = [Document("skill", s.id, s.name, s.category, s.category) for s in snapshot.skills]
+    docs += [
+        Document("resource", r.id, r.title, f"{r.provider} · {r.type}",
+                 f"{r.provider} {r.type} {snapshot.skill_name(r.skill_id)}")
+        for r in snapshot.resources
+    ]
+    docs += [Document("project", p.id, p.title, p.domain, f"{p.description} {p.domain}") for p in snapshot.projects]
+    docs += [Document("role", r.id, r.title, r.domain, f"{r.domain} {r.description or ''}") for r in snapshot.roles]
+    return docs
+
+
+def analyze(text: str, boost: int = 1) -> Counter:
+    """Feature counts: "w:<word>" per word, "g:<trigram>" per distinct trigram of each word."""
+    features = Counter()
+    for token in tokenize(text):
+        features["w:" + token] += boost
+        for gram in trigrams(token):
+            features["g:" + gram] += boost
+    return features
+
+
+class Segment:
+    """Postings of a set of document slots, sorted by feature id."""
+
+    def __init__(self, slots: Sequence[int], vectors: Sequence[Tuple[np.ndarray, np.ndarray]]):
+        lengths = np.array([len(ids) for ids, _ in vectors], dtype=np.int64)
+        features = np.concatenate([ids for ids, _ in vectors]) if vectors else np.zeros(0, dtype=np.int64)
+        weights = np.concatenate([w for _, w in vectors]) if vectors else np.zeros(0)
+        order = np.argsort(features, kind="stable")
+        self.features = features[order]
+        self.slots = np.repeat(np.asarray(slots, dtype=np.int64), lengths)[order]
+        self.weights = weights[order]
+
+    def accumulate(self, scores: np.ndarray, ids: np.ndarray, weights: np.ndarray):
+        starts = np.searchsorted(self.features, ids, side="left")
+        ends = np.searchsorted(self.features, ids, side="right")
+        for start, end, weight in zip(starts.tolist(), ends.tolist(), weights.tolist()):
+            scores[self.slots[start:end]] += weight * self.weights[start:end]
+
+
+class SearchIndex:
+    def __init__(self, docs: Sequence[Document], previous: Optional["SearchIndex"] = None, version: int = 0):
+        self.docs = list(docs)
+        self.version = version
+        # Feature ids only ever grow, so vectors of unchanged documents stay valid
+        self.vocabulary: Dict[str, int] = dict(previous.vocabulary) if previous else {}
+        self.is_trigram: List[bool] = list(previous.is_trigram) if previous else []
+        old_slot = previous.slot_of if previous else {}
+        # Slot -> document vector (feature ids, weights); None once tombstoned
+        self.vectors: List[Optional[Tuple[np.ndarray, np.ndarray]]] = list(previous.vectors) if previous else []
+        self.slot_of: Dict[Tuple, int] = {}
+
+        df = previous.df.copy() if previous else np.zeros(0, dtype=np.int64)
+        added, new_slots, self.reused = [], [], 0
+        # Catalog position -> slot
+        slots: List[int] = []
+        for doc in self.docs:
+            key = doc.key
+            slot = old_slot.get(key)
+            if slot is None:
+                slot = len(self.vectors)
+                self.vectors.append(None)
+                added.append(self._analyze(doc))
+                new_slots.append(slot)
+            else:
+                self.reused += 1
+            self.slot_of[key] = slot
+            slots.append(slot)
+        self.trigram_mask = np.array(self.is_trigram, dtype=bool)
+        for slot, vector in zip(new_slots, self._vectors(added)):
+            self.vectors[slot] = vector
+        removed = []
+        for key, slot in old_slot.items():
+            if key not in self.slot_of:
+                removed.append(self.vectors[slot][0])
+                self.vectors[slot] = None
+        self.analyzed = len(added)
+
+        n_features = len(self.vocabulary)
+        df = np.concatenate([df, np.zeros(n_features - len(df), dtype=np.int64)])
+        if added:
+            df += np.bincount(np.concatenate([ids for ids, _ in added]), minlength=n_features)
+        if removed:
+            df -= np.bincount(np.concatenate(removed), minlength=n_features)
+        self.df = df
+
+        dead = len(self.vectors) - len(self.slot_of)
+        if previous is None or dead > MERGE_SHARE * len(self.vectors):
+            slots = self._merge(slots)
+        else:
+            self.segments = previous.segments
+            if new_slots:
+                self.segments += (Segment(new_slots, [self.vectors[slot] for slot in new_slots]),)
+        # Slot -> catalog position (-1 for tombstones) and kind
+        self.position = np.full(len(self.vectors), -1, dtype=np.int64)
+        self.position[slots] = np.arange(len(slots))
+        self.kinds = np.full(len(self.vectors), -1, dtype=np.int8)
+        self.kinds[slots] = [KINDS.index(doc.kind) for doc in self.docs]
+
+    def _analyze(self, doc: Document) -> Tuple[np.ndarray, np.ndarray]:
+        """(feature ids, raw counts) of the document."""
+        features = analyze(doc.title, TITLE_BOOST) + analyze(doc.body)
+        ids = np.empty(len(features), dtype=np.int64)
+        counts = np.empty(len(features), dtype=np.float64)
+        for i, (feature, count) in enumerate(features.items()):
+            feature_id = self.vocabulary.get(feature)
+            if feature_id is None:
+                feature_id = self.vocabulary[feature] = len(self.vocabulary)
+                self.is_trigram.append(feature.startswith("g:"))
+            ids[i], counts[i] = feature_id, count
+        return ids, counts
+
+    def _vectors(self, analyses: List[Tuple[np.ndarray, np.ndarray]]) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """Unit lnc vectors (sublinear tf, trigrams down-weighted, no idf), weighed in one vectorized pass."""
+        if not analyses:
+            return []
+        lengths = np.array([len(ids) for ids, _ in analyses], dtype=np.int64)
+        ids = np.concatenate([ids for ids, _ in analyses])
+        counts = np.concatenate([c for _, c in analyses])
+        doc_of = np.repeat(np.arange(len(analyses), dtype=np.int64), lengths)
+        weights = (1.0 + np.log(counts)) * np.where(self.trigram_mask[ids], TRIGRAM_WEIGHT, 1.0)
+        norms = np.sqrt(np.bincount(doc_of, weights=weights * weights, minlength=len(analyses)))
+        weights /= np.maximum(norms, 1e-12)[doc_of]
+        return [(a, w) for (a, _), w in zip(analyses, np.split(weights, np.cumsum(lengths)[:-1]))]
+
+    def _merge(self, slots: List[int]) -> List[int]:
+        """Drop the tombstones: live documents get slots in catalog order, in a single segment."""
+        self.vectors = [self.vectors[slot] for slot in slots]
+        self.slot_of = {key: position for position, key in enumerate(self.slot_of)}
+        self.segments = (Segment(range(len(self.vectors)), self.vectors),)
+        return list(range(len(self.vectors)))
+
+    def query_vector(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """The query's unit ltc vector: sublinear tf x smoothed idf, over features some document has."""
+        known = [(self.vocabulary[f], c) for f, c in analyze(text).items() if f in self.vocabulary]
+        known = [(fid, c) for fid, c in known if self.df[fid] > 0]
+        if not known:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        ids = np.array([fid for fid, _ in known], dtype=np.int64)
+        idf = np.log((1.0 + len(self.docs)) / (1.0 + self.df[ids])) + 1.0
+        feature_weight = np.where(self.trigram_mask[ids], TRIGRAM_WEIGHT, 1.0)
+        weights = (1.0 + np.log([c for _, c in known])) * feature_weight * idf
+        return ids, weights / np.linalg.norm(weights)
+
+    def search(self, text: str, limit: int = 10, kind: Optional[str] = None) -> List[Tuple[int, float]]:
+        """[(document position, cosine)] best first; ties keep catalog order."""
+        ids, weights = self.query_vector(text)
+        if not len(ids):
+            return []
+        scores = np.zeros(len(self.vectors))
+        for segment in self.segments:
+            segment.accumulate(scores, ids, weights)
+        if kind is not None:
+            scores[self.kinds != KINDS.index(kind)] = 0.0
+        scores[self.position < 0] = 0.0
+        candidates = np.flatnonzero(scores >= MIN_SCORE)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+            # argpartition leaves ties at the cut arbitrary; widen to every tie, then sort
+            cutoff = scores[candidates].min()
+            candidates = np.flatnonzero(scores >= cutoff)
+        positions = self.position[candidates]
+        ranked = np.lexsort((positions, -scores[candidates]))[:limit]
+        return [(int(positions[i]), float(scores[candidates[i]])) for i in ranked]
+
+
+_index: Optional[SearchIndex] = None
+# Held while an index is being built: one build at a time, and requests never wait on it
+_build_lock = threading.Lock()
+
+
+def build_index(snapshot: catalog.CatalogSnapshot) -> SearchIndex:
+    """Index for this snapshot, patched from the current one, and made current."""
+    global _index
+    index = SearchIndex(documents(snapshot), _index, snapshot.version)
+    _index = index
+    return index
+
+
+def refresh(snapshot: catalog.CatalogSnapshot):
+    if not _build_lock.acquire(blocking=False):
+        return  # a build is already running
+    try:
+        if _index is None or _index.version != snapshot.version:
+            build_index(snapshot)
+    finally:
+        _build_lock.release()
+
+
+def get_index(db: Session) -> SearchIndex:
+    """The current index; after a catalog change it is served while the next one builds in the background."""
+    snapshot = catalog.get_catalog(db)
+    index = _index
+    if index is None:
+        # First load: nothing to serve yet
+        with _build_lock:
+            index = _index if _index is not None and _index.version == snapshot.version else build_index(snapshot)
+    elif index.version != snapshot.version and not _build_lock.locked():
+        threading.Thread(target=refresh, args=(snapshot,), name="search-index-refresh", daemon=True).start()
+    return index
+
+
+def invalidate():
+    global _index
+    with _build_lock:
+        _index = None
+
+
+def search(db: Session, q: str, limit: int = 10, kind: Optional[str] = None) -> List[schemas.SearchHit]:
+    index = get_index(db)
+    hits = []
+    for position, score in index.search(q, limit=limit, kind=kind):
+        doc = index.docs[position]
+        hits.append(schemas.SearchHit(kind=doc.kind, id=doc.id, title=doc.title, subtitle=doc.subtitle,
+                                      score=round(score, 4)))
+    return hits
@@ -0,0 +1,176 @@
+"""
+Skill autocomplete for the profile page's skill picker.
+
+Every skill is indexed under its normalized name, the aliases the assistant
+recognizes (intent_matcher.skill_aliases: "aws", "python", "kubernetes"...)
+and every word-start suffix of its name ("learning" for "Machine Learning").
+The keys live in one sorted list, so a prefix is a bisect range. Skills
+are ranked by popularity, the number of job_skills plus user_skills rows
+that reference them, with ties going to the shorter name. Each index entry
+carries its skill's global rank, so the best N distinct skills in a range
+are the N smallest distinct ranks: a partial sort (np.partition) of the
+range, never a full one. The answers for prefixes of one or two characters,
+the widest ranges, are precomputed.
+
+The key table is built per catalog version. Popularity counts
+user_skills, which changes all the time, so the ranking is recomputed
+every SKILL_POPULARITY_REFRESH_SECONDS. That takes one GROUP BY and a
+vectorized re-rank, not a re-sort of the keys. Both happen in a background
+thread: a request only compares the Suggester's catalog version and age
+with the snapshot's, and keeps being served by the current Suggester until
+the new one is swapped in.
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.config import settings
+from app.services import catalog
+from app.services.intent_matcher import normalize, skill_aliases
+
+MAX_SUGGESTIONS = 20
+# Prefixes up to this length have their answer precomputed
+SHORT_PREFIX = 2
+
+
+def skill_keys(name: str) -> List[str]:
+    full = normalize(name)
+    keys = {alias for alias, _ in skill_aliases(name)}
+    words = full.split()
+    keys.update(" ".join(words[i:]) for i in range(1, len(words)))
+    return sorted(keys)
+
+
+class KeyTable:
+    """Sorted (key, skill position) pairs for one catalog snapshot."""
+
+    def __init__(self, snapshot: catalog.CatalogSnapshot):
+        self.catalog_version = snapshot.version
+        self.skills = snapshot.skills
+        position = {skill.id: pos for pos, skill in enumerate(self.skills)}
+        keys_of = [skill_keys(skill.name) for skill in self.skills]
+        # A skill shows up at most this many times in one prefix range
+        self.max_keys = max(map(len, keys_of), default=1)
+        entries = sorted((key, pos) for pos, keys in enumerate(keys_of) for key in keys)
+        self.keys = [key for key, _ in entries]
+        self.skill_pos = np.array([pos for _, pos in entries], dtype=np.int64)
+        self.skill_ids = np.array([skill.id for skill in self.skills], dtype=np.int64)
+        self.name_lengths = np.array([len(skill.name) for skill in self.skills], dtype=np.int64)
+        self.job_counts = np.zeros(len(self.skills), dtype=np.int64)
+        for role in snapshot.roles:
+            for req in role.required_skills:
+                if req.skill_id in position:
+                    self.job_counts[position[req.skill_id]] += 1
+
+    def range(self, prefix: str) -> slice:
+        return slice(bisect_left(self.keys, prefix), bisect_left(self.keys, prefix + "\uffff"))
+
+
+class Suggester:
+    def __init__(self, table: KeyTable, user_counts: Dict[int, int]):
+        self.table = table
+        self.catalog_version = table.catalog_version
+        self.popularity = table.job_counts + np.array(
+            [user_counts.get(int(skill_id), 0) for skill_id in table.skill_ids], dtype=np.int64)
+        # Skill positions best first: popularity, then shorter name, then id
+        self.by_rank = np.lexsort((table.skill_ids, table.name_lengths, -self.popularity))
+        rank = np.empty(len(self.by_rank), dtype=np.int64)
+        rank[self.by_rank] = np.arange(len(self.by_rank))
+        self.entry_rank = rank[table.skill_pos]
+
+        self.short: Dict[str, np.ndarray] = {}
+        for key in {key[:n] for key in table.keys for n in range(1, SHORT_PREFIX + 1)}:
+            self.short[key] = self._best(table.range(key), MAX_SUGGESTIONS)
+        self.built_at = time.monotonic()
+
+    def _best(self, entries: slice, limit: int) -> np.ndarray:
+        ranks = self.entry_rank[entries]
+        # The limit * max_keys smallest ranks hold at least `limit` distinct skills (if the range has them)
+        keep = limit * self.table.max_keys
+        if len(ranks) > keep:
+            ranks = np.partition(ranks, keep - 1)[:keep]
+        return np.unique(ranks)[:limit]
+
+    def suggest(self, q: str, limit: int = 10) -> List[schemas.SkillSuggestion]:
+        prefix = normalize(q)
+        if not prefix:
+            return []
+        if len(prefix) <= SHORT_PREFIX:
+            ranks = self.short.get(prefix, np.zeros(0, dtype=np.int64))[:limit]
+        else:
+            ranks = self._best(self.table.range(prefix), limit)
+        suggestions = []
+        for pos in self.by_rank[ranks]:
+            skill = self.table.skills[pos]
+            suggestions.append(schemas.SkillSuggestion(
+                id=skill.id, name=skill.name, category=skill.category, popularity=int(self.popularity[pos])))
+        return suggestions
+
+
+_suggester: Optional[Suggester] = None
+# Held while a Suggester is being built: one build at a time, and requests never wait on it
+_build_lock = threading.Lock()
+
+
+def user_counts(db: Session) -> Dict[int, int]:
+    us = models.UserSkill
+    return dict(db.execute(select(us.skill_id, func.count()).group_by(us.skill_id)).all())
+
+
+def _build(db: Session) -> Suggester:
+    """A Suggester with fresh popularity, reusing the current key table while the catalog is unchanged."""
+    global _suggester
+    snapshot = catalog.get_catalog(db)
+    current = _suggester
+    # Not derive(): that would hold the snapshot's lock, stalling other derives, for the whole build
+    if current is not None and current.catalog_version == snapshot.version:
+        table = current.table
+    else:
+        table = KeyTable(snapshot)
+    suggester = _suggester = Suggester(table, user_counts(db))
+    return suggester
+
+
+def refresh(bind):
+    """Re-rank by the current popularity (and catalog) on a session of its own, then swap it in."""
+    if not _build_lock.acquire(blocking=False):
+        return  # a refresh is already running
+    try:
+        with Session(bind=bind) as session:
+            _build(session)
+    finally:
+        _build_lock.release()
+
+
+def _stale(suggester: Suggester, catalog_version: int) -> bool:
+    return suggester.catalog_version != catalog_version \
+        or time.monotonic() - suggester.built_at > settings.SKILL_POPULARITY_REFRESH_SECONDS
+
+
+def get_suggester(db: Session) -> Suggester:
+    """The current suggester; once stale, a background refresh is started and the current one is served meanwhile."""
+    suggester = _suggester
+    if suggester is None:
+        # First load: nothing to serve yet
+        with _build_lock:
+            suggester = _suggester if _suggester is not None else _build(db)
+        return suggester
+    if _stale(suggester, catalog.get_catalog(db).version) and not _build_lock.locked():
+        threading.Thread(target=refresh, args=(db.get_bind(),), name="skill-popularity-refresh", daemon=True).start()
+    return suggester
+
+
+def invalidate():
+    global _suggester
+    with _build_lock:
+        _suggester = None
+
+
+def suggest(db: Session, q: str, limit: int = 10) -> List[schemas.SkillSuggestion]:
+    return get_suggester(db).suggest(q, limit)
@@ -0,0 +1,302 @@
+"""
+Talent search: every user's readiness for one role.
+
+user_skills is held in memory as a sparse user x skill matrix stored by
+column (skill_id -> sorted user rows and their levels). Scoring a role only
+touches the columns of the skills it requires, in vectorized batches of
+user rows. The matrix is patched in place when user_skills writes commit
+(and deleted users are dropped from it), and reloaded once it is older than
+USER_MATRIX_REFRESH_SECONDS to pick up writes made by other processes.
+
+Reloads happen off the request path: the first load builds synchronously
+(there is nothing to serve yet), later ones run in a background thread on
+their own session while requests keep using the current matrix. Writes
+committed during a reload are buffered and replayed onto the new matrix
+before it is swapped in, so none are lost.
+"""
+import json
+import threading
+import time
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.config import settings
+
+BATCH_SIZE = 65536
+
+
+class UserSkillMatrix:
+    def __init__(self, user_ids: Iterable[int], entries: Iterable[Tuple[int, int, int]]):
+        self.user_ids: List[int] = []
+        self.row_of: Dict[int, int] = {}
+        for user_id in user_ids:
+            self._row(user_id)
+        # skill_id -> {row: level}; numpy views are materialized lazily per column
+        self._columns: Dict[int, Dict[int, int]] = {}
+        self._arrays: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        # Rows of deleted users; they stay in place so row numbers never shift
+        self._removed: Set[int] = set()
+        self._active: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+        for user_id, skill_id, level in entries:
+            self._columns.setdefault(skill_id, {})[self._row(user_id)] = level
+        self.built_at = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self.user_ids)
+
+    def _row(self, user_id: int) -> int:
+        row = self.row_of.get(user_id)
+        if row is None:
+            row = len(self.user_ids)
+            self.user_ids.append(user_id)
+            self.row_of[user_id] = row
+            self._active = None
+        return row
+
+    def active(self) -> np.ndarray:
+        """Boolean mask of the rows that still belong to a user."""
+        active = self._active
+        if active is None or len(active) != len(self.user_ids):
+            with self._lock:
+                active = np.ones(len(self.user_ids), dtype=bool)
+                active[list(self._removed)] = False
+                self._active = active
+        return active
+
+    def remove_user(self, user_id: int):
+        with self._lock:
+            row = self.row_of.pop(user_id, None)
+            if row is None:
+                return
+            self._removed.add(row)
+            self._active = None
+            for skill_id, column in self._columns.items():
+                if column.pop(row, None) is not None:
+                    self._arrays.pop(skill_id, None)
+
+    def apply(self, user_id: int, skill_id: Optional[int], level: Optional[int]):
+        """One committed write: a user_skills row (level None = removed), or skill_id None = user deleted."""
+        if skill_id is None:
+            self.remove_user(user_id)
+        else:
+            self.set_level(user_id, skill_id, level)
+
+    def set_level(self, user_id: int, skill_id: int, level: Optional[int]):
+        """Apply one user_skills write; level=None removes the skill."""
+        with self._lock:
+            row = self._row(user_id)
+            column = self._columns.setdefault(skill_id, {})
+            if level is None:
+                column.pop(row, None)
+            else:
+                column[row] = level
+            self._arrays.pop(skill_id, None)
+
+    def column(self, skill_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        arrays = self._arrays.get(skill_id)
+        if arrays is None:
+            with self._lock:
+                column = self._columns.get(skill_id, {})
+                rows = np.fromiter(sorted(column), dtype=np.int64, count=len(column))
+                levels = np.fromiter((column[r] for r in rows.tolist()), dtype=np.float64, count=len(column))
+                arrays = (rows, levels)
+                self._arrays[skill_id] = arrays
+        return arrays
+
+    def score_role(self, requirements: Sequence[Tuple[int, int, float]], lo: int = 0,
+                   hi: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (readiness, missing_count) for user rows [lo, hi) against one role's
+        requirement vector [(skill_id, required_level, importance_weight)].
+        Same arithmetic as ReadinessEngine.score, with users and roles swapped.
+        """
+        hi = len(self.user_ids) if hi is None else hi
+        n = max(0, hi - lo)
+        covered = np.zeros(n, dtype=np.float64)
+        met = np.zeros(n, dtype=np.int64)
+        total = 0.0
+        required_count = 0
+        for skill_id, required_level, importance in requirements:
+            total += required_level * importance
+            if required_level <= 0:
+                continue
+            required_count += 1
+            rows, levels = self.column(skill_id)
+            a, b = np.searchsorted(rows, lo), np.searchsorted(rows, hi)
+            idx = rows[a:b] - lo
+            lv = levels[a:b]
+            # Each user appears at most once per column, so plain fancy-index adds are safe
+            covered[idx] += np.minimum(lv, required_level) * importance
+            met[idx] += lv >= required_level
+
+        missing = required_count - met
+        if total == 0:
+            return np.ones(n), missing
+        weighted_gap = np.where(missing == 0, 0.0, total - covered)
+        return np.maximum(1.0 - weighted_gap / total, 0.0), missing
+
+
+_matrix: Optional[UserSkillMatrix] = None
+_lock = threading.Lock()
+# Held for the whole of a (re)build; at most one runs at a time
+_build_lock = threading.Lock()
+# Writes committed while a build is running, replayed onto the new matrix
+_pending: Optional[List[Tuple[int, Optional[int], Optional[int]]]] = None
+
+
+def build_matrix(db: Session) -> UserSkillMatrix:
+    us = models.UserSkill
+    user_ids = (row.id for row in db.query(models.User.id).order_by(models.User.id))
+    entries = db.query(us.user_id, us.skill_id, us.proficiency_level).order_by(us.id).yield_per(10000)
+    return UserSkillMatrix(user_ids, ((e.user_id, e.skill_id, e.proficiency_level) for e in entries))
+
+
+def _rebuild(bind):
+    """Build a new matrix on its own session and swap it in. Caller holds _build_lock."""
+    global _matrix, _pending
+    with _lock:
+        _pending = []
+    try:
+        with Session(bind=bind) as session:
+            matrix = build_matrix(session)
+    except Exception:
+        with _lock:
+            _pending = None
+        raise
+    with _lock:
+        for change in _pending:
+            matrix.apply(*change)
+        _matrix, _pending = matrix, None
+
+
+def refresh(bind):
+    """Reload the matrix from the database unless a reload is already running."""
+    if _build_lock.acquire(blocking=False):
+        try:
+            _rebuild(bind)
+        finally:
+            _build_lock.release()
+
+
+def get_matrix(db: Session) -> UserSkillMatrix:
+    """The current matrix; once it is stale, a background reload is started and the current one is served meanwhile."""
+    matrix = _matrix
+    if matrix is None:
+        with _build_lock:
+            if _matrix is None:
+                _rebuild(db.get_bind())
+        return _matrix
+    if time.monotonic() - matrix.built_at > settings.USER_MATRIX_REFRESH_SECONDS and not _build_lock.locked():
+        threading.Thread(target=refresh, args=(db.get_bind(),), name="talent-matrix-refresh", daemon=True).start()
+    return matrix
+
+
+def invalidate():
+    global _matrix
+    with _lock:
+        _matrix = None
+
+
+def apply_change(user_id: int, skill_id: Optional[int], level: Optional[int]):
+    """Patch the in-memory matrix (if loaded) after a committed write; see UserSkillMatrix.apply."""
+    with _lock:
+        if _pending is not None:
+            _pending.append((user_id, skill_id, level))
+        matrix = _matrix
+    if matrix is not None:
+        matrix.apply(user_id, skill_id, level)
+
+
+def rank_candidates(requirements: Sequence[Tuple[int, int, float]], db: Session, limit: int = 20,
+                    offset: int = 0, min_readiness: float = 0.0) -> List[schemas.CandidateReadiness]:
+    """Top users by readiness (ties by user order), with names loaded for the returned page only."""
+    matrix = get_matrix(db)
+    scores, missing = matrix.score_role(requirements)
+    candidates = np.flatnonzero((scores >= min_readiness) & matrix.active())
+    k = offset + limit
+    if k < len(candidates):
+        cand_scores = scores[candidates]
+        kth = np.partition(cand_scores, len(cand_scores) - k)[len(cand_scores) - k]
+        above = candidates[cand_scores > kth]
+        ties = candidates[cand_scores == kth][: k - len(above)]
+        candidates = np.sort(np.concatenate([above, ties]))
+    page = candidates[np.argsort(-scores[candidates], kind="stable")][offset:k].tolist()
+
+    user_ids = [matrix.user_ids[row] for row in page]
+    names = dict(db.query(models.User.id, models.User.full_name).filter(models.User.id.in_(user_ids)).all())
+    return [
+        schemas.CandidateReadiness(
+            user_id=matrix.user_ids[row],
+            full_name=names.get(matrix.user_ids[row]),
+            readiness_score=float(scores[row]),
+            missing_skill_count=int(missing[row]),
+        ) for row in page
+    ]
+
+
+def stream_candidates(requirements: Sequence[Tuple[int, int, float]], db: Session,
+                      min_readiness: float = 0.0) -> Iterator[str]:
+    """
+    NDJSON lines for every user at or above min_readiness, in user order, emitted
+    batch by batch as they are scored (unsorted, no names: no DB work while streaming).
+    """
+    matrix = get_matrix(db)
+
+    def generate():
+        n = len(matrix)
+        active = matrix.active()
+        for lo in range(0, n, BATCH_SIZE):
+            scores, missing = matrix.score_role(requirements, lo, min(n, lo + BATCH_SIZE))
+            lines = [
+                json.dumps({
+                    "user_id": matrix.user_ids[lo + i],
+                    "readiness_score": float(scores[i]),
+                    "missing_skill_count": int(missing[i]),
+                }) + "\n"
+                for i in np.flatnonzero((scores >= min_readiness) & active[lo:lo + len(scores)]).tolist()
+            ]
+            if lines:
+                yield "".join(lines)
+
+    return generate()
+
+
+# --- Keeping the matrix current ---
+# Flushed user_skills writes are collected per session and applied once the
+# transaction commits.
+
+def record_changes(session: Session, changes: Iterable[Tuple[int, Optional[int], Optional[int]]]):
+    """
+    Queue (user_id, skill_id, level or None) writes made outside the ORM (Core/bulk) for commit;
+    (user_id, None, None) records a deleted user.
+    """
+    session.info.setdefault("user_skill_changes", []).extend(changes)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_user_skill_writes(session, flush_context):
+    record_changes(session, (
+        (obj.user_id, obj.skill_id, obj.proficiency_level)
+        for obj in chain(session.new, session.dirty) if isinstance(obj, models.UserSkill)
+    ))
+    record_changes(session, (
+        (obj.user_id, obj.skill_id, None) for obj in session.deleted if isinstance(obj, models.UserSkill)
+    ))
+    record_changes(session, ((obj.id, None, None) for obj in session.deleted if isinstance(obj, models.User)))
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_user_skill_writes(session):
+    for user_id, skill_id, level in session.info.pop("user_skill_changes", ()):
+        apply_change(user_id, skill_id, level)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_skill_writes(session):
+    session.info.pop("user_skill_changes", None)
@@ -0,0 +1,65 @@
+"""
+Bulk writes of a user's skill profile.
+
+The whole set (or a diff) is applied in one transaction with a handful of
+set-based statements: a multi-row INSERT ... ON CONFLICT (user_id, skill_id)
+DO UPDATE, one DELETE ... RETURNING, and one SELECT for the result, instead
+of a SELECT / INSERT-or-UPDATE / COMMIT / refresh round trip per skill.
+These are Core statements, so the ORM hooks don't see them: the user version,
+the talent matrix and the assistant's conversation contexts are updated here
+explicitly, and the user's materialized readiness rows are marked stale
+(rebuilt on their next recommendation read).
+"""
+from typing import List, Optional
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, joinedload
+
+from app import models, schemas
+from app.services import conversations, readiness_store, talent, user_versions
+
+# Rows per INSERT statement; keeps SQLite under its bound-parameter limit
+INSERT_CHUNK = 1000
+
+_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def set_user_skills(db: Session, user_id: int, update: schemas.UserSkillsUpdate) -> Optional[List[models.UserSkill]]:
+    """Apply the update and return the user's resulting skills, or None if the user does not exist."""
+    us = models.UserSkill.__table__
+    # Last entry wins if a skill is listed twice
+    levels = {s.skill_id: s.proficiency_level for s in update.skills}
+
+    # The version bump doubles as the existence check
+    if not user_versions.bump(db.connection(), [user_id]):
+        db.rollback()
+        return None
+
+    insert = _INSERTS[db.get_bind().dialect.name]
+    rows = [{"user_id": user_id, "skill_id": k, "proficiency_level": v} for k, v in levels.items()]
+    for start in range(0, len(rows), INSERT_CHUNK):
+        stmt = insert(us).values(rows[start:start + INSERT_CHUNK])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[us.c.user_id, us.c.skill_id],
+            set_={"proficiency_level": stmt.excluded.proficiency_level},
+        ))
+    changes = [(user_id, k, v) for k, v in levels.items()]
+
+    delete = us.delete().where(us.c.user_id == user_id)
+    if update.replace:
+        delete = delete.where(us.c.skill_id.not_in(list(levels)))
+    else:
+        remove = [k for k in update.remove if k not in levels]
+        delete = delete.where(us.c.skill_id.in_(remove)) if remove else None
+    if delete is not None:
+        removed = db.execute(delete.returning(us.c.skill_id)).scalars().all()
+        changes += [(user_id, skill_id, None) for skill_id in removed]
+
+    talent.record_changes(db, changes)
+    conversations.record_changes(db, [user_id])
+    readiness_store.invalidate(db.connection(), [user_id])
+    db.commit()
+    return (
+        db.query(models.UserSkill).options(joinedload(models.UserSkill.skill))
+        .filter(models.UserSkill.user_id == user_id).order_by(models.UserSkill.id).all()
+    )
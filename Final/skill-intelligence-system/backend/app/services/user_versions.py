@@ -0,0 +1,40 @@
+"""
+Per-user row versions for conditional requests on /users/{id}.
+
+users.version is bumped inside the same transaction as any write to the user
+row or their user_skills, so an ETag built from it changes exactly when the
+user's response body can. Core (bulk) writes must call bump() themselves.
+"""
+from itertools import chain
+from typing import Iterable
+
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+def bump(connection, user_ids: Iterable[int]) -> int:
+    """Increment users.version for the given users on the given connection/transaction; returns rows updated."""
+    ids = sorted(set(user_ids))
+    if not ids:
+        return 0
+    u = models.User.__table__
+    return connection.execute(update(u).where(u.c.id.in_(ids)).values(version=u.c.version + 1)).rowcount
+
+
+def etag(user_id: int, version: int, catalog_version: int) -> str:
+    # Skill names are nested in the response, so a catalog change invalidates it too
+    return f'"user-{user_id}-{version}-{catalog_version}"'
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_written_users(session, flush_context):
+    user_ids = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, models.UserSkill):
+            user_ids.add(obj.user_id)
+        elif isinstance(obj, models.User) and obj not in session.new and session.is_modified(obj):
+            user_ids.add(obj.id)
+    user_ids.discard(None)
+    bump(session.connection(), user_ids)
@@ -0,0 +1,113 @@
+"""
+Assistant message recognition throughput: substring scans vs the compiled matcher.
+
+    python bench_assistant.py [--skills 2000] [--messages 20000] [--seed 7]
+
+Replays a deterministic corpus of chat messages (follow-up clicks, questions
+naming one or two skills, greetings, off-topic chatter) built from the
+seed_data skills plus synthetic ones. "substring" is the previous approach:
+one `any(k in msg ...)` chain per intent and a `name.lower() in msg` check
+per skill. "compiled" is intent_matcher.Recognizer, one Aho-Corasick pass.
+Reports messages/s and MB/s for each, and how often the two disagree (the
+compiled matcher respects word boundaries, so some disagreement is expected).
+"""
+import argparse
+import json
+import os
+import random
+import time
+
+from app.services import intent_matcher
+from seed_data import generate
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "seed_data", "data.json")
+
+TEMPLATES = [
+    "What are my gaps?",
+    "Why is my score low?",
+    "How can I improve {skill}?",
+    "How to learn {skill}?",
+    "I want to study {skill} and {other} this month",
+    "Which resources help with {skill}?",
+    "Is {skill} required for this role?",
+    "Show me projects to build my portfolio with {skill}",
+    "hello there",
+    "hey, what should I do next?",
+    "thanks, that makes sense",
+    "I already know {skill} pretty well, what is missing?",
+]
+
+# The previous generate_response keyword chains, in the same order
+SUBSTRING_INTENTS = [
+    ("score", ["score", "rating", "why", "analysis"]),
+    ("gaps", ["gap", "missing", "lack", "need", "skills", "required"]),
+    ("improve", ["improve", "learn", "study", "resource", "help"]),
+    ("projects", ["project", "build", "portfolio", "hands-on"]),
+    ("greeting", ["hello", "hi", "hey"]),
+]
+
+
+def load_skills(n_synthetic):
+    with open(DATA_FILE) as f:
+        names = [s["name"] for s in json.load(f)["skills"]]
+    names += [generate.skill_name(i) for i in range(n_synthetic)]
+    return list(enumerate(names, 1))
+
+
+def corpus(skills, n, seed):
+    rng = random.Random(seed)
+    # Popular skills come up most: sample with the same Zipf weights as the generator
+    popular = generate.Popularity(len(skills), rng)
+    messages = []
+    for _ in range(n):
+        a, b = popular.sample(2)
+        messages.append(rng.choice(TEMPLATES).format(skill=skills[a][1], other=skills[b][1]))
+    return messages
+
+
+def substring_scan(message, lowered_skills):
+    msg = message.lower()
+    intent = next((name for name, words in SUBSTRING_INTENTS if any(k in msg for k in words)), None)
+    return intent, [skill_id for skill_id, name in lowered_skills if name in msg]
+
+
+def throughput(fn, messages):
+    start = time.perf_counter()
+    results = [fn(m) for m in messages]
+    elapsed = time.perf_counter() - start
+    return results, len(messages) / elapsed, sum(map(len, messages)) / elapsed / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--skills", type=int, default=2000, help="synthetic skills on top of data.json")
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    skills = load_skills(args.skills)
+    messages = corpus(skills, args.messages, args.seed)
+
+    start = time.perf_counter()
+    recognizer = intent_matcher.Recognizer(skills)
+    print(f"{len(skills)} skills, {recognizer.pattern_count} patterns, "
+          f"compiled in {(time.perf_counter() - start) * 1000:.0f} ms; {len(messages)} messages")
+
+    lowered = [(skill_id, name.lower()) for skill_id, name in skills]
+    old, old_rate, old_mb = throughput(lambda m: substring_scan(m, lowered), messages)
+
+    def compiled(message):
+        scan = recognizer.scan(message)
+        return scan.intent, scan.skill_ids
+
+    new, new_rate, new_mb = throughput(compiled, messages)
+
+    print(f"{'substring':>10}: {old_rate:>10,.0f} msg/s  {old_mb:6.2f} MB/s")
+    print(f"{'compiled':>10}: {new_rate:>10,.0f} msg/s  {new_mb:6.2f} MB/s  ({new_rate / old_rate:.1f}x)")
+    intents = sum(a[0] != b[0] for a, b in zip(old, new))
+    mentions = sum(set(a[1]) != set(b[1]) for a, b in zip(old, new))
+    print(f"disagreements: intent {intents}, skill mentions {mentions} (word boundaries, longest match)")
+
+
+if __name__ == "__main__":
+    main()
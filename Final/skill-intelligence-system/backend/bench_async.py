@@ -0,0 +1,124 @@
+"""
+Load test: sync (threadpool) vs async (aiosqlite) endpoints.
+
+    python bench_async.py [--requests 2000] [--concurrency 1,10,50,200]
+
+Runs in-process against a scratch SQLite file with a few thousand users.
+"sync" mounts the previous style of handlers (plain def + get_db, each
+request holds one of anyio's threadpool slots); "async" mounts the real
+routers. Reports throughput and p50/p99 latency per concurrency level.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="bench-async-"), "bench.db")
+
+import anyio.to_thread
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy.orm import Session, selectinload
+
+from app import models, schemas
+from app.database import Base, async_engine, engine, get_db
+from app.routers import users
+
+N_USERS = 5000
+N_SKILLS = 200
+# Requests still waiting after this long count as errors (pool exhaustion, deadlock)
+REQUEST_TIMEOUT = 10.0
+
+
+def seed():
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(1)
+    with engine.begin() as conn:
+        conn.execute(models.Skill.__table__.insert(), [
+            {"id": i, "name": f"Skill {i}", "category": "Technical"} for i in range(1, N_SKILLS + 1)
+        ])
+        conn.execute(models.User.__table__.insert(), [
+            {"id": i, "full_name": f"User {i}", "email": f"user{i}@bench.ai"} for i in range(1, N_USERS + 1)
+        ])
+        conn.execute(models.UserSkill.__table__.insert(), [
+            {"user_id": u, "skill_id": s, "proficiency_level": rng.randint(1, 5)}
+            for u in range(1, N_USERS + 1) for s in rng.sample(range(1, N_SKILLS + 1), 10)
+        ])
+
+
+def sync_app():
+    app = FastAPI()
+
+    @app.get("/users/{user_id}", response_model=schemas.User)
+    def read_user(user_id: int, db: Session = Depends(get_db)):
+        db_user = db.query(models.User).options(
+            selectinload(models.User.skills).selectinload(models.UserSkill.skill)
+        ).filter(models.User.id == user_id).first()
+        if db_user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return db_user
+
+    return app
+
+
+def async_app():
+    app = FastAPI()
+    app.include_router(users.router)
+    return app
+
+
+async def run(app, n_requests, concurrency):
+    rng = random.Random(2)
+    paths = [f"/users/{rng.randint(1, N_USERS)}" for _ in range(n_requests)]
+    latencies = []
+    errors = 0
+    queue = asyncio.Queue()
+    for p in paths:
+        queue.put_nowait(p)
+
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                path = queue.get_nowait()
+                start = time.perf_counter()
+                try:
+                    response = await asyncio.wait_for(client.get(path), REQUEST_TIMEOUT)
+                    ok = response.status_code == 200
+                except Exception:
+                    ok = False
+                latencies.append(time.perf_counter() - start)
+                errors += not ok
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    return n_requests / elapsed, statistics.median(latencies) * 1000, p99 * 1000, errors
+
+
+async def main(n_requests, levels):
+    limiter = anyio.to_thread.current_default_thread_limiter()
+    print(f"threadpool slots for sync handlers: {limiter.total_tokens}")
+    print(f"{'mode':>6} {'conc':>6} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for concurrency in levels:
+        for mode, app in (("sync", sync_app()), ("async", async_app())):
+            rps, p50, p99, errors = await run(app, n_requests, concurrency)
+            print(f"{mode:>6} {concurrency:>6} {rps:>9.0f} {p50:>9.2f} {p99:>9.2f} {errors:>7}")
+    # Pooled aiosqlite connections keep a worker thread each; close them or exit hangs
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", default="1,10,50,200")
+    args = parser.parse_args()
+    seed()
+    asyncio.run(main(args.requests, [int(c) for c in args.concurrency.split(",")]))
@@ -0,0 +1,99 @@
+"""
+Time to first event of the streaming chat endpoint, against the JSON one.
+
+    python bench_chat_stream.py [--url http://localhost:8000] [--user 1] [--role 3] [--repeat 20]
+
+Without --url the app runs in-process on the configured DATABASE_URL (note
+the in-process transport buffers the body, so only a live server shows the
+real first-event latency). Each message of the script is posted to
+/assistant/chat/stream and /assistant/chat in a fresh conversation; reported
+are the median time to the first event, to the first answer section, to the
+last event, and to the complete JSON response.
+"""
+import argparse
+import json
+import statistics
+import time
+import uuid
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import httpx
+
+MESSAGES = [
+    "hello",
+    "Why is my score low?",
+    "What are my gaps?",
+    "How can I improve?",
+    "Show me project ideas",
+]
+
+
+def parse_events(lines: Iterable[str]) -> Iterator[Tuple[str, dict]]:
+    """(event, data) pairs from text/event-stream lines."""
+    event, data = "message", []
+    for line in lines:
+        if not line:
+            if data:
+                yield event, json.loads("\n".join(data))
+            event, data = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data.append(line[len("data:"):].strip())
+
+
+def measure_stream(client: httpx.Client, payload: dict) -> Dict:
+    """Events of one streamed chat turn and when they arrived (ms after the request was sent)."""
+    timings: Dict = {"events": []}
+    start = time.perf_counter()
+    with client.stream("POST", "/assistant/chat/stream", json=payload) as response:
+        response.raise_for_status()
+        for event, data in parse_events(response.iter_lines()):
+            elapsed = (time.perf_counter() - start) * 1000
+            timings["events"].append((event, data))
+            timings.setdefault("first_event_ms", elapsed)
+            if event == "section":
+                timings.setdefault("first_section_ms", elapsed)
+            timings["last_event_ms"] = elapsed
+    return timings
+
+
+def measure_json(client: httpx.Client, payload: dict) -> float:
+    start = time.perf_counter()
+    client.post("/assistant/chat", json=payload).raise_for_status()
+    return (time.perf_counter() - start) * 1000
+
+
+def make_client(url: str) -> httpx.Client:
+    if url:
+        return httpx.Client(base_url=url, timeout=30)
+    from fastapi.testclient import TestClient
+    from app.main import app
+    return TestClient(app)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--url", default="", help="a running server; in-process if omitted")
+    parser.add_argument("--user", type=int, default=1)
+    parser.add_argument("--role", type=int, default=None)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with make_client(args.url) as client:
+        print(f"{'message':<24} {'first event':>12} {'first section':>14} {'last event':>11} {'json':>9}  (ms, median)")
+        for message in MESSAGES:
+            rows: List[Tuple[float, float, float, float]] = []
+            for _ in range(args.repeat):
+                payload = {"user_id": args.user, "role_id": args.role, "message": message,
+                           "session_id": uuid.uuid4().hex}
+                streamed = measure_stream(client, payload)
+                payload["session_id"] = uuid.uuid4().hex
+                rows.append((streamed["first_event_ms"], streamed.get("first_section_ms", 0.0),
+                             streamed["last_event_ms"], measure_json(client, payload)))
+            first, section, last, whole = (statistics.median(column) for column in zip(*rows))
+            print(f"{message:<24} {first:12.2f} {section:14.2f} {last:11.2f} {whole:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Readiness scaling benchmark: per-role Python loop vs the vectorized engine.
+
+    python bench_readiness.py [--scale small medium large]
+
+Both sides score the same synthetic catalog in memory (no DB), so the numbers
+isolate the arithmetic that get_role_recommendations does for every role.
+Catalogs have the skill and role counts of seed_data/generate.py's scales and
+its requirement shape (Zipf-popular skills, 2-40 per role); "MB" is what the
+engine keeps for the requirements.
+"""
+import argparse
+import random
+import time
+
+from app.services.readiness_engine import ReadinessEngine
+from seed_data import generate
+
+USER_SKILLS = 15
+REPEATS = 5
+
+
+def make_roles(n_roles, n_skills, rng):
+    popular = generate.Popularity(n_skills, rng)
+    roles = []
+    for role_id in range(1, n_roles + 1):
+        count = max(2, generate.long_tail(rng, 1.6, generate.MAX_ROLE_REQUIREMENTS) + 2)
+        reqs = [
+            (skill_id + 1, f"Skill {skill_id + 1}", rng.randint(1, 5), rng.choice([1.0, 1.0, 1.5, 2.0]))
+            for skill_id in popular.sample(count)
+        ]
+        roles.append((role_id, f"Role {role_id}", "Bench", reqs))
+    return roles
+
+
+def engine_mb(engine):
+    arrays = (engine.col_roles, engine.col_required, engine.col_weight, engine.col_ptr,
+              engine.total_possible_weight, engine.requirement_count)
+    return sum(a.nbytes for a in arrays) / 1e6
+
+
+def loop_scores(roles, user_skills_map):
+    # Same arithmetic as intelligence.calculate_readiness, minus the DB
+    scores = []
+    for _, _, _, reqs in roles:
+        total_weighted_gap = 0.0
+        total_possible_weight = 0.0
+        for skill_id, _, level, weight in reqs:
+            total_possible_weight += level * weight
+            total_weighted_gap += max(0, level - user_skills_map.get(skill_id, 0)) * weight
+        scores.append(1.0 if total_possible_weight == 0 else 1.0 - total_weighted_gap / total_possible_weight)
+    scores.sort(reverse=True)
+    return scores
+
+
+def best_of(fn):
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", nargs="+", choices=list(generate.SCALES), default=list(generate.SCALES))
+    args = parser.parse_args()
+    rng = random.Random(42)
+
+    print(f"{'scale':>8} {'skills':>7} {'roles':>7} {'build ms':>10} {'MB':>7} {'loop ms':>10} {'engine ms':>10} {'speedup':>8}")
+    for scale in args.scale:
+        n_skills, n_roles = generate.SCALES[scale]["skills"], generate.SCALES[scale]["roles"]
+        roles = make_roles(n_roles, n_skills, rng)
+        user = {skill_id: rng.randint(1, 5) for skill_id in rng.sample(range(1, n_skills + 1), USER_SKILLS)}
+
+        start = time.perf_counter()
+        engine = ReadinessEngine(roles)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        loop_ms = best_of(lambda: loop_scores(roles, user))
+        engine_ms = best_of(lambda: engine.rank(user))
+        print(f"{scale:>8} {n_skills:>7} {n_roles:>7} {build_ms:>10.1f} {engine_mb(engine):>7.1f} "
+              f"{loop_ms:>10.2f} {engine_ms:>10.2f} {loop_ms / engine_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
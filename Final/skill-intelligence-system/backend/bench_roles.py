@@ -0,0 +1,112 @@
+"""
+Role catalog endpoints at scale: ORM + response_model vs cached JSON bytes.
+
+    python bench_roles.py [--roles 10000] [--repeats 5]
+
+Runs in-process against a scratch SQLite file. "lazy" is the original handler
+(ORM roles, required_skills -> skill lazy-loaded while FastAPI serializes),
+"selectin" eager-loads the same graph, "cached" is the real router serving
+bytes pre-serialized per catalog version. Reports the median latency of
+GET /roles/ and of GET /roles/{id}.
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+os.environ["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="bench-roles-"), "bench.db")
+
+import httpx
+from fastapi import Depends, FastAPI, HTTPException
+from sqlalchemy.orm import Session, selectinload
+from typing import List
+
+from app import models, schemas
+from app.database import Base, async_engine, engine, get_db
+from app.routers import roles
+
+N_SKILLS = 500
+
+
+def seed(n_roles):
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(1)
+    with engine.begin() as conn:
+        conn.execute(models.Skill.__table__.insert(), [
+            {"id": i, "name": f"Skill {i}", "category": "Technical"} for i in range(1, N_SKILLS + 1)
+        ])
+        conn.execute(models.JobRole.__table__.insert(), [
+            {"id": i, "title": f"Role {i}", "domain": f"Domain {i % 12}", "description": f"Synthetic role {i}"}
+            for i in range(1, n_roles + 1)
+        ])
+        conn.execute(models.JobSkill.__table__.insert(), [
+            {"job_role_id": r, "skill_id": s, "required_level": rng.randint(1, 5),
+             "importance_weight": rng.choice([1.0, 1.5, 2.0])}
+            for r in range(1, n_roles + 1) for s in rng.sample(range(1, N_SKILLS + 1), rng.randint(3, 12))
+        ])
+
+
+def orm_app(eager):
+    app = FastAPI()
+    options = [selectinload(models.JobRole.required_skills).selectinload(models.JobSkill.skill)] if eager else []
+
+    @app.get("/roles/", response_model=List[schemas.JobRole])
+    def list_roles(db: Session = Depends(get_db)):
+        return db.query(models.JobRole).options(*options).all()
+
+    @app.get("/roles/{role_id}", response_model=schemas.JobRole)
+    def get_role(role_id: int, db: Session = Depends(get_db)):
+        role = db.query(models.JobRole).options(*options).filter(models.JobRole.id == role_id).first()
+        if not role:
+            raise HTTPException(status_code=404, detail="Role not found")
+        return role
+
+    return app
+
+
+def cached_app():
+    app = FastAPI()
+    app.include_router(roles.router)
+    return app
+
+
+async def median_ms(client, path, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        response = await client.get(path)
+        times.append(time.perf_counter() - start)
+        assert response.status_code == 200
+    return statistics.median(times) * 1000
+
+
+async def main(n_roles, repeats):
+    rng = random.Random(2)
+    role_paths = [f"/roles/{rng.randint(1, n_roles)}" for _ in range(repeats * 20)]
+    print(f"{n_roles} roles")
+    print(f"{'mode':>9} {'list ms':>9} {'one role ms':>12}")
+    for mode, app in (("lazy", orm_app(False)), ("selectin", orm_app(True)), ("cached", cached_app())):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await client.get("/roles/")  # warm up (builds the snapshot for "cached")
+            list_ms = await median_ms(client, "/roles/", repeats)
+            one = []
+            for path in role_paths:
+                start = time.perf_counter()
+                await client.get(path)
+                one.append(time.perf_counter() - start)
+        print(f"{mode:>9} {list_ms:>9.1f} {statistics.median(one) * 1000:>12.3f}")
+    # Pooled aiosqlite connections keep a worker thread each; close them or exit hangs
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--roles", type=int, default=10_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    seed(args.roles)
+    asyncio.run(main(args.roles, args.repeats))
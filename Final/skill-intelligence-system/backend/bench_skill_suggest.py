@@ -0,0 +1,66 @@
+"""
+Skill autocomplete latency at catalog scale.
+
+    python bench_skill_suggest.py [--skills 100000] [--queries 2000] [--budget-ms 1.0]
+
+Builds a Suggester in memory over generated skill names (seed_data.generate)
+with random popularity, then times Suggester.suggest on prefixes of 1 to 12
+characters of random names, the way they arrive while a user types. Reports
+the build time and the p50 / p99 / max latency, and exits non-zero if p99 is
+over the budget.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="bench-suggest-"), "bench.db"))
+
+from app.services import catalog, skill_suggest
+from seed_data import generate
+
+
+def build(n_skills: int, rng: random.Random) -> skill_suggest.Suggester:
+    skills = tuple(catalog.SkillEntry(i, generate.skill_name(i), "Technical") for i in range(1, n_skills + 1))
+    snapshot = catalog.CatalogSnapshot(1, skills, (), (), ())
+    return skill_suggest.Suggester(skill_suggest.KeyTable(snapshot),
+                                   {i: rng.randrange(50) for i in range(1, n_skills + 1)})
+
+
+def measure(suggester: skill_suggest.Suggester, n_queries: int, rng: random.Random) -> list:
+    skills = suggester.table.skills
+    queries = []
+    for _ in range(n_queries):
+        name = skills[rng.randrange(len(skills))].name.lower()
+        queries.append(name[:rng.randint(1, min(len(name), 12))])
+    timings = []
+    for q in queries:
+        start = time.perf_counter()
+        suggester.suggest(q, 10)
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--skills", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--budget-ms", type=float, default=1.0, help="p99 target")
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    start = time.perf_counter()
+    suggester = build(args.skills, rng)
+    print(f"{args.skills} skills: built in {time.perf_counter() - start:.2f} s, "
+          f"{len(suggester.table.keys)} keys, {len(suggester.short)} precomputed prefixes")
+    timings = measure(suggester, args.queries, rng)
+    p50, p99 = timings[len(timings) // 2], timings[int(len(timings) * 0.99)]
+    print(f"suggest: p50 {p50:.3f} ms, p99 {p99:.3f} ms, max {timings[-1]:.3f} ms (budget p99 < {args.budget_ms} ms)")
+    if p99 >= args.budget_ms:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
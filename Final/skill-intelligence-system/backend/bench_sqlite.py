@@ -0,0 +1,110 @@
+"""
+Benchmark: SQLite engine profile on vs off under concurrent reads and writes.
+
+    python bench_sqlite.py [--seconds 5] [--readers 16] [--writers 4]
+
+Each run uses a fresh scratch database with a few thousand users. Reader
+threads load one user's skills; writer threads update a proficiency level in
+their own short transaction. Without the profile (rollback journal, no busy
+timeout) readers and writers block each other and writes fail with
+"database is locked"; with it (WAL, busy_timeout, synchronous=NORMAL) they
+run side by side.
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import OperationalError
+
+from app import models
+from app.database import Base, make_engine
+
+N_USERS = 5000
+N_SKILLS = 200
+
+
+def seed(engine):
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(1)
+    with engine.begin() as conn:
+        conn.execute(models.Skill.__table__.insert(), [
+            {"id": i, "name": f"Skill {i}", "category": "Technical"} for i in range(1, N_SKILLS + 1)
+        ])
+        conn.execute(models.User.__table__.insert(), [
+            {"id": i, "full_name": f"User {i}", "email": f"user{i}@bench.ai"} for i in range(1, N_USERS + 1)
+        ])
+        conn.execute(models.UserSkill.__table__.insert(), [
+            {"user_id": u, "skill_id": s, "proficiency_level": rng.randint(1, 5)}
+            for u in range(1, N_USERS + 1) for s in rng.sample(range(1, N_SKILLS + 1), 10)
+        ])
+
+
+def run(profile, seconds, readers, writers):
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-sqlite-"), "bench.db")
+    engine = make_engine(f"sqlite:///{path}", profile=profile)
+    seed(engine)
+    us = models.UserSkill.__table__
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def reader(seed_):
+        rng = random.Random(seed_)
+        done = errors = 0
+        while time.perf_counter() < deadline:
+            try:
+                with engine.connect() as conn:
+                    conn.execute(select(us).where(us.c.user_id == rng.randint(1, N_USERS))).all()
+                done += 1
+            except OperationalError:
+                errors += 1
+        with lock:
+            counts["reads"] += done
+            counts["errors"] += errors
+
+    def writer(seed_):
+        rng = random.Random(seed_)
+        done = errors = 0
+        while time.perf_counter() < deadline:
+            try:
+                with engine.begin() as conn:
+                    conn.execute(update(us).where(us.c.user_id == rng.randint(1, N_USERS))
+                                 .values(proficiency_level=rng.randint(1, 5)))
+                done += 1
+            except OperationalError:
+                errors += 1
+        with lock:
+            counts["writes"] += done
+            counts["errors"] += errors
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=writer, args=(1000 + i,)) for i in range(writers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    engine.dispose()
+    return counts["reads"] / elapsed, counts["writes"] / elapsed, counts["errors"]
+
+
+def main(seconds, readers, writers):
+    print(f"{readers} readers, {writers} writers, {seconds}s per run")
+    print(f"{'profile':>8} {'reads/s':>9} {'writes/s':>9} {'errors':>7}")
+    for profile in (False, True):
+        reads, writes, errors = run(profile, seconds, readers, writers)
+        print(f"{'on' if profile else 'off':>8} {reads:>9.0f} {writes:>9.0f} {errors:>7}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=4)
+    args = parser.parse_args()
+    main(args.seconds, args.readers, args.writers)
@@ -0,0 +1,140 @@
+import json
+import os
+import tempfile
+
+# The app's own engines (sync and async) point at a scratch file, never sql_app.db
+_SCRATCH_DB = os.path.join(tempfile.mkdtemp(prefix="skills-test-"), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_SCRATCH_DB}"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models
+from app import database
+from app.database import Base
+from app.services import catalog as catalog_cache
+from app.services import conversations, search, skill_suggest, talent
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), "seed_data", "data.json")
+
+
+@pytest.fixture
+def db():
+    # Isolated in-memory database per test; never touches sql_app.db
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    catalog_cache.invalidate()
+    talent.invalidate()
+    search.invalidate()
+    skill_suggest.invalidate()
+    conversations.cache.clear()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+        catalog_cache.invalidate()
+        talent.invalidate()
+        search.invalidate()
+        skill_suggest.invalidate()
+        conversations.cache.clear()
+
+
+def load_catalog(db):
+    """Load seed_data/data.json into the session and return a name -> Skill map."""
+    with open(DATA_FILE) as f:
+        data = json.load(f)
+
+    skills = {}
+    for s in data["skills"]:
+        skills[s["name"]] = models.Skill(name=s["name"], category=s["category"])
+        db.add(skills[s["name"]])
+    db.flush()
+
+    for r in data["resources"]:
+        if r["skill"] in skills:
+            db.add(models.LearningResource(
+                title=r["title"], type=r["type"], provider=r["provider"],
+                skill_id=skills[r["skill"]].id, difficulty_level=r["diff"], link=r.get("link")
+            ))
+
+    for role_data in data["roles"]:
+        role = models.JobRole(title=role_data["title"], domain=role_data["domain"])
+        db.add(role)
+        db.flush()
+        for req in role_data["required_skills"]:
+            if req["skill"] in skills:
+                db.add(models.JobSkill(
+                    job_role_id=role.id, skill_id=skills[req["skill"]].id,
+                    required_level=req["level"], importance_weight=req["weight"]
+                ))
+
+    for p_data in data.get("projects", []):
+        proj = models.Project(
+            title=p_data["title"], description=p_data["description"],
+            difficulty_level=p_data["difficulty"], domain=p_data["domain"],
+            github_repo_url=p_data["repo"]
+        )
+        db.add(proj)
+        db.flush()
+        for s_name in p_data["skills"]:
+            if s_name in skills:
+                db.add(models.ProjectSkill(project_id=proj.id, skill_id=skills[s_name].id))
+
+    db.commit()
+    return skills
+
+
+@pytest.fixture
+def catalog(db):
+    return load_catalog(db)
+
+
+@pytest.fixture
+def demo_user(db, catalog):
+    user = models.User(full_name="Alex Chen", email="demo@skills.ai", current_role_title="Junior Developer")
+    db.add(user)
+    db.flush()
+    for name, level in [("Python Programming", 3), ("Data Analysis", 2), ("SQL & Databases", 4),
+                        ("Machine Learning", 1), ("React.js", 5)]:
+        db.add(models.UserSkill(user_id=user.id, skill_id=catalog[name].id, proficiency_level=level))
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def client():
+    """TestClient on the real app (sync + async sessions) over a freshly seeded scratch file."""
+    from app.main import app
+
+    Base.metadata.drop_all(bind=database.engine)
+    Base.metadata.create_all(bind=database.engine)
+    catalog_cache.invalidate()
+    talent.invalidate()
+    search.invalidate()
+    skill_suggest.invalidate()
+    conversations.cache.clear()
+    session = database.SessionLocal()
+    try:
+        skills = load_catalog(session)
+        user = models.User(full_name="Alex Chen", email="demo@skills.ai")
+        session.add(user)
+        session.flush()
+        for name, level in [("Python Programming", 3), ("Data Analysis", 2), ("SQL & Databases", 4)]:
+            session.add(models.UserSkill(user_id=user.id, skill_id=skills[name].id, proficiency_level=level))
+        session.commit()
+    finally:
+        session.close()
+    with TestClient(app) as test_client:
+        yield test_client
+    catalog_cache.invalidate()
+    talent.invalidate()
+    search.invalidate()
+    skill_suggest.invalidate()
+    conversations.cache.clear()
@@ -0,0 +1,219 @@
+"""
+Synthetic catalog and user population generator.
+
+    python seed_data/generate.py --scale large
+    python seed_data/generate.py --skills 2000 --roles 5000 --users 100000 --seed 7
+    python seed_data/generate.py --scale medium --out /tmp/catalog.json   # catalog file only
+
+Output is deterministic for a given --seed and sizes. Skill popularity
+follows a Zipf distribution (a few skills are required and held everywhere),
+roles have a long-tailed number of requirements, and users a power-law
+number of skills. The catalog goes through the bulk seeder in seed.py (so
+re-running with the same arguments writes nothing); users and their skills
+are appended with batched executemany INSERTs.
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, Iterator, List, Tuple
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.engine import Engine
+
+from app import migrations, models
+from app.database import engine, make_engine
+from seed_data import seed
+
+SCALES = {
+    "small": dict(skills=500, roles=1_000, resources=5_000, projects=1_000, users=10_000),
+    "medium": dict(skills=2_000, roles=5_000, resources=50_000, projects=10_000, users=100_000),
+    "large": dict(skills=10_000, roles=20_000, resources=200_000, projects=50_000, users=1_000_000),
+}
+
+CATEGORIES = ["Technical", "Technical", "Technical", "Domain", "Soft Skill", "Business", "Design"]
+TOPICS = [
+    "Python", "SQL", "Data", "Cloud", "Kubernetes", "Security", "GIS", "IoT", "Embedded", "Machine Learning",
+    "Deep Learning", "Statistics", "Genomics", "Clinical", "Agronomy", "Supply Chain", "UX", "Product",
+    "Negotiation", "Leadership", "Networking", "Robotics", "Energy", "Finance", "Compliance", "Frontend",
+]
+ASPECTS = [
+    "Fundamentals", "Engineering", "Analysis", "Architecture", "Operations", "Modeling", "Design",
+    "Automation", "Governance", "Visualization", "Testing", "Optimization", "Research", "Strategy",
+]
+ROLE_LEVELS = ["Junior", "Associate", "Senior", "Lead", "Principal"]
+ROLE_KINDS = ["Engineer", "Analyst", "Scientist", "Specialist", "Consultant", "Manager", "Architect"]
+DOMAINS = ["Agricultural Technology", "Business", "Design", "Healthcare Technology",
+           "Technology (General)", "Urban / Smart City"]
+PROJECT_DOMAINS = ["AgriTech", "General", "Healthcare", "Security", "Smart Cities"]
+RESOURCE_TYPES = ["Course", "Course", "Course", "Certification", "Project"]
+PROVIDERS = ["Coursera", "Udemy", "edX", "Udacity", "LinkedIn Learning", "Google Developers", "Internal"]
+
+ZIPF_EXPONENT = 1.1
+MAX_ROLE_REQUIREMENTS = 40
+MAX_USER_SKILLS = 80
+USER_BATCH = 50_000
+
+
+def skill_name(i: int) -> str:
+    return f"{TOPICS[i % len(TOPICS)]} {ASPECTS[(i // len(TOPICS)) % len(ASPECTS)]} {i}"
+
+
+class Popularity:
+    """Zipf-weighted sampling of skill indexes 0..n-1 (index 0 the most popular)."""
+
+    def __init__(self, n: int, rng: random.Random):
+        self.rng = rng
+        self.population = range(n)
+        self.cum_weights = list(itertools.accumulate(1.0 / (rank + 1) ** ZIPF_EXPONENT for rank in range(n)))
+
+    def sample(self, k: int) -> List[int]:
+        """k distinct skill indexes."""
+        k = min(k, len(self.population))
+        chosen = dict.fromkeys(self.rng.choices(self.population, cum_weights=self.cum_weights, k=k))
+        while len(chosen) < k:
+            more = self.rng.choices(self.population, cum_weights=self.cum_weights, k=k - len(chosen))
+            chosen.update(dict.fromkeys(more))
+        return list(chosen)
+
+
+def long_tail(rng: random.Random, alpha: float, cap: int) -> int:
+    """Pareto-distributed count >= 1: most values small, a few near `cap`."""
+    return min(cap, int(rng.paretovariate(alpha)))
+
+
+def catalog_items(sizes: Dict[str, int], seed_value: int) -> Iterator[Tuple[str, dict]]:
+    """(section, item) pairs in the data.json format, skills first."""
+    rng = random.Random(seed_value)
+    n_skills = sizes["skills"]
+    popular = Popularity(n_skills, rng)
+
+    for i in range(n_skills):
+        yield "skills", {"name": skill_name(i), "category": CATEGORIES[i % len(CATEGORIES)]}
+
+    for i in range(sizes["roles"]):
+        title = f"{ROLE_LEVELS[i % len(ROLE_LEVELS)]} {skill_name(popular.sample(1)[0]).rsplit(' ', 1)[0]} " \
+                f"{ROLE_KINDS[(i // len(ROLE_LEVELS)) % len(ROLE_KINDS)]} {i}"
+        count = max(2, long_tail(rng, 1.6, MAX_ROLE_REQUIREMENTS) + 2)
+        yield "roles", {
+            "title": title,
+            "domain": DOMAINS[rng.randrange(len(DOMAINS))],
+            "required_skills": [
+                {"skill": skill_name(s), "level": rng.randint(1, 5), "weight": rng.choice([1.0, 1.0, 1.5, 2.0])}
+                for s in popular.sample(count)
+            ],
+        }
+
+    for i in range(sizes["resources"]):
+        s = popular.sample(1)[0]
+        yield "resources", {
+            "title": f"{skill_name(s)}: {RESOURCE_TYPES[i % len(RESOURCE_TYPES)]} {i}",
+            "type": RESOURCE_TYPES[i % len(RESOURCE_TYPES)],
+            "provider": PROVIDERS[rng.randrange(len(PROVIDERS))],
+            "skill": skill_name(s),
+            "diff": rng.randint(1, 3),
+            "link": f"https://example.org/resources/{i}",
+        }
+
+    for i in range(sizes["projects"]):
+        skills = [skill_name(s) for s in popular.sample(rng.randint(2, 6))]
+        yield "projects", {
+            "title": f"{skills[0].rsplit(' ', 1)[0]} Project {i}",
+            "description": f"Build something that exercises {', '.join(skills)}.",
+            "difficulty": rng.randint(1, 3),
+            "domain": PROJECT_DOMAINS[rng.randrange(len(PROJECT_DOMAINS))],
+            "repo": f"https://github.com/example/project-{i}",
+            "skills": skills,
+        }
+
+
+def write_json(path: str, items: Iterator[Tuple[str, dict]]):
+    """Stream (section, item) pairs into a data.json-shaped file."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("{")
+        current = None
+        for section, item in items:
+            if section != current:
+                f.write(("]," if current else "") + f"\n{json.dumps(section)}: [\n")
+                current = section
+            else:
+                f.write(",\n")
+            f.write(json.dumps(item))
+        f.write(("]" if current else "") + "\n}\n")
+
+
+def generate_users(target: Engine, n_users: int, n_skills: int, seed_value: int) -> Tuple[int, int]:
+    """
+    Append synthetic users (userN@synthetic.skills.ai) with power-law skill counts.
+    Users already present from an earlier run with the same seed are skipped.
+    Returns (users inserted, user_skills inserted).
+    """
+    u, us, s = models.User.__table__, models.UserSkill.__table__, models.Skill.__table__
+    with target.connect() as conn:
+        ids_by_name = dict(conn.execute(select(s.c.name, s.c.id)).all())
+        existing = conn.execute(select(func.count()).where(u.c.email.like("%@synthetic.skills.ai"))).scalar()
+        next_id = (conn.execute(select(func.max(u.c.id))).scalar() or 0) + 1
+    skill_ids = [ids_by_name[skill_name(i)] for i in range(n_skills)]
+
+    rng = random.Random(seed_value + 1)
+    popular = Popularity(len(skill_ids), rng)
+    users_written = skills_written = 0
+    for start in range(0, n_users, USER_BATCH):
+        users, user_skills = [], []
+        for i in range(start, min(n_users, start + USER_BATCH)):
+            # Always draw, so users after a partial earlier run get the same skills
+            picks = popular.sample(long_tail(rng, 1.2, MAX_USER_SKILLS))
+            levels = [rng.randint(1, 5) for _ in picks]
+            if i < existing:
+                continue
+            user_id = next_id + len(users) + users_written
+            users.append({"id": user_id, "full_name": f"Synthetic User {i}",
+                          "email": f"user{i}@synthetic.skills.ai", "current_role_title": "Student"})
+            user_skills.extend({"user_id": user_id, "skill_id": skill_ids[p], "proficiency_level": level}
+                               for p, level in zip(picks, levels))
+        if users:
+            with target.begin() as conn:
+                conn.execute(insert(u), users)
+                conn.execute(insert(us), user_skills)
+            users_written += len(users)
+            skills_written += len(user_skills)
+    return users_written, skills_written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic catalog and user population")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    for name in SCALES["small"]:
+        parser.add_argument(f"--{name}", type=int, help=f"override the number of {name}")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--url", help="database URL (default: DATABASE_URL)")
+    parser.add_argument("--out", help="write the catalog to this JSON file instead of a database")
+    args = parser.parse_args()
+
+    sizes = {name: getattr(args, name) if getattr(args, name) is not None else default
+             for name, default in SCALES[args.scale].items()}
+    print("sizes: " + ", ".join(f"{k}={v}" for k, v in sizes.items()))
+    start = time.perf_counter()
+
+    if args.out:
+        write_json(args.out, catalog_items(sizes, args.seed))
+        print(f"Wrote {args.out} in {time.perf_counter() - start:.2f}s")
+        return
+
+    target = make_engine(args.url) if args.url else engine
+    migrations.upgrade(target)
+    stats = seed.CatalogSeeder(target).run(catalog_items(sizes, args.seed))
+    seed.print_report(stats, time.perf_counter() - start)
+
+    users_start = time.perf_counter()
+    users, user_skills = generate_users(target, sizes["users"], sizes["skills"], args.seed)
+    print(f"users: {users} inserted with {user_skills} skills in {time.perf_counter() - users_start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
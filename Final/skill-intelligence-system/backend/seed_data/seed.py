@@ -1,126 +1,418 @@
+"""
+Catalog seeder.
+
+    python seed_data/seed.py [path/to/data.json] [--batch 5000]
+
+The input is parsed incrementally (one array element at a time), names are
+resolved through in-memory maps, and rows are written with batched
+executemany INSERTs / UPDATEs, one transaction per section. Every entity is
+compared with what is already stored through a content hash, so re-running
+the seeder on an unchanged file writes nothing. Skills must come before the
+sections that reference them; if they don't, those sections are buffered
+until the skills have been loaded.
+"""
+import argparse
+import hashlib
 import json
 import os
 import sys
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
 
 # Add parent dir to path to import app
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from app import models
-from app.database import SessionLocal, engine, Base
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.engine import Connection, Engine
 
-# Init DB
-Base.metadata.create_all(bind=engine)
+from app import migrations, models
+from app.database import SessionLocal, engine
+# Importing the catalog registers the hooks that bump the catalog version on
+# commit, so running API processes drop their snapshot after a re-seed
+from app.services import catalog
 
-def seed():
-    db = SessionLocal()
-    
-    # Load JSON
-    with open(os.path.join(os.path.dirname(__file__), 'data.json')) as f:
-        data = json.load(f)
-
-    print("Seeding Skills...")
-    skill_map = {} # Name -> ID
-    for s in data['skills']:
-        existing = db.query(models.Skill).filter_by(name=s['name']).first()
-        if not existing:
-            new_skill = models.Skill(name=s['name'], category=s['category'])
-            db.add(new_skill)
-            db.commit()
-            db.refresh(new_skill)
-            skill_map[s['name']] = new_skill.id
+DATA_FILE = os.path.join(os.path.dirname(__file__), 'data.json')
+BATCH_SIZE = 5000
+READ_CHUNK = 1 << 16
+
+
+# --- Incremental JSON reader ---
+
+def iter_sections(fp, chunk_size: int = READ_CHUNK) -> Iterator[Tuple[str, object]]:
+    """
+    Yield (key, element) for every element of every top-level array in a JSON
+    object, reading the file in chunks. Only one element is decoded at a time.
+    """
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def fill() -> bool:
+        nonlocal buf, pos, eof
+        if eof:
+            return False
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buf, pos = buf[pos:] + chunk, 0
+        return True
+
+    def peek() -> str:
+        nonlocal pos
+        while True:
+            while pos < len(buf) and buf[pos].isspace():
+                pos += 1
+            if pos < len(buf):
+                return buf[pos]
+            if not fill():
+                raise ValueError("unexpected end of JSON input")
+
+    def expect(char: str):
+        nonlocal pos
+        if peek() != char:
+            raise ValueError(f"expected {char!r} at offset {pos}")
+        pos += 1
+
+    def value():
+        nonlocal pos
+        peek()
+        while True:
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+                # A number cut off by the chunk boundary ("12" of "125", "1." of "1.5") still
+                # decodes; it is only complete once a delimiter follows
+                if eof or (end < len(buf) and (buf[end] in ",:]}" or buf[end].isspace())):
+                    pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            fill()
+
+    expect("{")
+    if peek() == "}":
+        return
+    while True:
+        key = value()
+        expect(":")
+        if peek() == "[":
+            pos += 1
+            if peek() == "]":
+                pos += 1
+            else:
+                while True:
+                    yield key, value()
+                    if peek() == ",":
+                        pos += 1
+                        continue
+                    expect("]")
+                    break
         else:
-            skill_map[s['name']] = existing.id
-            
-    print("Seeding Resources...")
-    for r in data['resources']:
-        skill_id = skill_map.get(r['skill'])
-        if skill_id:
-            exists = db.query(models.LearningResource).filter_by(title=r['title']).first()
-            if not exists:
-                res = models.LearningResource(
-                    title=r['title'], type=r['type'], provider=r['provider'],
-                    skill_id=skill_id, difficulty_level=r['diff'],
-                    link=r.get('link')
-                )
-                db.add(res)
+            value()  # scalar / object sections are not part of the catalog format
+        if peek() == ",":
+            pos += 1
+            continue
+        expect("}")
+        return
+
+
+def batches(items: Iterator, size: int) -> Iterator[List]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def digest(*values) -> bytes:
+    return hashlib.blake2b(repr(values).encode(), digest_size=16).digest()
+
+
+# --- Seeding ---
+
+@dataclass
+class SectionStats:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    skipped: int = 0  # references an unknown skill, or missing a key field
+    seconds: float = 0.0
+
+
+class CatalogSeeder:
+    """Upserts catalog sections against maps of what is already stored (natural key -> (id, hash))."""
+
+    def __init__(self, engine: Engine, batch_size: int = BATCH_SIZE):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.stats: Dict[str, SectionStats] = {}
+        with engine.connect() as conn:
+            self._load_existing(conn)
+
+    def _load_existing(self, conn: Connection):
+        s, lr, jr, js, p, ps = (m.__table__ for m in (
+            models.Skill, models.LearningResource, models.JobRole, models.JobSkill,
+            models.Project, models.ProjectSkill,
+        ))
+        self.skills = {
+            row.name: (row.id, digest(row.category))
+            for row in conn.execute(select(s.c.id, s.c.name, s.c.category))
+        }
+
+        self.resources = {
+            row.title: (row.id, digest(row.type, row.provider, row.skill_id, row.difficulty_level, row.link))
+            for row in conn.execute(select(lr.c.id, lr.c.title, lr.c.type, lr.c.provider, lr.c.skill_id,
+                                           lr.c.difficulty_level, lr.c.link).order_by(lr.c.id))
+        }
+
+        reqs: Dict[int, List[tuple]] = {}
+        for row in conn.execute(select(js.c.job_role_id, js.c.skill_id, js.c.required_level,
+                                       js.c.importance_weight).order_by(js.c.id)):
+            reqs.setdefault(row.job_role_id, []).append((row.skill_id, row.required_level, row.importance_weight))
+        self.roles = {
+            row.title: (row.id, digest(row.domain, row.description, reqs.get(row.id, [])))
+            for row in conn.execute(select(jr.c.id, jr.c.title, jr.c.domain, jr.c.description))
+        }
+
+        project_skills: Dict[int, List[int]] = {}
+        for row in conn.execute(select(ps.c.project_id, ps.c.skill_id).order_by(ps.c.id)):
+            project_skills.setdefault(row.project_id, []).append(row.skill_id)
+        self.projects = {
+            row.title: (row.id, digest(row.description, row.domain, row.difficulty_level, row.github_repo_url,
+                                       project_skills.get(row.id, [])))
+            for row in conn.execute(select(p.c.id, p.c.title, p.c.description, p.c.domain,
+                                           p.c.difficulty_level, p.c.github_repo_url).order_by(p.c.id))
+        }
+
+    def _skill_id(self, name) -> Optional[int]:
+        entry = self.skills.get(name)
+        return entry[0] if entry else None
+
+    def _upsert(self, conn: Connection, table, existing: Dict, key_field: str,
+                rows: List[Tuple[str, bytes, dict]], stats: SectionStats) -> Dict[int, str]:
+        """
+        Write (natural key, hash, column values) rows: INSERT new keys, UPDATE changed ones,
+        skip the rest. Returns {row id: natural key} of everything written.
+        """
+        new, changed = {}, {}
+        for key, h, values in rows:
+            current = existing.get(key)
+            if current is None or key in new:
+                new[key] = (h, values)  # a key repeated within the batch: last one wins
+            elif current[1] != h:
+                changed[key] = (current[0], h, values)
             else:
-                # Update existing resource
-                exists.type = r['type']
-                exists.provider = r['provider']
-                exists.difficulty_level = r['diff']
-                exists.link = r.get('link')
-    db.commit()
-
-    print("Seeding Roles...")
-    for role_data in data['roles']:
-        role = db.query(models.JobRole).filter_by(title=role_data['title']).first()
-        if not role:
-            role = models.JobRole(title=role_data['title'], domain=role_data['domain'])
-            db.add(role)
-            db.commit()
-            db.refresh(role)
-            
-            # Add reqs
-            for req in role_data['required_skills']:
-                skill_id = skill_map.get(req['skill'])
-                if skill_id:
-                    js = models.JobSkill(
-                        job_role_id=role.id,
-                        skill_id=skill_id,
-                        required_level=req['level'],
-                        importance_weight=req['weight']
-                    )
-                    db.add(js)
+                stats.unchanged += 1
+
+        written = {}
+        if new:
+            result = conn.execute(
+                insert(table).returning(table.c.id, sort_by_parameter_order=True),
+                [{key_field: key, **values} for key, (_, values) in new.items()],
+            )
+            for (key, (h, _)), row_id in zip(new.items(), result.scalars()):
+                existing[key] = (row_id, h)
+                written[row_id] = key
+            stats.inserted += len(new)
+
+        if changed:
+            columns = list(next(iter(changed.values()))[2])
+            conn.execute(
+                update(table).where(table.c.id == bindparam("_id"))
+                .values({c: bindparam(c) for c in columns}),
+                [{"_id": row_id, **values} for row_id, _, values in changed.values()],
+            )
+            for key, (row_id, h, _) in changed.items():
+                existing[key] = (row_id, h)
+                written[row_id] = key
+            stats.updated += len(changed)
+
+        return written
+
+    # Each section method takes one batch of raw items and writes it on `conn`
+
+    def skills_batch(self, conn: Connection, items: List[dict], stats: SectionStats):
+        rows = []
+        for item in items:
+            if not item.get("name"):
+                stats.skipped += 1
+                continue
+            rows.append((item["name"], digest(item.get("category")), {"category": item.get("category")}))
+        self._upsert(conn, models.Skill.__table__, self.skills, "name", rows, stats)
+
+    def resources_batch(self, conn: Connection, items: List[dict], stats: SectionStats):
+        rows = []
+        for item in items:
+            skill_id = self._skill_id(item.get("skill"))
+            if skill_id is None or not item.get("title"):
+                stats.skipped += 1
+                continue
+            values = {"type": item.get("type"), "provider": item.get("provider"), "skill_id": skill_id,
+                      "difficulty_level": item.get("diff", 1), "link": item.get("link")}
+            rows.append((item["title"], digest(*values.values()), values))
+        self._upsert(conn, models.LearningResource.__table__, self.resources, "title", rows, stats)
+
+    def roles_batch(self, conn: Connection, items: List[dict], stats: SectionStats):
+        rows, reqs_by_title = [], {}
+        for item in items:
+            if not item.get("title"):
+                stats.skipped += 1
+                continue
+            reqs, seen = [], set()
+            for req in item.get("required_skills", []):
+                skill_id = self._skill_id(req.get("skill"))
+                # Unknown skills are dropped, as they always were; one requirement per skill
+                if skill_id is not None and skill_id not in seen:
+                    seen.add(skill_id)
+                    reqs.append((skill_id, req.get("level", 1), float(req.get("weight", 1.0))))
+            values = {"domain": item.get("domain"), "description": item.get("description")}
+            rows.append((item["title"], digest(values["domain"], values["description"], reqs), values))
+            reqs_by_title[item["title"]] = reqs
+        self._replace_children(conn, models.JobRole.__table__, self.roles, rows, stats,
+                               models.JobSkill.__table__, "job_role_id", reqs_by_title,
+                               lambda parent_id, req: {"job_role_id": parent_id, "skill_id": req[0],
+                                                       "required_level": req[1], "importance_weight": req[2]})
+
+    def projects_batch(self, conn: Connection, items: List[dict], stats: SectionStats):
+        rows, skills_by_title = [], {}
+        for item in items:
+            if not item.get("title"):
+                stats.skipped += 1
+                continue
+            # dict.fromkeys: known skills, once each, in file order
+            skill_ids = list(dict.fromkeys(
+                sid for sid in (self._skill_id(n) for n in item.get("skills", [])) if sid is not None
+            ))
+            values = {"description": item.get("description"), "domain": item.get("domain"),
+                      "difficulty_level": item.get("difficulty", 1), "github_repo_url": item.get("repo")}
+            rows.append((item["title"], digest(*values.values(), skill_ids), values))
+            skills_by_title[item["title"]] = skill_ids
+        self._replace_children(conn, models.Project.__table__, self.projects, rows, stats,
+                               models.ProjectSkill.__table__, "project_id", skills_by_title,
+                               lambda parent_id, skill_id: {"project_id": parent_id, "skill_id": skill_id})
+
+    def _replace_children(self, conn, table, existing, rows, stats, child_table, parent_field, children, child_row):
+        """Upsert parents, then rewrite the association rows of every inserted or changed parent."""
+        written = self._upsert(conn, table, existing, "title", rows, stats)
+        if not written:
+            return
+        conn.execute(delete(child_table).where(child_table.c[parent_field].in_(list(written))))
+        child_rows = [child_row(row_id, child) for row_id, key in written.items() for child in children[key]]
+        if child_rows:
+            conn.execute(insert(child_table), child_rows)
+
+    SECTIONS = ("skills", "resources", "roles", "projects")
+
+    def run(self, items: Iterator[Tuple[str, object]]) -> Dict[str, SectionStats]:
+        """Consume (section, item) pairs; each section is written in its own transaction."""
+        pending: Dict[str, List] = {}
+
+        def grouped() -> Iterator[Tuple[str, List]]:
+            # Batches of consecutive items of one section; items that reference skills
+            # but arrive before the skills section are set aside in `pending`
+            current, buffer, skills_seen = None, [], False
+            for section, item in items:
+                if section not in self.SECTIONS:
+                    continue
+                skills_seen |= section == "skills"
+                if not skills_seen:
+                    pending.setdefault(section, []).append(item)
+                    continue
+                if section != current and buffer:
+                    yield current, buffer
+                    buffer = []
+                current = section
+                buffer.append(item)
+                if len(buffer) >= self.batch_size:
+                    yield current, buffer
+                    buffer = []
+            if buffer:
+                yield current, buffer
+
+        conn, txn, current, started = None, None, None, 0.0
+
+        def finish():
+            stats = self.stats[current]
+            if stats.inserted or stats.updated:
+                # Core writes don't go through the session hooks
+                catalog.bump_version(conn)
+            txn.commit()
+            conn.close()
+            stats.seconds += time.perf_counter() - started
+
+        try:
+            for section, chunk in grouped():
+                if section != current:
+                    if current is not None:
+                        finish()
+                    current, started = section, time.perf_counter()
+                    self.stats.setdefault(section, SectionStats())
+                    conn = self.engine.connect()
+                    txn = conn.begin()
+                getattr(self, f"{section}_batch")(conn, chunk, self.stats[section])
+            if current is not None:
+                finish()
+                current = None
+
+            for section, buffered in pending.items():
+                current, started = section, time.perf_counter()
+                self.stats.setdefault(section, SectionStats())
+                conn = self.engine.connect()
+                txn = conn.begin()
+                for chunk in batches(iter(buffered), self.batch_size):
+                    getattr(self, f"{section}_batch")(conn, chunk, self.stats[section])
+                finish()
+                current = None
+        except Exception:
+            if current is not None:
+                txn.rollback()
+                conn.close()
+            raise
+        catalog.invalidate()
+        return self.stats
+
+
+def seed_demo_user():
+    db = SessionLocal()
+    try:
+        if not db.query(models.User).filter_by(email="demo@skills.ai").first():
+            # Firebase Auth usage makes this local hash irrelevant
+            db.add(models.User(
+                full_name="Alex Chen",
+                email="demo@skills.ai",
+                current_role_title="Junior Developer",
+                password_hash="firebase_managed_placeholder_hash",
+            ))
             db.commit()
-            
-    print("Seeding Demo User...")
-    demo_user = db.query(models.User).filter_by(email="demo@skills.ai").first()
-    if not demo_user:
-        # Firebase Auth usage makes this local hash irrelevant
-        hashed_pwd = "firebase_managed_placeholder_hash"
-        demo_user = models.User(
-            full_name="Alex Chen",
-            email="demo@skills.ai",
-            current_role_title="Junior Developer",
-            password_hash=hashed_pwd
-        )
-        db.add(demo_user)
-        db.commit()
-
-    print("Seeding Projects...")
-    if 'projects' in data:
-        for p_data in data['projects']:
-            proj = db.query(models.Project).filter_by(title=p_data['title']).first()
-            if not proj:
-                proj = models.Project(
-                    title=p_data['title'],
-                    description=p_data['description'],
-                    difficulty_level=p_data['difficulty'],
-                    domain=p_data['domain'],
-                    github_repo_url=p_data['repo']
-                )
-                db.add(proj)
-                db.commit()
-                db.refresh(proj)
-                
-                # Add project skills
-                for s_name in p_data['skills']:
-                    # Fuzzy match or exact match? Exact for now, handle loose naming if needed
-                    # Try exact first
-                    s_id = skill_map.get(s_name)
-                    # If not found, try finding by partial? No, simpler to be strict or ensure data.json matches.
-                    # data.json usually matches.
-                    
-                    if s_id:
-                        ps = models.ProjectSkill(
-                            project_id=proj.id,
-                            skill_id=s_id
-                        )
-                        db.add(ps)
-                db.commit()
-
-    print("Seeding Complete!")
-    db.close()
+    finally:
+        db.close()
+
+
+def seed(path: str = DATA_FILE, target: Engine = engine, batch_size: int = BATCH_SIZE) -> Dict[str, SectionStats]:
+    with open(path, encoding="utf-8") as f:
+        return CatalogSeeder(target, batch_size).run(iter_sections(f))
+
+
+def print_report(stats: Dict[str, SectionStats], total: float):
+    print(f"{'section':<10} {'inserted':>9} {'updated':>8} {'unchanged':>10} {'skipped':>8} {'seconds':>8}")
+    for name, s in stats.items():
+        print(f"{name:<10} {s.inserted:>9} {s.updated:>8} {s.unchanged:>10} {s.skipped:>8} {s.seconds:>8.2f}")
+    print(f"Seeding complete in {total:.2f}s")
+
 
 if __name__ == "__main__":
-    seed()
+    parser = argparse.ArgumentParser(description="Load a catalog JSON file into the database")
+    parser.add_argument("path", nargs="?", default=DATA_FILE)
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE, help="items per executemany batch")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    # Init DB
+    migrations.upgrade(engine)
+    stats = seed(args.path, batch_size=args.batch)
+    seed_demo_user()
+    print_report(stats, time.perf_counter() - start)
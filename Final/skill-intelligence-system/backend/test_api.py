@@ -0,0 +1,265 @@
+import json
+
+
+def test_async_read_endpoints(client):
+    user = client.get("/users/1").json()
+    assert user["email"] == "demo@skills.ai"
+    assert {s["skill"]["name"] for s in user["skills"]} == {"Python Programming", "Data Analysis", "SQL & Databases"}
+    assert client.get("/users/by-email/demo@skills.ai").json()["id"] == 1
+    assert client.get("/users/999").status_code == 404
+
+    roles = client.get("/roles/").json()
+    assert len(roles) == 17
+    assert client.get(f"/roles/{roles[0]['id']}").json()["title"] == roles[0]["title"]
+    assert client.get("/roles/999").status_code == 404
+
+    recs = client.get("/roles/recommend/1", params={"limit": 3, "include_gaps": False}).json()
+    assert len(recs) == 3 and all(r["gaps"] == [] for r in recs)
+
+    assert len(client.get("/skills/").json()) == 50
+    assert len(client.get("/skills/resources").json()) == 31
+    assert client.get("/projects/recommend/1").status_code == 200
+    assert client.get(f"/roles/plan/1/{roles[0]['id']}").json()["role_id"] == roles[0]["id"]
+
+
+def test_writes_are_visible_to_async_reads(client):
+    skill_id = client.get("/skills/").json()[10]["id"]
+    assert client.post("/users/1/skills", json={"skill_id": skill_id, "proficiency_level": 4}).status_code == 200
+    assert skill_id in {s["skill_id"] for s in client.get("/users/1").json()["skills"]}
+
+    assert client.delete(f"/users/1/skills/{skill_id}").status_code == 200
+    assert skill_id not in {s["skill_id"] for s in client.get("/users/1").json()["skills"]}
+
+
+def test_role_catalog_is_served_from_cached_bytes(client):
+    from app import database, models, schemas
+    from app.services import catalog
+
+    roles = client.get("/roles/").json()
+    session = database.SessionLocal()
+    try:
+        expected = [schemas.JobRole.model_validate(r).model_dump(mode="json")
+                    for r in session.query(models.JobRole).order_by(models.JobRole.id)]
+        assert roles == expected
+
+        cached = catalog.role_responses(session)
+        assert client.get("/roles/").content == cached.all_roles.body
+        assert catalog.role_responses(session) is cached
+        assert client.get(f"/roles/{roles[3]['id']}").json() == roles[3]
+
+        # A catalog write drops the cached bytes with the snapshot
+        session.add(models.JobRole(title="Prompt Engineer", domain="AI"))
+        session.commit()
+    finally:
+        session.close()
+    assert [r["title"] for r in client.get("/roles/").json()][-1] == "Prompt Engineer"
+
+
+def test_catalog_endpoints_support_conditional_requests(client):
+    from sqlalchemy import event
+    from app import database
+
+    for path in ["/skills/", "/skills/resources", "/roles/", "/roles/1"]:
+        first = client.get(path)
+        etag = first.headers["etag"]
+        assert first.headers["cache-control"].startswith("public")
+
+        statements = []
+        counter = lambda *args: statements.append(args[2])
+        event.listen(database.async_engine.sync_engine, "before_cursor_execute", counter)
+        try:
+            cached = client.get(path, headers={"If-None-Match": etag})
+        finally:
+            event.remove(database.async_engine.sync_engine, "before_cursor_execute", counter)
+        assert cached.status_code == 304 and cached.content == b""
+        assert cached.headers["etag"] == etag
+        assert statements == []
+
+        assert client.get(path, headers={"If-None-Match": '"stale", W/' + etag}).status_code == 304
+        assert client.get(path, headers={"If-None-Match": '"stale"'}).status_code == 200
+
+    assert client.get("/roles/1").headers["etag"] != client.get("/roles/2").headers["etag"]
+
+
+def test_user_etag_follows_user_writes(client):
+    first = client.get("/users/1")
+    etag = first.headers["etag"]
+    assert first.headers["cache-control"] == "private, no-cache"
+    assert client.get("/users/1", headers={"If-None-Match": etag}).status_code == 304
+
+    skill_id = client.get("/skills/").json()[10]["id"]
+    client.post("/users/1/skills", json={"skill_id": skill_id, "proficiency_level": 2})
+    changed = client.get("/users/1", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert skill_id in {s["skill_id"] for s in changed.json()["skills"]}
+
+    etag = changed.headers["etag"]
+    client.put("/users/1", json={"full_name": "Alex Q. Chen"})
+    renamed = client.get("/users/1", headers={"If-None-Match": etag})
+    assert renamed.status_code == 200 and renamed.json()["full_name"] == "Alex Q. Chen"
+    assert client.get("/users/1", headers={"If-None-Match": renamed.headers["etag"]}).status_code == 304
+
+
+def collect_pages(client, path, **params):
+    items, cursor = [], None
+    while True:
+        response = client.get(path, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        items += response.json()
+        cursor = response.headers.get("x-next-cursor")
+        if cursor is None:
+            return items
+        assert f"cursor={cursor}" in response.headers["link"]
+
+
+def read_ndjson(client, path, **params):
+    response = client.get(path, params={**params, "stream": True})
+    assert response.headers["content-type"] == "application/x-ndjson"
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_list_endpoints_paginate_and_stream(client):
+    for path in ["/skills/", "/skills/resources", "/roles/"]:
+        full = client.get(path).json()
+        assert collect_pages(client, path, limit=7) == full
+        assert read_ndjson(client, path) == full
+
+    skills = client.get("/skills/").json()
+    category = skills[0]["category"]
+    expected = [s for s in skills if s["category"] == category]
+    assert collect_pages(client, "/skills/", category=category.upper(), limit=5) == expected
+    assert read_ndjson(client, "/skills/", category=category) == expected
+
+    roles = client.get("/roles/").json()
+    domain = roles[-1]["domain"]
+    assert collect_pages(client, "/roles/", domain=domain, limit=2) == [r for r in roles if r["domain"] == domain]
+
+    page = client.get("/roles/", params={"limit": 5})
+    assert [r["id"] for r in page.json()] == [r["id"] for r in roles[:5]]
+    assert [r["id"] for r in read_ndjson(client, "/roles/", cursor=page.headers["x-next-cursor"])] == \
+        [r["id"] for r in roles[5:]]
+    # An interrupted stream resumes after the id of its last line; limit bounds a stream like a page
+    cut = read_ndjson(client, "/roles/", limit=4)
+    assert cut == roles[:4]
+    assert cut + read_ndjson(client, "/roles/", cursor=cut[-1]["id"]) == roles
+    assert read_ndjson(client, "/roles/", domain=domain, cursor=cut[-1]["id"], limit=1) == \
+        [r for r in roles[4:] if r["domain"] == domain][:1]
+
+    resources = client.get("/skills/resources").json()
+    by_provider = collect_pages(client, "/skills/resources", provider=resources[0]["provider"], limit=3)
+    assert by_provider == [r for r in resources if r["provider"] == resources[0]["provider"]]
+    python = next(s["id"] for s in skills if s["name"] == "Python Programming")
+    assert 0 < len(collect_pages(client, "/skills/resources", skill_id=python)) < len(resources)
+
+
+def test_bulk_skill_upsert_is_one_transaction(client):
+    from sqlalchemy import event
+    from app import database
+    from app.services import talent
+
+    skills = client.get("/skills/").json()
+    profile = [{"skill_id": s["id"], "proficiency_level": 1 + i % 5} for i, s in enumerate(skills[:40])]
+    etag = client.get("/users/1").headers["etag"]
+    client.get("/roles/1/candidates")  # loads the talent matrix, which the writes must patch
+    matrix = talent._matrix
+
+    statements, commits = [], []
+    on_execute = lambda *args: statements.append(args[2])
+    on_commit = lambda conn: commits.append(conn)
+    event.listen(database.engine, "before_cursor_execute", on_execute)
+    event.listen(database.engine, "commit", on_commit)
+    try:
+        response = client.put("/users/1/skills", json={"skills": profile})
+    finally:
+        event.remove(database.engine, "before_cursor_execute", on_execute)
+        event.remove(database.engine, "commit", on_commit)
+    assert response.status_code == 200
+    assert len(commits) == 1
+    assert len(statements) <= 6  # catalog version check, version bump, upsert, delete, readiness invalidation, select
+
+    saved = {s["skill_id"]: s["proficiency_level"] for s in response.json()}
+    assert saved == {p["skill_id"]: p["proficiency_level"] for p in profile}
+    assert {s["skill_id"]: s["proficiency_level"] for s in client.get("/users/1").json()["skills"]} == saved
+    assert client.get("/users/1", headers={"If-None-Match": etag}).status_code == 200
+
+    # A diff: one level changed, one skill added, two removed, everything else untouched
+    diff = {
+        "replace": False,
+        "skills": [{"skill_id": skills[0]["id"], "proficiency_level": 5},
+                   {"skill_id": skills[45]["id"], "proficiency_level": 3}],
+        "remove": [skills[1]["id"], skills[2]["id"]],
+    }
+    saved = {s["skill_id"]: s["proficiency_level"] for s in client.put("/users/1/skills", json=diff).json()}
+    assert len(saved) == 39
+    assert saved[skills[0]["id"]] == 5 and saved[skills[45]["id"]] == 3 and saved[skills[3]["id"]] == 4
+    assert skills[1]["id"] not in saved
+
+    # The talent matrix was patched in place with both writes
+    assert talent._matrix is matrix
+    row = matrix.row_of[1]
+    assert {sid: col[row] for sid, col in matrix._columns.items() if row in col} == saved
+
+    assert client.put("/users/1/skills", json={"skills": []}).json() == []
+    assert client.put("/users/999/skills", json={"skills": []}).status_code == 404
+    assert client.put("/users/1/skills", json={"skills": [{"skill_id": 9999, "proficiency_level": 1}]}).status_code == 422
+
+
+def test_chat_streams_the_same_answer_as_server_sent_events(client):
+    from bench_chat_stream import measure_json, measure_stream
+
+    role_id = next(r["id"] for r in client.get("/roles/").json() if r["title"] == "Data Scientist")
+    for message in ("hello", "What are my gaps?", "Data Scientist", "Why is my score low?"):
+        payload = {"user_id": 1, "role_id": role_id, "message": message}
+        expected = client.post("/assistant/chat", json=payload).json()
+        streamed = measure_stream(client, {**payload, "session_id": "stream"})
+
+        kinds = [event for event, _ in streamed["events"]]
+        assert kinds[0] == "intent" and kinds[-1] == "done"
+        assert " ".join(data["text"] for event, data in streamed["events"] if event == "section") == expected["response"]
+        actions = [a for event, data in streamed["events"] if event == "actions" for a in data["suggested_actions"]]
+        assert actions == expected["suggested_actions"]
+        assert streamed["first_event_ms"] <= streamed["first_section_ms"] <= streamed["last_event_ms"]
+        assert measure_json(client, payload) > 0
+
+    gaps = measure_stream(client, {"user_id": 1, "role_id": role_id, "message": "What are my gaps?"})
+    assert gaps["events"][0] == ("intent", {"intent": "gaps"})
+    assert sum(event == "section" for event, _ in gaps["events"]) == 2
+
+    missing = measure_stream(client, {"user_id": 999, "message": "Why is my score low?"})
+    assert [data for event, data in missing["events"] if event == "section"] == [{"text": "User not found."}]
+
+
+def test_cpu_bound_endpoints_run_off_the_event_loop(client, monkeypatch):
+    import asyncio
+    import threading
+
+    from app.services import catalog, intelligence, search, skill_suggest
+
+    threads = {}
+
+    def recording(name, fn):
+        def wrapper(*args, **kwargs):
+            try:
+                asyncio.get_running_loop()
+                threads[name] = "event loop"
+            except RuntimeError:
+                threads[name] = threading.current_thread().name
+            return fn(*args, **kwargs)
+        return wrapper
+
+    monkeypatch.setattr(intelligence, "get_role_recommendations",
+                        recording("recommend", intelligence.get_role_recommendations))
+    monkeypatch.setattr(intelligence, "simulate_batch", recording("simulate", intelligence.simulate_batch))
+    monkeypatch.setattr(catalog, "skills_response", recording("skills", catalog.skills_response))
+    monkeypatch.setattr(catalog, "get_catalog", recording("user", catalog.get_catalog))
+    monkeypatch.setattr(search, "search", recording("search", search.search))
+    monkeypatch.setattr(skill_suggest, "suggest", recording("suggest", skill_suggest.suggest))
+
+    assert client.get("/roles/recommend/1", params={"limit": 3}).status_code == 200
+    assert client.post("/roles/simulate/batch", json={"user_id": 1, "role_id": 1, "changes": []}).status_code in (200, 404)
+    assert client.get("/skills/").status_code == 200
+    assert client.get("/users/1").status_code == 200
+    assert client.get("/search/", params={"q": "python"}).status_code == 200
+    assert client.get("/skills/suggest", params={"q": "py"}).status_code == 200
+    assert set(threads) == {"recommend", "simulate", "skills", "user", "search", "suggest"}
+    assert "event loop" not in threads.values()
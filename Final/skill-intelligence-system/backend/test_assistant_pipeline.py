@@ -0,0 +1,66 @@
+import time
+
+from app import models, schemas
+from app.services import assistant, conversations, intelligence
+from app.services import catalog as catalog_cache
+from test_query_count import count_queries
+
+TURNS = [
+    ("greeting", "hello"),
+    ("projects", "Show me project ideas"),
+    ("score", "Why is my score low?"),
+    ("gaps", "What are my gaps?"),
+    ("improve", "How do I learn deep learning?"),
+    (None, "ok thanks"),
+]
+
+
+def test_each_intent_computes_only_what_it_needs(db, demo_user, catalog, monkeypatch):
+    monkeypatch.setattr(conversations.settings, "CATALOG_VERSION_CHECK_SECONDS", 3600.0)
+    role = db.query(models.JobRole).filter_by(title="Data Scientist").one()
+    assistant.generate_response(schemas.ChatRequest(user_id=demo_user.id, message="warm up", session_id="w"), db)
+
+    # No handler needs the full readiness report or resource lookups
+    def unexpected(*args, **kwargs):
+        raise AssertionError("full readiness computed by the assistant")
+    monkeypatch.setattr(intelligence, "calculate_readiness", unexpected)
+    monkeypatch.setattr(catalog_cache.CatalogSnapshot, "recommendations_for", unexpected)
+
+    rows = []
+    for intent, message in TURNS:
+        timings = {}
+        for phase in ("cold", "warm"):
+            request = schemas.ChatRequest(user_id=demo_user.id, role_id=role.id, message=message, session_id=intent)
+            with count_queries(db) as queries:
+                start = time.perf_counter()
+                reply = assistant.generate_response(request, db)
+                timings[phase] = (time.perf_counter() - start) * 1000, queries["n"]
+        context = conversations.cache.get(conversations.key(demo_user.id, intent), catalog_cache.get_catalog(db).version)
+        rows.append((intent, timings, context, reply))
+
+    print("\nintent      cold ms  queries   warm ms  queries")
+    for intent, timings, _, _ in rows:
+        (cold_ms, cold_q), (warm_ms, warm_q) = timings["cold"], timings["warm"]
+        print(f"{str(intent):<10} {cold_ms:8.3f} {cold_q:8d} {warm_ms:9.3f} {warm_q:8d}")
+
+    by_intent = {intent: (timings, context, reply) for intent, timings, context, reply in rows}
+    # Greetings and project pointers never touch the user or the role
+    for intent in ("greeting", "projects"):
+        timings, context, _ = by_intent[intent]
+        assert timings["cold"][1] == timings["warm"][1] == 0
+        assert context is None
+    # The others load the user once per conversation and compute only their own piece
+    for intent in ("score", "gaps", "improve", None):
+        timings, context, reply = by_intent[intent]
+        assert timings["cold"][1] > 0 and timings["warm"][1] == 0
+        assert reply.response != "User not found."
+    assert set(by_intent["score"][1].scores) == {role.id} and not by_intent["score"][1].gaps
+    assert set(by_intent["gaps"][1].gaps) == {role.id} and not by_intent["gaps"][1].scores
+    assert "**Data Scientist**" in by_intent[None][2].response
+
+
+def test_unknown_user_only_matters_to_handlers_that_need_one(db, catalog):
+    hello = assistant.generate_response(schemas.ChatRequest(user_id=999, message="hello"), db)
+    assert hello.response.startswith("Hello!")
+    score = assistant.generate_response(schemas.ChatRequest(user_id=999, message="Why is my score low?"), db)
+    assert score.response == "User not found."
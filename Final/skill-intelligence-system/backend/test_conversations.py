@@ -0,0 +1,73 @@
+from app import models, schemas
+from app.services import assistant, conversations, user_skills
+from app.services import catalog as catalog_cache
+from test_query_count import count_queries
+
+
+def chat(db, user, message, role_id=None, session_id="s1"):
+    request = schemas.ChatRequest(user_id=user.id, role_id=role_id, message=message, session_id=session_id)
+    return assistant.generate_response(request, db)
+
+
+def test_follow_up_turns_need_no_database_work(db, demo_user, catalog, monkeypatch):
+    monkeypatch.setattr(conversations.settings, "CATALOG_VERSION_CHECK_SECONDS", 3600.0)
+    role = db.query(models.JobRole).filter_by(title="Data Scientist").one()
+
+    with count_queries(db) as first:
+        chat(db, demo_user, "Why is my score low?", role_id=role.id)
+    assert first["n"] > 0
+
+    with count_queries(db) as follow_ups:
+        gaps = chat(db, demo_user, "What are my gaps?")
+        chat(db, demo_user, "How do I learn deep learning?")
+        chat(db, demo_user, "Why is my score low?", role_id=role.id)
+    assert follow_ups["n"] == 0
+    # The role carried over from the first turn
+    assert gaps.response.startswith("The most critical skills you are missing")
+
+    # Another conversation of the same user starts from scratch
+    with count_queries(db) as other:
+        assert "select a Job Role" in chat(db, demo_user, "Why is my score low?", session_id="s2").response
+    assert other["n"] > 0
+
+
+def test_skill_writes_drop_the_users_conversations(db, demo_user, catalog):
+    role = db.query(models.JobRole).filter_by(title="Data Scientist").one()
+    chat(db, demo_user, "Why is my score low?", role_id=role.id)
+    version = catalog_cache.get_catalog(db).version
+    before = conversations.cache.get(conversations.key(demo_user.id, "s1"), version)
+    assert before.scores[role.id][0] < 1.0
+
+    db.add(models.UserSkill(user_id=demo_user.id, skill_id=catalog["Deep Learning"].id, proficiency_level=5))
+    db.commit()
+    assert len(conversations.cache) == 0
+
+    chat(db, demo_user, "Why is my score low?", role_id=role.id)
+    assert len(conversations.cache) == 1
+    update = schemas.UserSkillsUpdate(skills=[], replace=True)
+    user_skills.set_user_skills(db, demo_user.id, update)
+    assert len(conversations.cache) == 0
+
+    # A rolled-back write keeps the context
+    chat(db, demo_user, "Why is my score low?", role_id=role.id)
+    db.add(models.UserSkill(user_id=demo_user.id, skill_id=catalog["Leadership"].id, proficiency_level=2))
+    db.flush()
+    db.rollback()
+    assert len(conversations.cache) == 1
+
+
+def test_cache_is_an_lru_with_ttl(monkeypatch):
+    cache = conversations.ConversationCache(max_entries=2, ttl_seconds=60)
+    for user_id in (1, 2, 3):
+        cache.put((user_id, ""), conversations.Context(user_id=user_id, catalog_version=1, user_skills_map={}))
+    assert cache.get((1, ""), 1) is None  # evicted
+    assert cache.get((2, ""), 1) is not None
+    cache.put((4, ""), conversations.Context(user_id=4, catalog_version=1, user_skills_map={}))
+    assert cache.get((3, ""), 1) is None  # 2 was used more recently
+    assert cache.get((2, ""), 2) is None  # built for another catalog version
+
+    cache.put((5, ""), conversations.Context(user_id=5, catalog_version=1, user_skills_map={}))
+    now = conversations.time.monotonic()
+    monkeypatch.setattr(conversations.time, "monotonic", lambda: now + 61)
+    assert cache.get((5, ""), 1) is None
+    assert len(cache) == 1
@@ -0,0 +1,42 @@
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app import database
+
+
+def pragma(conn, name):
+    return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def test_sqlite_profile_applied_on_connect(tmp_path):
+    engine = database.make_engine(f"sqlite:///{tmp_path / 'profile.db'}")
+    with engine.connect() as conn:
+        assert pragma(conn, "journal_mode") == "wal"
+        assert pragma(conn, "synchronous") == 1  # NORMAL
+        assert pragma(conn, "busy_timeout") == 5000
+        assert pragma(conn, "temp_store") == 2  # MEMORY
+        assert pragma(conn, "cache_size") == -65536
+    assert engine.pool.size() == database.settings.DB_POOL_SIZE
+    engine.dispose()
+
+    bare = database.make_engine(f"sqlite:///{tmp_path / 'bare.db'}", profile=False)
+    with bare.connect() as conn:
+        assert pragma(conn, "journal_mode") == "delete"
+    bare.dispose()
+
+
+def test_async_engine_uses_profile(tmp_path):
+    url = f"sqlite+aiosqlite:///{tmp_path / 'async.db'}"
+    engine = create_async_engine(url, **database.engine_options(url))
+    database.apply_sqlite_profile(engine.sync_engine)
+
+    async def check():
+        try:
+            async with engine.connect() as conn:
+                return (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+        finally:
+            await engine.dispose()
+
+    assert asyncio.run(check()) == "wal"
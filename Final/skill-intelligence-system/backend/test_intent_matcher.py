@@ -0,0 +1,40 @@
+import random
+
+from app import models, schemas
+from app.services import assistant, intent_matcher
+
+
+def test_automaton_finds_every_occurrence():
+    rng = random.Random(3)
+    patterns = {"".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(40)}
+    automaton = intent_matcher.AhoCorasick()
+    for p in patterns:
+        automaton.add(p, p)
+    automaton.build()
+    for _ in range(50):
+        text = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 30)))
+        expected = sorted((i, i + len(p), p) for p in patterns for i in range(len(text)) if text.startswith(p, i))
+        assert sorted(automaton.find(text)) == expected
+
+
+def test_scan_respects_word_boundaries_and_prefers_longest(db, catalog):
+    recognizer = intent_matcher.get_recognizer(db)
+    names = {skill.id: skill.name for skill in catalog.values()}
+    scan = lambda text: (lambda s: (s.intent, [names[i] for i in s.skill_ids]))(recognizer.scan(text))
+
+    # "hi" inside "this", "learn" inside "learning" are not keywords
+    assert scan("this is which") == (None, [])
+    assert scan("Tell me about  Machine   Learning") == (None, ["Machine Learning"])
+    assert scan("Hi! How do I learn Python?") == ("improve", ["Python Programming"])
+    assert scan("Gaps in AWS and sql?") == ("gaps", ["Cloud Computing (AWS)", "SQL & Databases"])
+    # A skill name is not read as the keyword it contains
+    assert scan("How can I improve Data Analysis?") == ("improve", ["Data Analysis"])
+    assert scan("why is my score low") == ("score", [])
+    assert recognizer is intent_matcher.get_recognizer(db)
+
+
+def test_learning_intent_targets_the_mentioned_gap(db, demo_user, catalog):
+    requirement = db.query(models.JobSkill).filter_by(skill_id=catalog["Deep Learning"].id).first()
+    request = schemas.ChatRequest(user_id=demo_user.id, role_id=requirement.job_role_id,
+                                  message="How do I learn deep learning?")
+    assert "To improve Deep Learning" in assistant.generate_response(request, db).response
@@ -0,0 +1,99 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app import migrations, models
+from app.database import Base
+
+NEW_INDEXES = [
+    "ix_user_skills_user_id_skill_id", "ix_user_skills_skill_id",
+    "ix_job_skills_job_role_id_skill_id", "ix_job_skills_skill_id",
+    "ix_project_skills_project_id_skill_id", "ix_project_skills_skill_id",
+]
+
+
+def query_plan(conn, query):
+    sql = str(query.statement.compile(conn, compile_kwargs={"literal_binds": True}))
+    return " | ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+
+def lookups(session):
+    return {
+        # users.add_skill_to_user / delete_user_skill
+        "user_skill": session.query(models.UserSkill).filter(
+            models.UserSkill.user_id == 1, models.UserSkill.skill_id == 2),
+        "role_requirements": session.query(models.JobSkill).filter(models.JobSkill.job_role_id == 1),
+        "project_skills": session.query(models.ProjectSkill).filter(models.ProjectSkill.project_id == 1),
+        "skill_holders": session.query(models.UserSkill).filter(models.UserSkill.skill_id == 2),
+    }
+
+
+@pytest.fixture
+def legacy_engine(tmp_path):
+    """A database in the pre-migration schema: association tables without the new indexes."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        for name in NEW_INDEXES:
+            conn.execute(text(f"DROP INDEX {name}"))
+        conn.execute(text("DROP TABLE schema_migrations"))
+        conn.execute(text("ALTER TABLE users DROP COLUMN version"))
+        conn.execute(text("ALTER TABLE users DROP COLUMN readiness_version"))
+        conn.execute(text("DROP TABLE user_role_readiness"))
+        conn.execute(text("INSERT INTO skills (id, name) VALUES (2, 'Python'), (3, 'SQL')"))
+        conn.execute(text("INSERT INTO job_roles (id, title) VALUES (1, 'Analyst')"))
+        # Pre-index add_skill_to_user kept updating the first row of a duplicated pair (1 -> level 3);
+        # id 3 is a stale duplicate that was never updated again
+        conn.execute(text(
+            "INSERT INTO user_skills (id, user_id, skill_id, proficiency_level) "
+            "VALUES (1, 1, 2, 3), (2, 1, 3, 4), (3, 1, 2, 1)"
+        ))
+        conn.execute(text(
+            "INSERT INTO job_skills (id, job_role_id, skill_id, required_level, importance_weight) "
+            "VALUES (1, 1, 2, 3, 1.0), (2, 1, 2, 4, 2.0)"
+        ))
+    yield engine
+    engine.dispose()
+
+
+def test_upgrade_adds_indexes_to_legacy_database(legacy_engine):
+    with legacy_engine.connect() as conn:
+        plans = {k: query_plan(conn, q) for k, q in lookups(Session(bind=conn)).items()}
+    assert all(plan.startswith("SCAN") for plan in plans.values())
+
+    assert migrations.upgrade(legacy_engine) == [1, 2, 3]
+
+    with legacy_engine.connect() as conn:
+        plans = {k: query_plan(conn, q) for k, q in lookups(Session(bind=conn)).items()}
+        # Duplicates collapse onto the lowest id, the row the app served and updated
+        assert conn.execute(text("SELECT id, proficiency_level FROM user_skills ORDER BY id")).all() == [(1, 3), (2, 4)]
+        assert conn.execute(text("SELECT id, required_level FROM job_skills")).all() == [(1, 3)]
+        # Deleting job_skills rows is a catalog write
+        assert conn.execute(text("SELECT version FROM catalog_version")).scalar() == 1
+        assert {"version", "readiness_version"} <= {row[1] for row in conn.execute(text("PRAGMA table_info(users)"))}
+        assert conn.execute(text("SELECT COUNT(*) FROM user_role_readiness")).scalar() == 0
+
+    assert "INDEX ix_user_skills_user_id_skill_id" in plans["user_skill"]
+    assert "INDEX ix_job_skills_job_role_id_skill_id" in plans["role_requirements"]
+    assert "INDEX ix_project_skills_project_id_skill_id" in plans["project_skills"]
+    assert "INDEX ix_user_skills_skill_id" in plans["skill_holders"]
+
+    with pytest.raises(IntegrityError):
+        with legacy_engine.begin() as conn:
+            conn.execute(text("INSERT INTO user_skills (user_id, skill_id, proficiency_level) VALUES (1, 2, 5)"))
+
+    assert migrations.upgrade(legacy_engine) == []
+    assert [applied for _, _, applied in migrations.status(legacy_engine)] == [True, True, True]
+
+
+def test_fresh_schema_matches_migrated_schema(db):
+    conn = db.connection()
+    plans = {k: query_plan(conn, q) for k, q in lookups(db).items()}
+    assert "INDEX ix_user_skills_user_id_skill_id" in plans["user_skill"]
+    assert "INDEX ix_job_skills_job_role_id_skill_id" in plans["role_requirements"]
+
+    # Migrations are no-ops on a database create_all has just built
+    assert migrations.upgrade(db.get_bind()) == [1, 2, 3]
+    indexes = {row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'"))}
+    assert set(NEW_INDEXES) <= indexes
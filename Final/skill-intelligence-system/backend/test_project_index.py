@@ -0,0 +1,51 @@
+from app import models
+from app.services import intelligence
+
+
+def legacy_recommendations(user, db):
+    # The original full-scan algorithm
+    user_skill_ids = {us.skill_id for us in user.skills}
+    results = []
+    for proj in db.query(models.Project).all():
+        req_skills = proj.required_skills
+        match_count = sum(1 for ps in req_skills if ps.skill_id in user_skill_ids)
+        if req_skills and match_count > 0:
+            results.append((proj.id, match_count / len(req_skills), match_count))
+    results.sort(key=lambda x: x[1], reverse=True)
+    return results
+
+
+def add_user(db, catalog, skills):
+    user = models.User(full_name="Maker", email="maker@skills.ai")
+    db.add(user)
+    db.flush()
+    for name, level in skills:
+        db.add(models.UserSkill(user_id=user.id, skill_id=catalog[name].id, proficiency_level=level))
+    db.commit()
+    return user
+
+
+def test_default_relevance_matches_full_scan(db, catalog):
+    user = add_user(db, catalog, [("IoT Systems", 3), ("Docker & Kubernetes", 2), ("Python Programming", 4),
+                                  ("Machine Learning", 2), ("React.js", 5)])
+
+    expected = legacy_recommendations(user, db)
+    results = intelligence.get_project_recommendations(user.id, db)
+    assert [(p.id, p.relevance_score, p.match_count) for p in results] == expected
+
+    page = intelligence.get_project_recommendations(user.id, db, limit=2, offset=1)
+    assert [p.id for p in page] == [p[0] for p in expected[1:3]]
+
+
+def test_relevance_modes(db, catalog):
+    user = add_user(db, catalog, [("IoT Systems", 5), ("Embedded Systems", 1)])
+
+    by_overlap = intelligence.get_project_recommendations(user.id, db)
+    by_proficiency = intelligence.get_project_recommendations(user.id, db, relevance="proficiency")
+    by_difficulty = intelligence.get_project_recommendations(user.id, db, relevance="difficulty")
+
+    assert {p.id for p in by_overlap} == {p.id for p in by_proficiency} == {p.id for p in by_difficulty}
+    for p in by_proficiency:
+        assert 0 < p.relevance_score <= 1
+    for p in by_difficulty:
+        assert p.relevance_score <= next(o.relevance_score for o in by_overlap if o.id == p.id)
@@ -0,0 +1,121 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app import models
+from app.services import catalog, intelligence
+
+
+@contextmanager
+def count_queries(db):
+    counter = {"n": 0}
+
+    def _count(conn, cursor, statement, parameters, context, executemany):
+        counter["n"] += 1
+
+    bind = db.get_bind()
+    event.listen(bind, "before_cursor_execute", _count)
+    try:
+        yield counter
+    finally:
+        event.remove(bind, "before_cursor_execute", _count)
+
+
+def add_roles(db, skills, start, count):
+    for i in range(start, start + count):
+        role = models.JobRole(title=f"Role {i}", domain="Synthetic")
+        db.add(role)
+        db.flush()
+        for j in range(5):
+            skill = skills[(i + j * 7) % len(skills)]
+            db.add(models.JobSkill(job_role_id=role.id, skill_id=skill.id, required_level=3, importance_weight=1.5))
+    db.commit()
+
+
+def setup_catalog(db):
+    skills = [models.Skill(name=f"Skill {i}", category="Technical") for i in range(40)]
+    db.add_all(skills)
+    db.flush()
+    for s in skills:
+        for k in range(2):
+            db.add(models.LearningResource(title=f"{s.name} course {k}", type="Course",
+                                           provider="Internal", skill_id=s.id, difficulty_level=k + 1))
+    user = models.User(full_name="Query Counter", email="qc@skills.ai")
+    db.add(user)
+    db.flush()
+    for s in skills[:6]:
+        db.add(models.UserSkill(user_id=user.id, skill_id=s.id, proficiency_level=2))
+    db.commit()
+    return skills, user
+
+
+def recommendation_queries(db, user_id):
+    db.expire_all()
+    catalog.invalidate()
+    with count_queries(db) as cold:
+        results = intelligence.get_role_recommendations(user_id, db)
+    db.expire_all()
+    with count_queries(db) as warm:
+        intelligence.get_role_recommendations(user_id, db)
+    return cold["n"], warm["n"], results
+
+
+def test_recommend_query_count_is_constant(db):
+    skills, user = setup_catalog(db)
+
+    add_roles(db, skills, 0, 10)
+    cold_small, warm_small, results = recommendation_queries(db, user.id)
+    assert len(results) == 10
+    assert any(g.recommended_resources for r in results for g in r.gaps)
+
+    add_roles(db, skills, 10, 190)
+    cold_large, warm_large, results = recommendation_queries(db, user.id)
+    assert len(results) == 200
+
+    assert cold_large == cold_small
+    assert warm_large == warm_small
+    # The user, their skills, and the indexed read of their materialized readiness rows
+    assert warm_large == 3
+
+
+def test_calculate_readiness_makes_no_per_gap_queries(db):
+    skills, user = setup_catalog(db)
+    add_roles(db, skills, 0, 1)
+    role = catalog.get_catalog(db).roles[0]
+
+    with count_queries(db) as counter:
+        readiness = intelligence.calculate_readiness({}, role, db)
+    assert readiness.missing_skill_count == 5
+    assert counter["n"] == 0
+
+
+def test_snapshot_refreshes_on_commit(db):
+    skills, _ = setup_catalog(db)
+    snapshot = catalog.get_catalog(db)
+    assert len(snapshot.recommendations_for(skills[0].id)) == 2
+    assert catalog.get_catalog(db) is snapshot
+
+    db.add(models.LearningResource(title="New course", type="Course", provider="Internal",
+                                   skill_id=skills[0].id, difficulty_level=1))
+    db.commit()
+    refreshed = catalog.get_catalog(db)
+    assert refreshed.version > snapshot.version
+    assert len(refreshed.recommendations_for(skills[0].id)) == 3
+    assert len(snapshot.recommendations_for(skills[0].id)) == 2
+
+
+def test_snapshot_sees_writes_from_other_processes(db, monkeypatch):
+    skills, _ = setup_catalog(db)
+    snapshot = catalog.get_catalog(db)
+
+    # Simulate seed.py committing in another process: version bumped, no local event
+    catalog.bump_version(db.connection())
+    db.execute(models.Skill.__table__.insert().values(name="Out of band", category="Technical"))
+    db.commit()
+    assert catalog.get_catalog(db) is snapshot
+
+    monkeypatch.setattr(catalog.settings, "CATALOG_VERSION_CHECK_SECONDS", 0.0)
+    refreshed = catalog.get_catalog(db)
+    assert refreshed.version == snapshot.version + 1
+    assert len(refreshed.skills) == len(skills) + 1
+    assert catalog.stats()["misses"] >= 2
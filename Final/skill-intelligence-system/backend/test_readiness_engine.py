@@ -0,0 +1,157 @@
+import pytest
+from pydantic import ValidationError
+
+from app import models, schemas
+from app.services import intelligence, readiness_engine
+
+
+def test_engine_matches_calculate_readiness(db, demo_user):
+    user_skills_map = {us.skill_id: us.proficiency_level for us in demo_user.skills}
+
+    expected = {}
+    for role in db.query(models.JobRole).all():
+        expected[role.id] = intelligence.calculate_readiness(user_skills_map, role, db)
+
+    results = intelligence.get_role_recommendations(demo_user.id, db)
+    assert len(results) == len(expected)
+
+    scores = [r.readiness_score for r in results]
+    assert scores == sorted(scores, reverse=True)
+
+    for r in results:
+        legacy = expected[r.role_id]
+        assert abs(r.readiness_score - legacy.readiness_score) < 1e-9
+        assert r.missing_skill_count == legacy.missing_skill_count
+        assert r.role_title == legacy.role_title
+        assert [g.model_dump() for g in r.gaps] == [g.model_dump() for g in legacy.gaps]
+
+
+def test_engine_edge_cases():
+    engine = readiness_engine.ReadinessEngine([
+        (1, "Empty", "X", []),
+        (2, "Single", "X", [(10, "A", 3, 2.0)]),
+        (3, "Pair", "Y", [(10, "A", 2, 1.0), (11, "B", 4, 1.5)]),
+    ])
+
+    scores, missing = engine.score({})
+    assert scores.tolist() == [1.0, 0.0, 0.0]
+    assert missing.tolist() == [0, 1, 2]
+
+    scores, missing = engine.score({10: 5, 11: 4, 99: 3})
+    assert scores.tolist() == [1.0, 1.0, 1.0]
+    assert missing.tolist() == [0, 0, 0]
+
+    scores, missing = engine.score({10: 1, 11: 2})
+    # Pair: gap 1*1.0 + 2*1.5 = 4.0 out of 2*1.0 + 4*1.5 = 8.0
+    assert abs(scores[2] - 0.5) < 1e-12
+    assert missing.tolist() == [0, 1, 2]
+
+
+def test_requirements_are_stored_sparsely_and_repeats_add_up():
+    engine = readiness_engine.ReadinessEngine([
+        (1, "Repeat", "X", [(10, "A", 3, 1.0), (11, "B", 2, 1.0), (10, "A", 5, 2.0)]),
+        (2, "Wide", "X", [(skill_id, "S", 1, 1.0) for skill_id in range(100, 1100)]),
+    ])
+    # One stored entry per requirement, nothing per (role, skill) pair
+    assert len(engine.col_roles) == 1003 and len(engine.col_ptr) == len(engine.skill_col) + 1
+    # The repeated skill counts twice, as it does for readiness_for(): in the total, the gap and the missing count
+    repeat = [(10, 3, 1.0), (11, 2, 1.0), (10, 5, 2.0)]
+    for levels in ({}, {10: 3}, {10: 4, 11: 2}, {10: 5, 11: 2}):
+        scores, missing = engine.score(levels)
+        assert scores[0] == pytest.approx(readiness_engine.readiness_for(repeat, levels), abs=1e-12)
+        assert missing[0] == sum(1 for skill_id, level, _ in repeat if level > levels.get(skill_id, 0))
+    assert engine.total_possible_weight[0] == 3 + 2 + 10
+    rows, required, weight = engine.column(10)
+    assert rows.tolist() == [0, 0] and required.tolist() == [3, 5] and weight.tolist() == [1.0, 2.0]
+
+def test_top_matches_full_ranking(db, demo_user):
+    full = intelligence.get_role_recommendations(demo_user.id, db)
+
+    top = intelligence.get_role_recommendations(demo_user.id, db, limit=3)
+    assert [r.role_id for r in top] == [r.role_id for r in full[:3]]
+
+    summary = intelligence.get_role_recommendations(demo_user.id, db, limit=5, include_gaps=False)
+    assert [r.role_id for r in summary] == [r.role_id for r in full[:5]]
+    assert all(r.gaps == [] for r in summary)
+
+    domain = full[-1].domain
+    filtered = intelligence.get_role_recommendations(demo_user.id, db, domain=domain.upper())
+    assert [r.role_id for r in filtered] == [r.role_id for r in full if r.domain == domain]
+    assert intelligence.get_role_recommendations(demo_user.id, db, domain="No Such Domain") == []
+
+    threshold = full[len(full) // 2].readiness_score
+    above = intelligence.get_role_recommendations(demo_user.id, db, min_readiness=threshold)
+    assert [r.role_id for r in above] == [r.role_id for r in full if r.readiness_score >= threshold]
+
+
+def test_top_breaks_ties_in_catalog_order():
+    roles = [(i, f"Role {i}", "X", [(1, "A", 2, 1.0)]) for i in range(1, 11)]
+    roles.append((11, "Better", "X", [(2, "B", 1, 1.0)]))
+    engine = readiness_engine.ReadinessEngine(roles)
+
+    order, scores, _ = engine.top({1: 1, 2: 1}, limit=4)
+    assert engine.role_ids[order].tolist() == [11, 1, 2, 3]
+
+
+def test_batch_simulation_matches_calculate_readiness(db, demo_user, catalog):
+    role = db.query(models.JobRole).filter(models.JobRole.title == "AgriTech Data Specialist").first()
+    user_skills_map = {us.skill_id: us.proficiency_level for us in demo_user.skills}
+    changes = [
+        schemas.SkillChange(skill_id=catalog["Data Analysis"].id, target_level=4),
+        schemas.SkillChange(skill_id=catalog["Remote Sensing"].id, target_level=2),
+        schemas.SkillChange(skill_id=catalog["React.js"].id, target_level=1),
+    ]
+    request = schemas.BatchSimulationRequest(user_id=demo_user.id, role_id=role.id, changes=changes, plan=changes)
+
+    response = intelligence.simulate_batch(request, db)
+
+    base = intelligence.calculate_readiness(user_skills_map, role, db).readiness_score
+    assert response.current_readiness == base
+    for change, result in zip(changes, response.results):
+        expected = intelligence.calculate_readiness({**user_skills_map, change.skill_id: change.target_level}, role, db)
+        assert result.new_readiness == expected.readiness_score
+        assert result.improvement == expected.readiness_score - base
+    # React.js is not required by this role
+    assert response.results[2].improvement == 0.0
+
+    plan_map = {**user_skills_map, **{c.skill_id: c.target_level for c in changes}}
+    assert response.plan_readiness == intelligence.calculate_readiness(plan_map, role, db).readiness_score
+
+    missing = schemas.BatchSimulationRequest(user_id=demo_user.id, role_id=role.id,
+                                             changes=[schemas.SkillChange(skill_id=9999, target_level=3)])
+    assert intelligence.simulate_batch(missing, db) is None
+
+    for level in (-1, 6):
+        with pytest.raises(ValidationError):
+            schemas.SkillChange(skill_id=catalog["SQL & Databases"].id, target_level=level)
+
+
+def test_learning_plan_is_greedy_and_reaches_full_readiness(db, demo_user, catalog):
+    role = db.query(models.JobRole).filter(models.JobRole.title == "AgriTech Data Specialist").first()
+    user_skills_map = {us.skill_id: us.proficiency_level for us in demo_user.skills}
+    base = intelligence.calculate_readiness(user_skills_map, role, db)
+
+    plan = intelligence.get_learning_plan(demo_user.id, role.id, db)
+    assert plan.current_readiness == base.readiness_score
+    assert len(plan.steps) == sum(g.gap for g in base.gaps)
+    assert plan.final_readiness == 1.0
+
+    gains = [s.gain for s in plan.steps]
+    assert gains == sorted(gains, reverse=True)
+
+    # Replaying the plan step by step agrees with a full recomputation
+    levels = dict(user_skills_map)
+    for step in plan.steps:
+        assert levels.get(step.skill_id, 0) == step.from_level
+        levels[step.skill_id] = step.to_level
+        expected = intelligence.calculate_readiness(levels, role, db).readiness_score
+        assert abs(step.readiness_after - expected) < 1e-9
+
+    capped = intelligence.get_learning_plan(demo_user.id, role.id, db, budget=3)
+    assert [s.model_dump() for s in capped.steps] == [s.model_dump() for s in plan.steps[:3]]
+
+
+def test_plan_steps_prefers_skills_closest_to_done():
+    reqs = [(1, 4, 2.0), (2, 2, 2.0), (3, 5, 1.0)]
+    current, steps = readiness_engine.plan_steps(reqs, {1: 1, 2: 1}, budget=2)
+    assert [(s[0], s[1], s[2]) for s in steps] == [(2, 1, 2), (1, 1, 2)]
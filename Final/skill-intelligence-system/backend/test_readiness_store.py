@@ -0,0 +1,146 @@
+import pytest
+from sqlalchemy import event, text
+
+from app import models, schemas
+from app.services import intelligence, readiness_engine, user_skills
+from app.services import catalog as catalog_cache
+
+
+def stored(db, user_id):
+    rows = db.execute(text(
+        "SELECT role_id, readiness_score, missing_skill_count, weighted_gap, covered_weight "
+        "FROM user_role_readiness WHERE user_id = :u ORDER BY role_id"), {"u": user_id}).all()
+    return {r[0]: tuple(r[1:]) for r in rows}
+
+
+def expected(db, user_id):
+    """What a from-scratch build would store, straight from the engine."""
+    levels = dict(db.query(models.UserSkill.skill_id, models.UserSkill.proficiency_level)
+                  .filter(models.UserSkill.user_id == user_id).all())
+    engine = readiness_engine.get_engine(db)
+    covered, missing, gap, readiness = engine.components(levels)
+    return {role_id: (readiness[i], missing[i], gap[i], covered[i])
+            for i, role_id in enumerate(engine.role_ids.tolist())}
+
+
+def assert_matches(actual, wanted):
+    assert actual.keys() == wanted.keys()
+    for role_id, row in actual.items():
+        assert row[1] == wanted[role_id][1]
+        assert row[0] == pytest.approx(wanted[role_id][0], abs=1e-12)
+        assert row[2] == pytest.approx(wanted[role_id][2], abs=1e-9)
+        assert row[3] == pytest.approx(wanted[role_id][3], abs=1e-9)
+
+
+def test_rows_are_built_once_and_read_in_index_order(db, demo_user):
+    assert stored(db, demo_user.id) == {}
+    results = intelligence.get_role_recommendations(demo_user.id, db)
+    assert_matches(stored(db, demo_user.id), expected(db, demo_user.id))
+    assert db.get(models.User, demo_user.id).readiness_version == catalog_cache.get_catalog(db).version
+
+    engine = readiness_engine.get_engine(db)
+    order, scores, _ = engine.rank({us.skill_id: us.proficiency_level for us in demo_user.skills})
+    assert [r.role_id for r in results] == engine.role_ids[order].tolist()
+
+    # A read never commits (or rolls back) the caller's session: the rebuild has a session of its own
+    db.get(models.User, demo_user.id).readiness_version = None
+    db.commit()
+    ends = []
+    event.listen(db, "after_commit", lambda session: ends.append("commit"))
+    event.listen(db, "after_rollback", lambda session: ends.append("rollback"))
+    intelligence.get_role_recommendations(demo_user.id, db)
+    assert ends == []
+    assert db.get(models.User, demo_user.id).readiness_version == catalog_cache.get_catalog(db).version
+
+    plan = " | ".join(row[-1] for row in db.execute(text(
+        "EXPLAIN QUERY PLAN SELECT role_id FROM user_role_readiness WHERE user_id = 1 "
+        "ORDER BY readiness_score DESC, role_id LIMIT 5")))
+    assert "INDEX ix_user_role_readiness_rank" in plan and "TEMP B-TREE" not in plan
+
+
+def test_skill_writes_update_only_the_roles_that_need_the_skill(db, demo_user, catalog):
+    intelligence.get_role_recommendations(demo_user.id, db)
+    skill = catalog["IoT Systems"]
+    needing = {js.job_role_id for js in db.query(models.JobSkill).filter(models.JobSkill.skill_id == skill.id)}
+    assert 0 < len(needing) < len(stored(db, demo_user.id))
+
+    before = stored(db, demo_user.id)
+    updates = []
+    on_execute = lambda conn, cursor, statement, params, context, many: \
+        updates.append(params) if statement.startswith("UPDATE user_role_readiness") else None
+    event.listen(db.get_bind(), "before_cursor_execute", on_execute)
+    try:
+        us = models.UserSkill(user_id=demo_user.id, skill_id=skill.id, proficiency_level=2)
+        db.add(us)
+        db.commit()
+        # One executemany with a row per role that needs the skill; every other row is untouched
+        assert len(updates[0]) == len(needing)
+        after = stored(db, demo_user.id)
+        assert {role_id for role_id in after if after[role_id] != before[role_id]} <= needing
+        assert_matches(stored(db, demo_user.id), expected(db, demo_user.id))
+
+        db.refresh(us)
+        us.proficiency_level = 5
+        db.commit()
+        assert_matches(stored(db, demo_user.id), expected(db, demo_user.id))
+
+        python = db.query(models.UserSkill).filter_by(user_id=demo_user.id, skill_id=catalog["Python Programming"].id).one()
+        db.delete(python)
+        db.delete(us)
+        db.commit()
+        assert_matches(stored(db, demo_user.id), expected(db, demo_user.id))
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", on_execute)
+    # No rebuild was needed: the deltas kept the rows current
+    assert len(updates) == 3
+    assert db.get(models.User, demo_user.id).readiness_version == catalog_cache.get_catalog(db).version
+
+    # Without the old level loaded there is no delta to apply; the user's rows go stale instead
+    stale = db.get(models.User, demo_user.id).skills[0]
+    db.expire(stale, ["proficiency_level"])
+    stale.proficiency_level = 1
+    db.commit()
+    assert db.get(models.User, demo_user.id).readiness_version is None
+
+    levels = {us.skill_id: us.proficiency_level for us in db.get(models.User, demo_user.id).skills}
+    engine = readiness_engine.get_engine(db)
+    order, _, _ = engine.rank(levels)
+    results = intelligence.get_role_recommendations(demo_user.id, db, limit=5)
+    assert [r.role_id for r in results] == engine.role_ids[order[:5]].tolist()
+
+
+def test_bulk_writes_and_catalog_changes_rebuild_lazily(db, demo_user, catalog):
+    intelligence.get_role_recommendations(demo_user.id, db)
+
+    update = schemas.UserSkillsUpdate(skills=[{"skill_id": catalog["IoT Systems"].id, "proficiency_level": 4}])
+    user_skills.set_user_skills(db, demo_user.id, update)
+    assert db.get(models.User, demo_user.id).readiness_version is None
+    intelligence.get_role_recommendations(demo_user.id, db, limit=1)
+    assert_matches(stored(db, demo_user.id), expected(db, demo_user.id))
+
+    role = models.JobRole(title="IoT Integrator", domain="IoT Lab")
+    db.add(role)
+    db.flush()
+    db.add(models.JobSkill(job_role_id=role.id, skill_id=catalog["IoT Systems"].id,
+                           required_level=4, importance_weight=1.0))
+    db.commit()
+    best = intelligence.get_role_recommendations(demo_user.id, db, limit=1, domain="iot lab")
+    assert [(r.role_id, r.readiness_score) for r in best] == [(role.id, 1.0)]
+    # The catalog write made the rows stale; the read rebuilt them, new role included
+    assert_matches(stored(db, demo_user.id), expected(db, demo_user.id))
+
+
+def test_writes_through_a_lagging_snapshot_invalidate_instead_of_skipping(db, demo_user, catalog):
+    intelligence.get_role_recommendations(demo_user.id, db)
+    snapshot = catalog_cache.get_catalog(db)
+    # Another process already rebuilt this user's rows for a newer catalog this one hasn't seen
+    db.execute(text("UPDATE users SET readiness_version = :v WHERE id = :u"),
+               {"v": snapshot.version + 1, "u": demo_user.id})
+    db.commit()
+
+    db.add(models.UserSkill(user_id=demo_user.id, skill_id=catalog["IoT Systems"].id, proficiency_level=3))
+    db.commit()
+    # The delta skipped the rows (wrong version); they must not keep the newer stamp
+    assert db.get(models.User, demo_user.id).readiness_version is None
+    intelligence.get_role_recommendations(demo_user.id, db, limit=1)
+    assert_matches(stored(db, demo_user.id), expected(db, demo_user.id))
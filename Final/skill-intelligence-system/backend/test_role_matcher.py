@@ -0,0 +1,79 @@
+from app import models, schemas
+from app.services import assistant, role_matcher
+from app.services import catalog as catalog_cache
+
+
+def titles(db):
+    return {role.id: role.title for role in catalog_cache.get_catalog(db).roles}
+
+
+def test_matches_by_idf_weighted_title_tokens(db, catalog):
+    matcher = role_matcher.get_matcher(db)
+    by_id = titles(db)
+    match = lambda text: by_id.get(matcher.match(text))
+
+    assert match("What about Data Scientist?") == "Data Scientist"
+    assert match("tell me about the clinical data analyst role") == "Clinical Data Analyst"
+    # Same score for every "... Scientist"; the shorter, better-covered title wins
+    assert match("scientist") == "Data Scientist"
+    assert match("ui/ux") == "UI/UX Designer"
+    # "data" is in too many titles to pick a role by itself
+    assert match("data") is None
+    assert match("Why is my score low?") is None
+    assert match("") is None
+
+
+def test_typos_are_corrected_through_the_trigram_index(db, catalog):
+    matcher = role_matcher.get_matcher(db)
+    by_id = titles(db)
+    assert matcher.correct("scientst") == "scientist"
+    assert matcher.correct("analist") == "analyst"
+    assert matcher.correct("learn") is None
+    assert by_id[matcher.match("bioinformatcs specialist")] == "Bioinformatics Specialist"
+
+    assert role_matcher.within_distance("kitten", "sitting", 3)
+    assert not role_matcher.within_distance("kitten", "sitting", 2)
+
+
+def test_only_roles_sharing_a_token_are_scored():
+    # Thousands of roles, but "quantum" is in two titles: only those two are ever scored
+    roles = [(i, f"Engineer {i}") for i in range(1, 5001)]
+    roles += [(9001, "Quantum Research Engineer"), (9002, "Quantum Engineer")]
+    matcher = role_matcher.RoleMatcher(roles)
+    assert len(matcher.postings["quantum"]) == 2
+    # Equal scores: the title with less left unmentioned wins, then catalog order
+    assert matcher.match("quantum engineer") == 9002
+    assert matcher.match("quantum") == 9002
+    assert matcher.match("engineer") is None
+    twins = role_matcher.RoleMatcher([(1, "Data Engineer"), (2, "Engineer Data"), (3, "Web Developer")])
+    assert twins.match("data engineer") == 1
+
+def test_small_catalogs_match_a_title_word():
+    for roles in ([(1, "DevOps")], [(1, "DevOps"), (2, "Data Analyst")],
+                  [(1, "DevOps Engineer"), (2, "Data Engineer"), (3, "Web Engineer"), (4, "QA Engineer")]):
+        matcher = role_matcher.RoleMatcher(roles)
+        assert matcher.match("devops") == 1
+        assert matcher.match("tell me about devops please") == 1
+    # A word every title shares still names none of them
+    assert matcher.match("engineer") is None
+
+def test_matcher_is_rebuilt_with_the_catalog(db, catalog):
+    matcher = role_matcher.get_matcher(db)
+    assert role_matcher.get_matcher(db) is matcher
+    assert matcher.match("prompt engineer") is not None  # any Engineer for now
+
+    db.add(models.JobRole(title="Prompt Engineer", domain="AI"))
+    db.commit()
+    rebuilt = role_matcher.get_matcher(db)
+    assert rebuilt is not matcher
+    assert titles(db)[rebuilt.match("prompt engineer")] == "Prompt Engineer"
+
+
+def test_assistant_switches_to_the_role_named_in_the_message(db, demo_user):
+    reply = assistant.generate_response(
+        schemas.ChatRequest(user_id=demo_user.id, message="What about Clinical Data Analyst?"), db)
+    assert "**Clinical Data Analyst**" in reply.response
+
+    # A new conversation: no role carried over, and "data" alone names none
+    reply = assistant.generate_response(schemas.ChatRequest(user_id=demo_user.id, message="data", session_id="2"), db)
+    assert "switched context" not in reply.response
@@ -0,0 +1,109 @@
+import numpy as np
+
+from app import models
+from app.services import search
+from app.services import catalog as catalog_cache
+
+
+def hits(db, q, **kwargs):
+    return [(h.kind, h.title) for h in search.search(db, q, **kwargs)]
+
+
+def test_ranks_catalog_entries_by_cosine(db, catalog):
+    assert hits(db, "python")[0] == ("skill", "Python Programming")
+    assert hits(db, "data scientist")[0] == ("role", "Data Scientist")
+    # Typos and partial words still match through trigrams
+    assert hits(db, "kubernets")[0] == ("skill", "Docker & Kubernetes")
+    assert ("resource", "Machine Learning by Andrew Ng") in hits(db, "machine learning course")
+
+    assert all(kind == "resource" for kind, _ in hits(db, "machine learning", kind="resource"))
+    assert len(hits(db, "learning", limit=3)) == 3
+    assert hits(db, "zzzz qqqq") == [] and hits(db, "") == []
+
+    results = search.search(db, "machine learning")
+    assert [h.score for h in results] == sorted((h.score for h in results), reverse=True)
+    assert 0 < results[-1].score <= results[0].score <= 1.0
+
+
+def same_results(patched, fresh):
+    for q in ("python", "deep learning", "kubernets", "cloud", "rust"):
+        a, b = patched.search(q, limit=20), fresh.search(q, limit=20)
+        assert [patched.docs[p].key for p, _ in a] == [fresh.docs[p].key for p, _ in b]
+        assert np.allclose([s for _, s in a], [s for _, s in b])
+
+
+def test_index_is_patched_in_the_background_on_catalog_change(db, catalog, monkeypatch):
+    started = []
+
+    class InlineThread:
+        def __init__(self, target, args, **kwargs):
+            self.run = lambda: target(*args)
+
+        def start(self):
+            started.append(self)
+            self.run()
+
+    index = search.get_index(db)
+    assert search.get_index(db) is index
+    assert len(index.segments) == 1
+
+    db.add(models.Skill(name="Rust Programming", category="Technical"))
+    db.commit()
+    # A build already running: the previous index keeps being served, no second build is started
+    with search._build_lock:
+        monkeypatch.setattr(search.threading, "Thread", InlineThread)
+        assert search.get_index(db) is index
+        assert started == []
+    # Otherwise the previous index is served while the next one is built (inline here), then swapped in
+    assert search.get_index(db) is index
+    assert len(started) == 1
+    patched = search.get_index(db)
+    assert patched is not index and patched.version == catalog_cache.get_catalog(db).version
+    # Only the new document was analyzed, into a segment of its own; the old postings are shared
+    assert patched.analyzed == 1 and patched.reused == len(index.docs)
+    assert patched.segments[0] is index.segments[0] and len(patched.segments) == 2
+    assert hits(db, "rust")[0] == ("skill", "Rust Programming")
+    same_results(patched, search.SearchIndex(search.documents(catalog_cache.get_catalog(db))))
+
+    # An edit tombstones the old slot and re-analyzes just that document
+    rust = db.query(models.Skill).filter_by(name="Rust Programming").one()
+    rust.name = "Rust Systems Programming"
+    db.commit()
+    search.get_index(db)
+    edited = search.get_index(db)
+    assert edited.analyzed == 1 and len(edited.segments) == 3
+    assert [t for k, t in hits(db, "rust")].count("Rust Systems Programming") == 1
+    assert ("skill", "Rust Programming") not in hits(db, "rust")
+
+    db.delete(rust)
+    db.commit()
+    search.get_index(db)
+    # A deletion is only a tombstone: no document analyzed, no new segment
+    assert search.get_index(db).analyzed == 0 and len(search.get_index(db).segments) == 3
+    assert ("skill", "Rust Systems Programming") not in hits(db, "rust")
+    # Same results as an index built from scratch
+    same_results(search.get_index(db), search.SearchIndex(search.documents(catalog_cache.get_catalog(db))))
+
+
+def test_segments_merge_once_tombstones_pile_up(db, catalog):
+    snapshot = catalog_cache.get_catalog(db)
+    docs = search.documents(snapshot)
+    index = search.SearchIndex(docs)
+    edited = list(docs)
+    for i in range(0, len(docs), 2):
+        edited[i] = search.Document(docs[i].kind, docs[i].id, docs[i].title + " edited", docs[i].subtitle, docs[i].body)
+    merged = search.SearchIndex(edited, index)
+    # Half the slots are tombstones: the segments are merged and the slots compacted
+    assert merged.analyzed == len(range(0, len(docs), 2))
+    assert len(merged.segments) == 1 and len(merged.vectors) == len(edited)
+    same_results(merged, search.SearchIndex(edited))
+
+
+def test_search_endpoint(client):
+    results = client.get("/search/", params={"q": "react", "limit": 2}).json()
+    assert results[0]["kind"] == "skill" and results[0]["title"] == "React.js"
+    assert len(results) <= 2
+    roles = client.get("/search/", params={"q": "engineer", "kind": "role"}).json()
+    assert roles and all(r["kind"] == "role" for r in roles)
+    assert client.get("/search/", params={"q": "x", "kind": "user"}).status_code == 422
+    assert client.get("/search/", params={"q": ""}).status_code == 422
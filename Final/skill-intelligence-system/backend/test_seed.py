@@ -0,0 +1,116 @@
+import io
+import json
+
+import pytest
+from sqlalchemy import text
+
+from app import database, migrations
+from app.services import catalog
+from seed_data import seed
+
+
+def test_iter_sections_matches_json_load():
+    with open(seed.DATA_FILE) as f:
+        data = json.load(f)
+    with open(seed.DATA_FILE) as f:
+        # A tiny chunk size splits strings, numbers and literals across reads
+        items = list(seed.iter_sections(f, chunk_size=7))
+    assert items == [(key, item) for key, values in data.items() for item in values]
+
+    doc = '{"meta": {"v": 1}, "skills": [], "n": [12345, true, null, -1.5e3]}'
+    assert list(seed.iter_sections(io.StringIO(doc), chunk_size=3)) == [
+        ("n", 12345), ("n", True), ("n", None), ("n", -1500.0)
+    ]
+    with pytest.raises(ValueError):
+        list(seed.iter_sections(io.StringIO('{"skills": [{"name": "A"}'), chunk_size=4))
+
+
+@pytest.fixture
+def target(tmp_path):
+    engine = database.make_engine(f"sqlite:///{tmp_path / 'seed.db'}")
+    migrations.upgrade(engine)
+    yield engine
+    engine.dispose()
+    catalog.invalidate()
+
+
+def counts(stats):
+    return {name: (s.inserted, s.updated, s.unchanged, s.skipped) for name, s in stats.items()}
+
+
+def catalog_version(engine):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT version FROM catalog_version")).scalar()
+
+
+def test_seed_is_bulk_and_idempotent(target, tmp_path):
+    with open(seed.DATA_FILE) as f:
+        data = json.load(f)
+
+    first = counts(seed.seed(seed.DATA_FILE, target, batch_size=8))
+    assert first["skills"] == (50, 0, 0, 0)
+    assert first["resources"] == (31, 0, 0, 0)
+    assert first["roles"] == (17, 0, 0, 0)
+    # One project references "C++", which is not in the skill list; the project is kept without it
+    assert first["projects"] == (10, 0, 0, 0)
+    version = catalog_version(target)
+
+    with target.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM job_skills")).scalar() == \
+            sum(len(r["required_skills"]) for r in data["roles"])
+
+    again = counts(seed.seed(seed.DATA_FILE, target))
+    assert again == {"skills": (0, 0, 50, 0), "roles": (0, 0, 17, 0), "resources": (0, 0, 31, 0),
+                     "projects": (0, 0, 10, 0)}
+    assert catalog_version(target) == version
+
+    # Edit one resource and one role, add a skill, and put skills last (buffered path)
+    data["resources"][0]["provider"] = "Elsewhere"
+    data["roles"][0]["required_skills"][0]["level"] = 5
+    data["resources"].append({"title": "Orphan", "type": "Course", "provider": "X", "skill": "Nope", "diff": 1})
+    data["skills"].append({"name": "Prompt Engineering", "category": "Technical"})
+    edited = tmp_path / "edited.json"
+    edited.write_text(json.dumps({k: data[k] for k in ("roles", "resources", "projects", "skills")}))
+
+    changed = counts(seed.seed(str(edited), target))
+    assert changed["skills"] == (1, 0, 50, 0)
+    assert changed["resources"] == (0, 1, 30, 1)
+    assert changed["roles"] == (0, 1, 16, 0)
+    assert changed["projects"] == (0, 0, 10, 0)
+    assert catalog_version(target) > version
+
+    with target.connect() as conn:
+        assert conn.execute(text("SELECT provider FROM learning_resources WHERE title = :t"),
+                            {"t": data["resources"][0]["title"]}).scalar() == "Elsewhere"
+        levels = conn.execute(text(
+            "SELECT js.required_level FROM job_skills js JOIN job_roles r ON r.id = js.job_role_id "
+            "WHERE r.title = :t ORDER BY js.id"), {"t": data["roles"][0]["title"]}).scalars().all()
+        assert levels == [req["level"] for req in data["roles"][0]["required_skills"]]
+
+
+def test_generator_is_deterministic_and_uses_the_bulk_path(target, tmp_path):
+    from seed_data import generate
+
+    sizes = dict(skills=60, roles=40, resources=200, projects=30, users=500)
+    items = list(generate.catalog_items(sizes, 7))
+    assert items == list(generate.catalog_items(sizes, 7))
+    assert items != list(generate.catalog_items(sizes, 8))
+
+    out = tmp_path / "synthetic.json"
+    generate.write_json(str(out), iter(items))
+    with open(out) as f:
+        assert list(seed.iter_sections(f)) == items
+
+    stats = counts(seed.CatalogSeeder(target).run(iter(items)))
+    assert {name: s[0] for name, s in stats.items()} == {k: v for k, v in sizes.items() if k != "users"}
+    assert generate.generate_users(target, 300, sizes["skills"], 7)[0] == 300
+    # Same seed, more users: only the new ones are added
+    assert generate.generate_users(target, 500, sizes["skills"], 7)[0] == 200
+
+    with target.connect() as conn:
+        per_user = conn.execute(text("SELECT COUNT(*) FROM user_skills GROUP BY user_id")).scalars().all()
+        per_role = conn.execute(text("SELECT COUNT(*) FROM job_skills GROUP BY job_role_id")).scalars().all()
+    assert len(per_user) == 500
+    # Long tails: most users hold one or two skills, a few many more
+    assert sorted(per_user)[len(per_user) // 2] <= 2 < max(per_user)
+    assert min(per_role) >= 2 and max(per_role) > sorted(per_role)[len(per_role) // 2]
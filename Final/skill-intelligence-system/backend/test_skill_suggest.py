@@ -0,0 +1,105 @@
+import random
+
+import bench_skill_suggest
+from app import models
+from app.services import skill_suggest
+from app.services import catalog as catalog_cache
+
+
+def names(db, q, limit=10):
+    return [s.name for s in skill_suggest.suggest(db, q, limit)]
+
+
+def test_prefixes_of_names_words_and_aliases(db, catalog):
+    assert names(db, "pyth")[0] == "Python Programming"
+    assert "Machine Learning" in names(db, "learn")  # a later word of the name
+    assert "Docker & Kubernetes" in names(db, "kube")  # an & part
+    assert names(db, "  MACHINE   le") == ["Machine Learning"]
+    assert names(db, "") == [] and names(db, "zzz") == []
+    assert len(names(db, "s", limit=3)) == 3
+
+
+def test_ranked_by_job_and_user_popularity(db, catalog, demo_user, monkeypatch):
+    results = skill_suggest.suggest(db, "d", limit=20)
+    assert [s.popularity for s in results] == sorted((s.popularity for s in results), reverse=True)
+    # Short prefixes are precomputed; the same ranking as scanning their range
+    suggester = skill_suggest.get_suggester(db)
+    for prefix in ("d", "da", "m", "py"):
+        scanned = suggester._best(suggester.table.range(prefix), 10)
+        assert [s.id for s in suggester.suggest(prefix, 10)] == [suggester.table.skills[p].id for p in suggester.by_rank[scanned]]
+
+    # Make the least popular "D" skill the most popular one
+    target = catalog[results[-1].name]
+    for i in range(30):
+        user = models.User(full_name=f"User {i}", email=f"u{i}@example.com")
+        db.add(user)
+        db.flush()
+        db.add(models.UserSkill(user_id=user.id, skill_id=target.id, proficiency_level=2))
+    db.commit()
+    assert names(db, "d", limit=20)[0] != target.name  # until the popularity refresh
+
+    started = []
+
+    class InlineThread:
+        def __init__(self, target, args, **kwargs):
+            self.run = lambda: target(*args)
+
+        def start(self):
+            started.append(self)
+            self.run()
+
+    monkeypatch.setattr(skill_suggest.threading, "Thread", InlineThread)
+    monkeypatch.setattr(skill_suggest.settings, "SKILL_POPULARITY_REFRESH_SECONDS", 0.0)
+    # Stale: the current ranking is served while the refresh runs (inline here), then swapped in
+    assert names(db, "d", limit=20)[0] != target.name
+    assert len(started) == 1 and skill_suggest._suggester is not suggester
+    monkeypatch.setattr(skill_suggest.settings, "SKILL_POPULARITY_REFRESH_SECONDS", 3600.0)
+    assert names(db, "d", limit=20)[0] == target.name
+    assert len(started) == 1
+
+
+def test_catalog_change_rebuilds_the_key_table_off_the_request_path(db, catalog, monkeypatch):
+    suggester = skill_suggest.get_suggester(db)
+    started = []
+
+    class DeferredThread:
+        def __init__(self, target, args, **kwargs):
+            self.run = lambda: target(*args)
+
+        def start(self):
+            started.append(self)
+
+    db.add(models.Skill(name="Rustacean Tooling", category="Technical"))
+    db.commit()
+    monkeypatch.setattr(skill_suggest.threading, "Thread", DeferredThread)
+    real_table = skill_suggest.KeyTable
+
+    def on_request_path(snapshot):
+        raise AssertionError("key table built on the request path")
+    monkeypatch.setattr(skill_suggest, "KeyTable", on_request_path)
+    # The request sees a newer catalog version, schedules a refresh and is answered by the current suggester
+    assert names(db, "rustacean") == []
+    assert skill_suggest.get_suggester(db) is suggester and started
+
+    monkeypatch.setattr(skill_suggest, "KeyTable", real_table)
+    started[0].run()
+    assert skill_suggest._suggester.catalog_version == catalog_cache.get_catalog(db).version
+    assert names(db, "rustacean") == ["Rustacean Tooling"]
+
+def test_generated_catalog_matches_a_full_scan():
+    # Timing lives in bench_skill_suggest.py; here only the answers at a larger scale
+    rng = random.Random(3)
+    suggester = bench_skill_suggest.build(5000, rng)
+    table = suggester.table
+    for _ in range(200):
+        name = table.skills[rng.randrange(len(table.skills))].name.lower()
+        prefix = name[:rng.randint(1, min(len(name), 12))]
+        entries = table.range(skill_suggest.normalize(prefix))
+        best = sorted({int(r) for r in suggester.entry_rank[entries]})[:10]
+        assert [s.id for s in suggester.suggest(prefix, 10)] == [table.skills[p].id for p in suggester.by_rank[best]]
+
+
+def test_suggest_endpoint(client):
+    results = client.get("/skills/suggest", params={"q": "sql"}).json()
+    assert results[0]["name"] == "SQL & Databases" and results[0]["popularity"] >= 1
+    assert client.get("/skills/suggest", params={"q": "a", "limit": 50}).status_code == 422
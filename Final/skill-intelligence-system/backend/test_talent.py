@@ -0,0 +1,128 @@
+import json
+import random
+
+from app import models
+from app.services import catalog as catalog_cache
+from app.services import intelligence, talent
+
+
+def populate(db, catalog, n_users=30):
+    rng = random.Random(7)
+    skills = list(catalog.values())
+    for i in range(n_users):
+        user = models.User(full_name=f"Candidate {i}", email=f"c{i}@skills.ai")
+        db.add(user)
+        db.flush()
+        for skill in rng.sample(skills, rng.randint(0, 8)):
+            db.add(models.UserSkill(user_id=user.id, skill_id=skill.id, proficiency_level=rng.randint(1, 5)))
+    db.commit()
+
+
+def expected_ranking(db, role):
+    scored = []
+    for user in db.query(models.User).order_by(models.User.id):
+        skills_map = {us.skill_id: us.proficiency_level for us in user.skills}
+        r = intelligence.calculate_readiness(skills_map, role, db)
+        scored.append((user.id, r.readiness_score, r.missing_skill_count))
+    scored.sort(key=lambda x: x[1], reverse=True)
+    return scored
+
+
+def requirements_of(role):
+    return [(req.skill_id, req.required_level, req.importance_weight) for req in role.required_skills]
+
+
+def test_rank_candidates_matches_per_user_readiness(db, catalog):
+    populate(db, catalog)
+    role = catalog_cache.get_catalog(db).roles[0]
+
+    expected = expected_ranking(db, role)
+    results = talent.rank_candidates(requirements_of(role), db, limit=10, offset=5)
+    assert [(c.user_id, c.missing_skill_count) for c in results] == [(e[0], e[2]) for e in expected[5:15]]
+    for c, e in zip(results, expected[5:15]):
+        assert abs(c.readiness_score - e[1]) < 1e-9
+        assert c.full_name == f"Candidate {c.user_id - 1}"
+
+
+def test_matrix_follows_skill_writes(db, catalog):
+    populate(db, catalog, n_users=5)
+    role = catalog_cache.get_catalog(db).roles[0]
+    talent.get_matrix(db)
+
+    user = db.query(models.User).first()
+    for us in list(user.skills):
+        db.delete(us)
+    db.flush()
+    for req in role.required_skills:
+        db.add(models.UserSkill(user_id=user.id, skill_id=req.skill_id, proficiency_level=req.required_level))
+    db.commit()
+
+    top = talent.rank_candidates(requirements_of(role), db, limit=1)
+    assert top[0].user_id == user.id
+    assert top[0].readiness_score == 1.0
+    assert [e[0] for e in expected_ranking(db, role)][0] == user.id
+
+
+def test_stream_candidates_in_batches(db, catalog, monkeypatch):
+    populate(db, catalog, n_users=9)
+    monkeypatch.setattr(talent, "BATCH_SIZE", 4)
+    role = catalog_cache.get_catalog(db).roles[0]
+
+    chunks = list(talent.stream_candidates(requirements_of(role), db, min_readiness=0.0))
+    assert len(chunks) == 3
+    rows = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    expected = {e[0]: e[1] for e in expected_ranking(db, role)}
+    assert [r["user_id"] for r in rows] == sorted(expected)
+    for r in rows:
+        assert abs(r["readiness_score"] - expected[r["user_id"]]) < 1e-9
+
+
+def test_reload_runs_in_background_and_keeps_concurrent_writes(db, catalog, monkeypatch):
+    populate(db, catalog, n_users=5)
+    role = catalog_cache.get_catalog(db).roles[0]
+    old = talent.get_matrix(db)
+    user = db.query(models.User).first()
+
+    # A write that commits while the reload is reading the table is replayed onto the new matrix
+    original_build = talent.build_matrix
+
+    def build_then_write(session):
+        matrix = original_build(session)
+        for us in list(user.skills):
+            db.delete(us)
+        db.flush()
+        for req in role.required_skills:
+            db.add(models.UserSkill(user_id=user.id, skill_id=req.skill_id, proficiency_level=req.required_level))
+        db.commit()
+        return matrix
+
+    started = []
+
+    class InlineThread:
+        def __init__(self, target, args, **kwargs):
+            self.run = lambda: target(*args)
+
+        def start(self):
+            started.append(self)
+            self.run()
+
+    monkeypatch.setattr(talent, "build_matrix", build_then_write)
+    monkeypatch.setattr(talent.threading, "Thread", InlineThread)
+    monkeypatch.setattr(talent.settings, "USER_MATRIX_REFRESH_SECONDS", 0.0)
+    # Stale: the current matrix is served while the reload runs
+    assert talent.get_matrix(db) is old
+    assert len(started) == 1 and talent._matrix is not old and talent._pending is None
+    monkeypatch.setattr(talent.settings, "USER_MATRIX_REFRESH_SECONDS", 3600.0)
+    top = talent.rank_candidates(requirements_of(role), db, limit=1)
+    assert top[0].user_id == user.id and top[0].readiness_score == 1.0
+
+    # Deleted users drop out of the matrix without a reload
+    for us in list(user.skills):
+        db.delete(us)
+    db.flush()
+    db.delete(user)
+    db.commit()
+    results = talent.rank_candidates(requirements_of(role), db, limit=10)
+    assert user.id not in {c.user_id for c in results} and len(results) == 4
+    lines = "".join(talent.stream_candidates(requirements_of(role), db))
+    assert len(lines.splitlines()) == 4
@@ -7,19 +7,30 @@ const SkillImpactSimulator = ({ isOpen, onClose, roleId, roleName, gaps, current
     const [selectedSkillId, setSelectedSkillId] = useState('');
     const [targetLevel, setTargetLevel] = useState(3);
     const [result, setResult] = useState(null);
+    const [levelResults, setLevelResults] = useState(null); // target level -> result, for the selected skill
     const [loading, setLoading] = useState(false);
 
     const handleSimulate = async () => {
         if (!selectedSkillId) return;
+        if (levelResults) {
+            setResult(levelResults[targetLevel]);
+            return;
+        }
         setLoading(true);
         try {
-            const res = await roleService.simulate({
+            // One request simulates every level, so moving the slider needs no further calls
+            const res = await roleService.simulateBatch({
                 user_id: userId,
                 role_id: roleId,
-                skill_id: parseInt(selectedSkillId),
-                target_level: parseInt(targetLevel)
+                changes: [1, 2, 3, 4, 5].map(level => ({
+                    skill_id: parseInt(selectedSkillId),
+                    target_level: level
+                }))
             });
-            setResult(res.data);
+            const byLevel = {};
+            res.data.results.forEach(r => { byLevel[r.target_level] = r; });
+            setLevelResults(byLevel);
+            setResult(byLevel[targetLevel]);
         } catch (e) {
             console.error("Simulation failed", e);
             alert("Simulation failed. Please try again.");
@@ -63,7 +74,7 @@ const SkillImpactSimulator = ({ isOpen, onClose, roleId, roleName, gaps, current
                         <select
                             style={{ width: '100%', padding: '0.75rem', background: '#0f172a', border: '1px solid #334155', color: 'white', borderRadius: '6px' }}
                             value={selectedSkillId}
-                            onChange={(e) => { setSelectedSkillId(e.target.value); setResult(null); }}
+                            onChange={(e) => { setSelectedSkillId(e.target.value); setResult(null); setLevelResults(null); }}
                         >
                             <option value="">-- Select a Missing Skill --</option>
                             {gaps.map((gap, idx) => (
@@ -92,7 +103,7 @@ const SkillImpactSimulator = ({ isOpen, onClose, roleId, roleName, gaps, current
                             <input
                                 type="range" min="1" max="5"
                                 value={targetLevel}
-                                onChange={(e) => { setTargetLevel(e.target.value); setResult(null); }}
+                                onChange={(e) => { setTargetLevel(e.target.value); setResult(levelResults ? levelResults[e.target.value] : null); }}
                                 style={{ width: '100%', accentColor: 'var(--brand-primary)' }}
                             />
                             <div style={{ textAlign: 'right', fontSize: '0.9rem', color: 'var(--brand-primary)' }}>Level {targetLevel}</div>
@@ -18,6 +18,8 @@ const SkillMatchAssistant = () => {
     const [input, setInput] = useState('');
     const [loading, setLoading] = useState(false);
     const messagesEndRef = useRef(null);
+    // Lets the backend keep this conversation's context (skills, role, readiness) between turns
+    const sessionId = useRef(`${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`);
 
     // Drag State
     const [position, setPosition] = useState({ x: window.innerWidth - 80, y: window.innerHeight - 80 });
@@ -82,7 +84,8 @@ const SkillMatchAssistant = () => {
             const res = await assistantService.chat({
                 user_id: user?.id,
                 role_id: contextRole?.id,
-                message: text
+                message: text,
+                session_id: sessionId.current
             });
 
             setMessages(prev => [
@@ -24,11 +24,11 @@ export default function Dashboard() {
             try {
                 const [uRes, rRes, rolesRes] = await Promise.all([
                     userService.get(USER_ID),
-                    roleService.recommend(USER_ID),
+                    roleService.recommend(USER_ID, { limit: 3, include_gaps: false }),
                     roleService.list()
                 ]);
                 setUserSkills(uRes.data.skills);
-                setRecs(rRes.data.slice(0, 3)); // Top 3
+                setRecs(rRes.data); // Top 3, scores only
                 setAllRoles(rolesRes.data);
 
                 if (uRes.data.target_role_id) {
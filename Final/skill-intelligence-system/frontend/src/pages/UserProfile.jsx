@@ -1,11 +1,12 @@
 import React, { useEffect, useState } from 'react';
-import { api, userService } from '../services/api';
+import { skillService, userService } from '../services/api';
 import { useAuth } from '../context/AuthContext';
 
 export default function UserProfile() {
     const { user } = useAuth(); // Get real logged in user
     const [backendUser, setBackendUser] = useState(null);
-    const [allSkills, setAllSkills] = useState([]);
+    const [skillQuery, setSkillQuery] = useState('');
+    const [suggestions, setSuggestions] = useState([]);
     const [newSkillId, setNewSkillId] = useState('');
     const [newSkillLevel, setNewSkillLevel] = useState(1);
 
@@ -17,9 +18,21 @@ export default function UserProfile() {
         if (USER_ID) {
             loadUser();
         }
-        loadSkills();
     }, [USER_ID]);
 
+    // Suggestions come from the server as the user types; the full skill list is never downloaded
+    useEffect(() => {
+        if (!skillQuery.trim()) {
+            setSuggestions([]);
+            return;
+        }
+        let stale = false;
+        skillService.suggest(skillQuery)
+            .then(res => { if (!stale) setSuggestions(res.data); })
+            .catch(e => console.error("Err loading suggestions", e));
+        return () => { stale = true; };
+    }, [skillQuery]);
+
     const loadUser = async () => {
         if (!USER_ID) return;
         try {
@@ -28,18 +41,16 @@ export default function UserProfile() {
         } catch (e) { console.error("Err loading user", e); }
     };
 
-    const loadSkills = async () => {
-        try {
-            const res = await api.get('/skills/');
-            setAllSkills(res.data);
-        } catch (e) { console.error("Err loading skills", e); }
-    };
-
     const handleAddSkill = async (e) => {
         e.preventDefault();
         if (!newSkillId) return;
         try {
-            await userService.addSkill(USER_ID, parseInt(newSkillId), parseInt(newSkillLevel));
+            // One transaction through the bulk endpoint, sent as a diff (upsert this skill, touch nothing else)
+            await userService.setSkills(
+                USER_ID,
+                [{ skill_id: parseInt(newSkillId), proficiency_level: parseInt(newSkillLevel) }],
+                { replace: false }
+            );
             loadUser(); // Refresh
             alert("Skill Added!");
         } catch (e) {
@@ -50,7 +61,7 @@ export default function UserProfile() {
     const handleRemoveSkill = async (skillId) => {
         if (!window.confirm("Are you sure you want to remove this skill?")) return;
         try {
-            await userService.removeSkill(USER_ID, skillId);
+            await userService.setSkills(USER_ID, [], { replace: false, remove: [skillId] });
             loadUser(); // Refresh
         } catch (e) {
             alert("Failed to remove skill");
@@ -164,16 +175,26 @@ export default function UserProfile() {
                     <form onSubmit={handleAddSkill} style={{ display: 'flex', flexDirection: 'column', gap: '1rem' }}>
                         <div>
                             <label style={{ display: 'block', marginBottom: '0.5rem' }}>Select Skill</label>
-                            <select
+                            <input
+                                type="text"
+                                placeholder="Start typing, e.g. Python"
                                 style={{ width: '100%', padding: '0.5rem' }}
-                                value={newSkillId}
-                                onChange={e => setNewSkillId(e.target.value)}
-                            >
-                                <option value="">-- Choose --</option>
-                                {allSkills.map(s => (
-                                    <option key={s.id} value={s.id}>{s.name} ({s.category})</option>
-                                ))}
-                            </select>
+                                value={skillQuery}
+                                onChange={e => { setSkillQuery(e.target.value); setNewSkillId(''); }}
+                            />
+                            {suggestions.length > 0 && !newSkillId && (
+                                <ul style={{ listStyle: 'none', margin: 0, padding: 0, border: '1px solid #ddd' }}>
+                                    {suggestions.map(s => (
+                                        <li
+                                            key={s.id}
+                                            style={{ padding: '0.5rem', cursor: 'pointer' }}
+                                            onClick={() => { setNewSkillId(String(s.id)); setSkillQuery(s.name); }}
+                                        >
+                                            {s.name} ({s.category})
+                                        </li>
+                                    ))}
+                                </ul>
+                            )}
                         </div>
 
                         <div>
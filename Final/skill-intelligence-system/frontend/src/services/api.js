@@ -19,13 +19,23 @@ export const userService = {
         proficiency_level: level
     }),
     removeSkill: (userId, skillId) => api.delete(`/users/${userId}/skills/${skillId}`),
+    // Whole profile in one request: skills = [{ skill_id, proficiency_level }].
+    // Pass { replace: false, remove: [skillIds] } to send a diff instead.
+    setSkills: (userId, skills, options = {}) => api.put(`/users/${userId}/skills`, { skills, ...options }),
+};
+
+export const skillService = {
+    // Autocomplete: at most `limit` skills matching the typed prefix, most popular first
+    suggest: (q, limit = 10) => api.get('/skills/suggest', { params: { q, limit } }),
 };
 
 export const roleService = {
     list: () => api.get('/roles/'),
     get: (id) => api.get(`/roles/${id}`),
-    recommend: (userId) => api.get(`/roles/recommend/${userId}`),
+    recommend: (userId, params) => api.get(`/roles/recommend/${userId}`, { params }),
     simulate: (data) => api.post('/roles/simulate', data),
+    simulateBatch: (data) => api.post('/roles/simulate/batch', data),
+    plan: (userId, roleId, params) => api.get(`/roles/plan/${userId}/${roleId}`, { params }),
 };
 
 export const projectService = {